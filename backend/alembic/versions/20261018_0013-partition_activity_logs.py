@@ -0,0 +1,117 @@
+"""partition activity_logs - monthly range partitions on created_at (Postgres only)
+
+Rebuilds activity_logs as a partitioned table: the primary key becomes
+(id, created_at) since Postgres requires the partition key in it, existing rows
+are copied into one partition per month, and a DEFAULT partition catches anything
+outside the created ranges. Upcoming months are created by run_log_maintenance.py.
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-18
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+INDEXES = (
+    ('ix_activity_logs_user_id', 'user_id'),
+    ('ix_activity_logs_session_id', 'session_id'),
+    ('ix_activity_logs_action_type', 'action_type'),
+    ('ix_activity_logs_created_at', 'created_at'),
+    ('ix_activity_logs_user_id_created_at', 'user_id, created_at'),
+    ('ix_activity_logs_action_type_created_at', 'action_type, created_at'),
+)
+
+COLUMNS = "id, user_id, session_id, action_type, page, details, ip_address, user_agent, created_at"
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _rename_old_table(old: str) -> None:
+    op.execute(f"ALTER TABLE activity_logs RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT activity_logs_pkey TO {old}_pkey")
+    for name, _ in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def _create_indexes() -> None:
+    for name, columns in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON activity_logs ({columns})")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    op.execute("UPDATE activity_logs SET created_at = now() WHERE created_at IS NULL")
+    _rename_old_table('activity_logs_unpartitioned')
+
+    op.execute("""
+        CREATE TABLE activity_logs (
+            id UUID NOT NULL,
+            user_id UUID REFERENCES users(id) ON DELETE SET NULL,
+            session_id VARCHAR(100) NOT NULL,
+            action_type VARCHAR(50) NOT NULL,
+            page VARCHAR(255),
+            details JSONB DEFAULT '{}',
+            ip_address VARCHAR(45),
+            user_agent VARCHAR(500),
+            created_at TIMESTAMP NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    _create_indexes()
+
+    oldest = bind.exec_driver_sql(
+        "SELECT min(created_at) FROM activity_logs_unpartitioned"
+    ).scalar()
+    today = date.today()
+    month = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+    last = _add_months(date(today.year, today.month, 1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE activity_logs_y{month.year:04d}m{month.month:02d} PARTITION OF activity_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE activity_logs_default PARTITION OF activity_logs DEFAULT")
+
+    op.execute(f"INSERT INTO activity_logs ({COLUMNS}) SELECT {COLUMNS} FROM activity_logs_unpartitioned")
+    op.execute("DROP TABLE activity_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    _rename_old_table('activity_logs_partitioned')
+    op.execute("""
+        CREATE TABLE activity_logs (
+            id UUID PRIMARY KEY,
+            user_id UUID REFERENCES users(id) ON DELETE SET NULL,
+            session_id VARCHAR(100) NOT NULL,
+            action_type VARCHAR(50) NOT NULL,
+            page VARCHAR(255),
+            details JSONB DEFAULT '{}',
+            ip_address VARCHAR(45),
+            user_agent VARCHAR(500),
+            created_at TIMESTAMP DEFAULT now()
+        )
+    """)
+    _create_indexes()
+    op.execute(f"INSERT INTO activity_logs ({COLUMNS}) SELECT {COLUMNS} FROM activity_logs_partitioned")
+    op.execute("DROP TABLE activity_logs_partitioned")
@@ -0,0 +1,45 @@
+"""activity log rollups - hourly counts and daily distinct sketches for admin stats
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '014'
+down_revision: Union[str, None] = '013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'activity_log_rollups',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('action_type', sa.String(50), nullable=False),
+        sa.Column('page', sa.String(255), nullable=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+    )
+    op.create_index('ix_activity_log_rollups_bucket_start', 'activity_log_rollups', ['bucket_start'])
+
+    op.create_table(
+        'activity_log_daily_sketches',
+        sa.Column('day', sa.Date(), primary_key=True),
+        sa.Column('users_hll', sa.LargeBinary(), nullable=False),
+        sa.Column('sessions_hll', sa.LargeBinary(), nullable=False),
+    )
+    # The first run of run_log_maintenance.py backfills both tables.
+
+
+def downgrade() -> None:
+    op.drop_table('activity_log_daily_sketches')
+    op.drop_index('ix_activity_log_rollups_bucket_start', table_name='activity_log_rollups')
+    op.drop_table('activity_log_rollups')
+    op.execute("DELETE FROM app_settings WHERE key = 'log_rollup_watermark'")
@@ -0,0 +1,33 @@
+"""activity action types - dimension table of every logged action_type
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '016'
+down_revision: Union[str, None] = '015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'activity_action_types',
+        sa.Column('name', sa.String(50), primary_key=True),
+        sa.Column('first_seen_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO activity_action_types (name, first_seen_at) "
+        "SELECT action_type, COALESCE(min(created_at), CURRENT_TIMESTAMP) FROM activity_logs GROUP BY action_type"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('activity_action_types')
@@ -0,0 +1,95 @@
+"""activity log dictionaries - store pages and user agents as ids into lookup tables
+
+activity_logs.page / user_agent become page_id / user_agent_id referencing
+activity_pages / activity_user_agents; activity_log_rollups.page becomes page_id
+the same way. Existing values are copied into the lookup tables and the rows
+rewritten before the string columns are dropped. Dropped columns only give their
+space back once rows are rewritten (VACUUM FULL, or new monthly partitions).
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '017'
+down_revision: Union[str, None] = '016'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'activity_pages',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('path', sa.String(255), nullable=False, unique=True),
+    )
+    op.create_table(
+        'activity_user_agents',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('value', sa.String(500), nullable=False, unique=True),
+    )
+
+    op.execute(
+        "INSERT INTO activity_pages (path) SELECT DISTINCT page FROM activity_logs "
+        "WHERE page IS NOT NULL AND page <> ''"
+    )
+    op.execute(
+        "INSERT INTO activity_user_agents (value) SELECT DISTINCT user_agent FROM activity_logs "
+        "WHERE user_agent IS NOT NULL AND user_agent <> ''"
+    )
+    op.execute(
+        "INSERT INTO activity_pages (path) SELECT DISTINCT page FROM activity_log_rollups "
+        "WHERE page IS NOT NULL AND page <> '' AND page NOT IN (SELECT path FROM activity_pages)"
+    )
+
+    op.add_column('activity_logs', sa.Column('page_id', sa.Integer(), sa.ForeignKey('activity_pages.id'), nullable=True))
+    op.add_column('activity_logs', sa.Column('user_agent_id', sa.Integer(), sa.ForeignKey('activity_user_agents.id'), nullable=True))
+    op.add_column('activity_log_rollups', sa.Column('page_id', sa.Integer(), sa.ForeignKey('activity_pages.id'), nullable=True))
+
+    op.execute(
+        "UPDATE activity_logs SET page_id = activity_pages.id FROM activity_pages "
+        "WHERE activity_pages.path = activity_logs.page"
+    )
+    op.execute(
+        "UPDATE activity_logs SET user_agent_id = activity_user_agents.id FROM activity_user_agents "
+        "WHERE activity_user_agents.value = activity_logs.user_agent"
+    )
+    op.execute(
+        "UPDATE activity_log_rollups SET page_id = activity_pages.id FROM activity_pages "
+        "WHERE activity_pages.path = activity_log_rollups.page"
+    )
+
+    op.drop_column('activity_logs', 'page')
+    op.drop_column('activity_logs', 'user_agent')
+    op.drop_column('activity_log_rollups', 'page')
+
+
+def downgrade() -> None:
+    op.add_column('activity_logs', sa.Column('page', sa.String(255), nullable=True))
+    op.add_column('activity_logs', sa.Column('user_agent', sa.String(500), nullable=True))
+    op.add_column('activity_log_rollups', sa.Column('page', sa.String(255), nullable=True))
+
+    op.execute(
+        "UPDATE activity_logs SET page = activity_pages.path FROM activity_pages "
+        "WHERE activity_pages.id = activity_logs.page_id"
+    )
+    op.execute(
+        "UPDATE activity_logs SET user_agent = activity_user_agents.value FROM activity_user_agents "
+        "WHERE activity_user_agents.id = activity_logs.user_agent_id"
+    )
+    op.execute(
+        "UPDATE activity_log_rollups SET page = activity_pages.path FROM activity_pages "
+        "WHERE activity_pages.id = activity_log_rollups.page_id"
+    )
+
+    op.drop_column('activity_log_rollups', 'page_id')
+    op.drop_column('activity_logs', 'user_agent_id')
+    op.drop_column('activity_logs', 'page_id')
+    op.drop_table('activity_user_agents')
+    op.drop_table('activity_pages')
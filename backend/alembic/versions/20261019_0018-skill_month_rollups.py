@@ -0,0 +1,74 @@
+"""skill month rollups - per-skill monthly minutes and session counts for time reports
+
+Backfilled from the existing learning/practice events. From here on the event
+write paths keep the table in step (services/time_rollups.py); rebuild_time_rollups.py
+repairs drift.
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '018'
+down_revision: Union[str, None] = '017'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'skill_month_rollups',
+        sa.Column('skill_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skills.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('month', sa.Date(), primary_key=True),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('learning_minutes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('practice_minutes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('learning_timed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('learning_untimed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('practice_timed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('practice_untimed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('first_day', sa.Date(), nullable=False),
+        sa.Column('last_day', sa.Date(), nullable=False),
+    )
+    op.create_index('ix_skill_month_rollups_user_month', 'skill_month_rollups', ['user_id', 'month'])
+
+    op.execute("""
+        INSERT INTO skill_month_rollups (
+            skill_id, month, user_id,
+            learning_minutes, practice_minutes,
+            learning_timed, learning_untimed, practice_timed, practice_untimed,
+            first_day, last_day
+        )
+        SELECT
+            e.skill_id, e.month, s.user_id,
+            COALESCE(SUM(e.duration_minutes) FILTER (WHERE e.kind = 'learning'), 0),
+            COALESCE(SUM(e.duration_minutes) FILTER (WHERE e.kind = 'practice'), 0),
+            COUNT(e.duration_minutes) FILTER (WHERE e.kind = 'learning'),
+            COUNT(*) FILTER (WHERE e.kind = 'learning' AND e.duration_minutes IS NULL),
+            COUNT(e.duration_minutes) FILTER (WHERE e.kind = 'practice'),
+            COUNT(*) FILTER (WHERE e.kind = 'practice' AND e.duration_minutes IS NULL),
+            MIN(e.date), MAX(e.date)
+        FROM (
+            SELECT skill_id, date, duration_minutes, 'learning' AS kind,
+                   date_trunc('month', date)::date AS month
+            FROM learning_events
+            UNION ALL
+            SELECT skill_id, date, duration_minutes, 'practice' AS kind,
+                   date_trunc('month', date)::date AS month
+            FROM practice_events
+        ) e
+        JOIN skills s ON s.id = e.skill_id
+        GROUP BY e.skill_id, e.month, s.user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_skill_month_rollups_user_month', table_name='skill_month_rollups')
+    op.drop_table('skill_month_rollups')
@@ -0,0 +1,47 @@
+"""user/date indexes - covering (user_id, date) indexes on events, partial index on active skills
+
+The dashboard, balance, calendar and imbalance-alert queries filter events by
+user_id and a date range, and the skill lists filter by user_id with
+archived_at IS NULL. The event indexes carry skill_id and duration_minutes (and
+id, which the counts use) so counts and the per-day groupings are index-only scans.
+
+The indexes are built CONCURRENTLY, outside the migration transaction, so the
+event tables stay writable while they build.
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '019'
+down_revision: Union[str, None] = '018'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in ('learning_events', 'practice_events'):
+            op.create_index(
+                f'ix_{table}_user_date', table, ['user_id', 'date'],
+                postgresql_include=['id', 'skill_id', 'duration_minutes'],
+                postgresql_concurrently=True,
+            )
+        op.create_index(
+            'ix_skills_user_active', 'skills', ['user_id'],
+            postgresql_where=sa.text('archived_at IS NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_skills_user_active', table_name='skills', postgresql_concurrently=True)
+        for table in ('learning_events', 'practice_events'):
+            op.drop_index(f'ix_{table}_user_date', table_name=table, postgresql_concurrently=True)
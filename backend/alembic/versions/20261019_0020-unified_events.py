@@ -0,0 +1,90 @@
+"""unified events - learning_events and practice_events merged into one events table
+
+The two tables had identical columns, so every timeline, count and aggregation
+ran once per table and was merged in Python. Their rows move into `events` with
+a `kind` column ('learning' / 'practice'); LearningEvent and PracticeEvent map
+onto it with single-table inheritance. Ids are kept, so links and exports stay
+valid.
+
+`learning_events` and `practice_events` remain as views over `events` for ad-hoc
+SQL and reporting. They are auto-updatable: `kind` defaults to the view's kind, and
+WITH CHECK OPTION keeps rows written through a view in that view's kind.
+
+The copy runs inside the migration transaction, so event writes wait for it;
+run it in a quiet window on large installs.
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = '020'
+down_revision: Union[str, None] = '019'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KINDS = ('learning', 'practice')
+COLUMNS = 'id, skill_id, user_id, date, type, notes, duration_minutes, created_at, updated_at'
+
+
+def _event_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('skill_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('skills.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('type', sa.String(length=50), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('duration_minutes', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    columns = _event_columns()
+    columns.insert(3, sa.Column('kind', sa.String(length=10), nullable=False))
+    op.create_table(
+        'events', *columns,
+        sa.CheckConstraint("kind IN ('learning', 'practice')", name='ck_events_kind'),
+    )
+    for kind in KINDS:
+        op.execute(
+            f"INSERT INTO events (kind, {COLUMNS}) SELECT '{kind}', {COLUMNS} FROM {kind}_events"
+        )
+    # Built after the copy: one sort per index instead of row-by-row maintenance.
+    op.create_index('ix_events_skill_date', 'events', ['skill_id', 'date'])
+    op.create_index(
+        'ix_events_user_date', 'events', ['user_id', 'date'],
+        postgresql_include=['kind', 'id', 'skill_id', 'duration_minutes'],
+    )
+
+    for kind in KINDS:
+        op.drop_table(f'{kind}_events')
+        op.execute(
+            f"CREATE VIEW {kind}_events AS SELECT {COLUMNS}, kind FROM events "
+            f"WHERE kind = '{kind}' WITH CHECK OPTION"
+        )
+        op.execute(f"ALTER VIEW {kind}_events ALTER COLUMN kind SET DEFAULT '{kind}'")
+
+
+def downgrade() -> None:
+    for kind in KINDS:
+        op.execute(f"DROP VIEW {kind}_events")
+        op.create_table(f'{kind}_events', *_event_columns())
+        op.execute(
+            f"INSERT INTO {kind}_events ({COLUMNS}) SELECT {COLUMNS} FROM events WHERE kind = '{kind}'"
+        )
+        op.create_index(f'idx_{kind}_events_skill', f'{kind}_events', ['skill_id', 'date'])
+        op.create_index(
+            f'ix_{kind}_events_user_date', f'{kind}_events', ['user_id', 'date'],
+            postgresql_include=['id', 'skill_id', 'duration_minutes'],
+        )
+    op.drop_table('events')
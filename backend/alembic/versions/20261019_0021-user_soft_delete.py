@@ -0,0 +1,36 @@
+"""user soft delete - users.deleted_at for asynchronous account purges
+
+Deleting an account now only stamps `deleted_at` (and retires the email); the
+account's rows are removed afterwards in batches by services/account_purge.py.
+The partial index lets the purge sweep find pending accounts without scanning
+users. The column is nullable with no default, so adding it does not rewrite
+the table.
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '021'
+down_revision: Union[str, None] = '020'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_users_deleted', 'users', ['deleted_at'],
+        postgresql_where=sa.text('deleted_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_deleted', table_name='users')
+    op.drop_column('users', 'deleted_at')
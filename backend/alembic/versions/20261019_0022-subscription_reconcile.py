@@ -0,0 +1,38 @@
+"""subscription reconcile - backoff state for the pending-payment reconciler
+
+GET /api/billing/status no longer calls the gateway hub; services/payment_reconcile.py
+checks pending orders in the background. Each pending subscription carries how
+many times it has been checked and when it is next due, so a batch only picks up
+orders whose backoff has elapsed. The partial index covers exactly those rows.
+Existing pending rows get a NULL next_reconcile_at and are checked on the first run.
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '022'
+down_revision: Union[str, None] = '021'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('subscriptions', sa.Column('reconcile_attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('subscriptions', sa.Column('next_reconcile_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_subscriptions_reconcile_due', 'subscriptions', ['next_reconcile_at'],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_subscriptions_reconcile_due', table_name='subscriptions')
+    op.drop_column('subscriptions', 'next_reconcile_at')
+    op.drop_column('subscriptions', 'reconcile_attempts')
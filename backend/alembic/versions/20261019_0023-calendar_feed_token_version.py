@@ -0,0 +1,30 @@
+"""calendar feed token version - users.feed_token_version for revocable feed URLs
+
+The calendar feed token is an HMAC over the user id and this counter, so bumping
+it (POST /api/analytics/calendar/feed-url/regenerate) invalidates every URL
+handed out before. The server default fills existing rows with 0, which keeps
+their current feed URLs valid until the first regenerate.
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '023'
+down_revision: Union[str, None] = '022'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('feed_token_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'feed_token_version')
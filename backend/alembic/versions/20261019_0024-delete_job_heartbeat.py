@@ -0,0 +1,31 @@
+"""delete job heartbeat - activity_log_delete_jobs.heartbeat_at for resuming stalled jobs
+
+A bulk delete job runs as a background task of the API process, so a restart
+mid-job left it `running` (or never started it) for good. The job now stamps
+`heartbeat_at` after every committed batch, and run_log_maintenance.py re-runs
+jobs whose heartbeat (or, if never started, creation) is older than the stall
+threshold. Nullable with no default, so adding it does not rewrite the table.
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '024'
+down_revision: Union[str, None] = '023'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('activity_log_delete_jobs', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('activity_log_delete_jobs', 'heartbeat_at')
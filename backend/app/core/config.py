@@ -26,9 +26,39 @@ class Settings(BaseSettings):
     ENABLE_ALERTS: bool = True
     MAX_ALERTS_PER_WEEK: int = 1
 
+    # Activity logs (run_log_maintenance.py). Whole months older than the retention
+    # window are dropped; 0 keeps everything.
+    ACTIVITY_LOG_RETENTION_MONTHS: int = 12
+    ACTIVITY_LOG_PARTITIONS_AHEAD: int = 3
+
+    # Connection pool (ignored for SQLite). Requests wait up to DB_POOL_TIMEOUT
+    # seconds for a connection once all DB_POOL_SIZE + DB_MAX_OVERFLOW are in use.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+
+    # Readiness and load shedding (core/health.py). /health/ready reports not-ready
+    # at READINESS_MAX_POOL_SATURATION of pool capacity; with LOAD_SHEDDING_ENABLED
+    # a full pool (or more than MAX_IN_FLIGHT_REQUESTS, 0 = no limit) gets an
+    # immediate 503 instead of a queued request.
+    READINESS_CACHE_SECONDS: float = 2
+    READINESS_MAX_POOL_SATURATION: float = 0.9
+    LOAD_SHEDDING_ENABLED: bool = True
+    MAX_IN_FLIGHT_REQUESTS: int = 0
+
     # Environment
     ENVIRONMENT: str = "development"
 
+    # Request instrumentation (core/instrumentation.py). The thresholds are opt-in:
+    # 0 disables them; above either, the request is logged at WARNING with the
+    # route and the most repeated statement's fingerprint.
+    SERVER_TIMING_ENABLED: bool = True
+    SLOW_REQUEST_QUERY_THRESHOLD: int = 0
+    SLOW_REQUEST_DB_MS_THRESHOLD: float = 0
+    # GET /metrics (Prometheus). Empty = open; set it and scrape with
+    # `Authorization: Bearer <token>` when /metrics is reachable from outside.
+    METRICS_TOKEN: str = ""
+
     # Epoint.az payment provider
     EPOINT_PUBLIC_KEY: str = ""
     EPOINT_PRIVATE_KEY: str = ""
@@ -46,6 +76,21 @@ class Settings(BaseSettings):
     GATEWAY_URL: str = "https://automakler.az"
     GATEWAY_API_KEY: str = ""
     GATEWAY_WEBHOOK_SECRET: str = ""
+    # Hub calls (core/gateway.py) share one keep-alive pool of GATEWAY_MAX_CONNECTIONS.
+    # Failed attempts are retried up to GATEWAY_MAX_RETRIES times where that is safe.
+    # After GATEWAY_BREAKER_THRESHOLD consecutive failures, calls fail fast for
+    # GATEWAY_BREAKER_RESET_SECONDS.
+    GATEWAY_CONNECT_TIMEOUT: float = 2.0
+    GATEWAY_READ_TIMEOUT: float = 8.0
+    GATEWAY_MAX_CONNECTIONS: int = 10
+    GATEWAY_MAX_RETRIES: int = 1
+    GATEWAY_BREAKER_THRESHOLD: int = 5
+    GATEWAY_BREAKER_RESET_SECONDS: float = 30.0
+    # Pending payments are checked with the hub by a background loop
+    # (services/payment_reconcile.py) every PAYMENT_RECONCILE_INTERVAL_SECONDS, at most
+    # PAYMENT_RECONCILE_CONCURRENCY hub calls at a time. 0 disables the loop.
+    PAYMENT_RECONCILE_INTERVAL_SECONDS: float = 15.0
+    PAYMENT_RECONCILE_CONCURRENCY: int = 4
 
     class Config:
         env_file = ".env"
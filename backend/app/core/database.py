@@ -1,16 +1,28 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.instrumentation import install_pool_metrics, install_query_hooks
 
 # Create engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+if "sqlite" in settings.DATABASE_URL:
+    engine = create_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+    # Deletes rely on the schema's ON DELETE rules, which SQLite only enforces when asked
+    event.listen(engine, "connect", lambda dbapi_connection, _record: dbapi_connection.execute("PRAGMA foreign_keys=ON"))
+else:
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+# Per-request statement counts and timings (Server-Timing header, slow-request logs)
+install_query_hooks(engine)
+install_pool_metrics(engine)
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factory. Instances keep their loaded state across commits, so
+# returning what was just written costs no reload (see app/core/writes.py).
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
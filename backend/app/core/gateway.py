@@ -6,18 +6,37 @@ hold only the gateway API key and the webhook secret — never the Epoint privat
 
 The webhook signature uses the same ``base64(sha1(secret + data + secret))`` scheme
 as Epoint, keyed by our per-project ``GATEWAY_WEBHOOK_SECRET``.
+
+Hub calls run inside synchronous request handlers, so each one holds a worker
+thread until it returns. They share one pooled keep-alive ``httpx.Client`` (no TLS
+handshake per call) with tight GATEWAY_CONNECT_TIMEOUT / GATEWAY_READ_TIMEOUT.
+Failed attempts are retried up to GATEWAY_MAX_RETRIES times with a short backoff:
+status lookups on any connection error or 502/503/504, and checkouts only when the
+connection was never made, because a retried POST could start a second payment. A
+circuit breaker counts consecutive failures (connection errors and 5xx). After
+GATEWAY_BREAKER_THRESHOLD of them, calls fail fast with GatewayUnavailable for
+GATEWAY_BREAKER_RESET_SECONDS. Then a single trial call decides whether the circuit
+closes again.
 """
 import base64
 import hashlib
 import hmac
 import json
+import threading
+import time
 from decimal import Decimal
+from typing import Optional
 
 import httpx
 
+from app.core import metrics
 from app.core.config import settings
 
-HTTP_TIMEOUT = 30.0
+# Per-attempt backoff before retry n is RETRY_BACKOFF * 2 ** (n - 1) seconds.
+RETRY_BACKOFF = 0.2
+RETRYABLE_STATUS = (502, 503, 504)
+# Raised before any bytes reach the hub, so retrying cannot duplicate a request.
+NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
 
 
 class GatewayError(Exception):
@@ -28,6 +47,97 @@ class GatewayError(Exception):
     """
 
 
+class GatewayUnavailable(GatewayError):
+    """Raised without calling the hub while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open -> closed).
+
+    Thread-safe: handlers run in the threadpool and share the module-level breaker.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float, clock=time.monotonic):
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            return "half_open" if self._clock() - self._opened_at >= self.reset_seconds else "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. While half-open, only one trial call at a time."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.reset_seconds or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+        metrics.GATEWAY_CIRCUIT_OPEN.set(0)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is None and self._failures < self.threshold:
+                return
+            # Tripped, or the half-open trial failed: stay open for another period.
+            self._opened_at = self._clock()
+        metrics.GATEWAY_CIRCUIT_OPEN.set(1)
+
+    def reset(self) -> None:
+        self.record_success()
+
+
+breaker = CircuitBreaker(settings.GATEWAY_BREAKER_THRESHOLD, settings.GATEWAY_BREAKER_RESET_SECONDS)
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _http() -> httpx.Client:
+    """The process-wide pooled client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(limits=httpx.Limits(
+                max_connections=settings.GATEWAY_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GATEWAY_MAX_CONNECTIONS,
+                keepalive_expiry=30.0,
+            ))
+        return _client
+
+
+def close_client() -> None:
+    """Close the pooled client (app shutdown); the next call opens a new one."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _timeout() -> httpx.Timeout:
+    """Read at call time so tests can monkeypatch settings."""
+    connect = settings.GATEWAY_CONNECT_TIMEOUT
+    return httpx.Timeout(settings.GATEWAY_READ_TIMEOUT, connect=connect, pool=connect)
+
+
 def _result(resp, what: str) -> dict:
     """Return the JSON body, or raise GatewayError with the hub's status + body."""
     if resp.is_error:
@@ -35,6 +145,55 @@ def _result(resp, what: str) -> dict:
     return resp.json()
 
 
+def _timed(endpoint: str, call):
+    """Run `call()` and record its latency under `endpoint` (outcome ok / error / exception)."""
+    started = time.perf_counter()
+    outcome = "exception"
+    try:
+        resp = call()
+        outcome = "error" if resp.is_error else "ok"
+        return resp
+    finally:
+        metrics.GATEWAY_LATENCY.observe(time.perf_counter() - started, endpoint=endpoint, outcome=outcome)
+
+
+def _request(endpoint: str, method: str, url: str, *, idempotent: bool, **kwargs) -> httpx.Response:
+    """Send one hub request through the breaker, retrying what is safe to retry.
+
+    Returns the last response (possibly an error response); raises GatewayUnavailable
+    while the circuit is open, the last transport error once retries run out, or
+    GatewayError for any other httpx failure (an undecodable body, a redirect loop).
+    Every attempt records an outcome, so a half-open trial always frees its slot.
+    """
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            metrics.GATEWAY_REJECTED.inc(endpoint=endpoint)
+            raise GatewayUnavailable(f"{method} {url} -> circuit open, hub marked unhealthy")
+        try:
+            resp = _timed(endpoint, lambda: _http().request(method, url, timeout=_timeout(), **kwargs))
+        except httpx.TransportError as exc:
+            breaker.record_failure()
+            retryable = idempotent or isinstance(exc, NOT_SENT)
+            if not retryable or attempt >= settings.GATEWAY_MAX_RETRIES:
+                raise
+        except Exception as exc:
+            breaker.record_failure()
+            if isinstance(exc, httpx.HTTPError):
+                raise GatewayError(f"{method} {url} -> {exc.__class__.__name__}: {exc}") from exc
+            raise
+        else:
+            if resp.status_code < 500:
+                breaker.record_success()
+                return resp
+            breaker.record_failure()
+            if not (idempotent and resp.status_code in RETRYABLE_STATUS) or attempt >= settings.GATEWAY_MAX_RETRIES:
+                return resp
+        attempt += 1
+        metrics.GATEWAY_RETRIES.inc(endpoint=endpoint)
+        time.sleep(RETRY_BACKOFF * 2 ** (attempt - 1))
+
+
 def _webhook_secret() -> str:
     """Read at call time so tests can monkeypatch settings."""
     return settings.GATEWAY_WEBHOOK_SECRET
@@ -71,8 +230,8 @@ def create_checkout(
     language: str = "en",
 ) -> dict:
     """Ask the hub to start an Epoint payment. Returns ``{redirect_url, order_id}``."""
-    resp = httpx.post(
-        f"{settings.GATEWAY_URL}/gateway/checkout",
+    resp = _request(
+        "checkout", "POST", f"{settings.GATEWAY_URL}/gateway/checkout", idempotent=False,
         json={
             "amount": float(amount),
             "currency": "AZN",
@@ -83,17 +242,15 @@ def create_checkout(
             "client_reference": client_reference,
         },
         headers=_auth_headers(),
-        timeout=HTTP_TIMEOUT,
     )
     return _result(resp, "POST /gateway/checkout")
 
 
 def get_status(order_id: str) -> dict:
     """Pull the authoritative status of a payment from the hub (reconcile)."""
-    resp = httpx.get(
-        f"{settings.GATEWAY_URL}/gateway/status",
+    resp = _request(
+        "status", "GET", f"{settings.GATEWAY_URL}/gateway/status", idempotent=True,
         params={"order_id": order_id},
         headers=_auth_headers(),
-        timeout=HTTP_TIMEOUT,
     )
     return _result(resp, "GET /gateway/status")
@@ -0,0 +1,155 @@
+"""Liveness, readiness and load shedding.
+
+Liveness (`/health`, `/health/live`) only says the process answers. Readiness
+(`/health/ready`) says whether this worker should get traffic:
+
+- database: a `SELECT 1` round trip, with its latency
+- migrations: the database's alembic revision equals the head shipped with the code
+- pool: connections checked out versus pool capacity
+
+The database and migration probes run at most once per READINESS_CACHE_SECONDS
+per process, so frequent load balancer probes cost no queries. Pool usage is
+read fresh on every call because it's just counters.
+
+`LoadSheddingMiddleware` answers 503 with `Retry-After` as soon as the pool is
+full (or MAX_IN_FLIGHT_REQUESTS is exceeded). Otherwise the request would queue
+for a connection for up to DB_POOL_TIMEOUT seconds and likely time out anyway.
+"""
+import json
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core import metrics
+from app.core.config import settings
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+# Probes and scrapes must still answer while the worker sheds load.
+EXEMPT_PATHS = ("/health", "/metrics")
+
+_lock = threading.Lock()
+_cached_probe: Optional[dict] = None
+_cached_at: Optional[float] = None
+
+
+@lru_cache(maxsize=1)
+def expected_head() -> Optional[str]:
+    """The alembic head revision shipped with this code, or None if the scripts aren't deployed."""
+    if not ALEMBIC_DIR.is_dir():
+        return None
+    return ScriptDirectory(str(ALEMBIC_DIR)).get_current_head()
+
+
+def pool_status(engine: Engine) -> Optional[dict]:
+    """Checked-out connections versus capacity, or None for pools without a limit (SQLite)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return None
+    # QueuePool has no public accessor for max_overflow; -1 means unbounded.
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    if max_overflow < 0:
+        return None
+    capacity = pool.size() + max_overflow
+    checked_out = pool.checkedout()
+    return {
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(checked_out / capacity, 3) if capacity else 1.0,
+    }
+
+
+def _probe_database(engine: Engine) -> dict:
+    started = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            latency_ms = (time.perf_counter() - started) * 1000
+            current = MigrationContext.configure(conn).get_current_revision()
+    except Exception as exc:
+        return {
+            "database": {"ok": False, "error": exc.__class__.__name__},
+            "migrations": {"ok": False, "current": None, "head": expected_head()},
+        }
+    head = expected_head()
+    return {
+        "database": {"ok": True, "latency_ms": round(latency_ms, 1)},
+        "migrations": {"ok": head is None or current == head, "current": current, "head": head},
+    }
+
+
+def _cached_database_probe(engine: Engine) -> dict:
+    global _cached_probe, _cached_at
+    with _lock:
+        now = time.monotonic()
+        if _cached_at is None or now - _cached_at >= settings.READINESS_CACHE_SECONDS:
+            _cached_probe = _probe_database(engine)
+            _cached_at = now
+        return _cached_probe
+
+
+def readiness(engine: Engine) -> dict:
+    """`{"ready": bool, "checks": {...}}` for /health/ready."""
+    pool = pool_status(engine)
+    pool_ok = pool is None or pool["saturation"] < settings.READINESS_MAX_POOL_SATURATION
+    checks = {"pool": dict(pool or {}, ok=pool_ok)}
+    if pool is not None and pool["checked_out"] >= pool["capacity"]:
+        # Probing would wait for a connection like every queued request.
+        checks["database"] = {"ok": False, "error": "pool exhausted"}
+    else:
+        checks.update(_cached_database_probe(engine))
+    return {"ready": all(check["ok"] for check in checks.values()), "checks": checks}
+
+
+def reset_cache() -> None:
+    """Forget the cached database probe (tests)."""
+    global _cached_probe, _cached_at
+    with _lock:
+        _cached_probe = None
+        _cached_at = None
+
+
+def should_shed(engine: Engine) -> bool:
+    limit = settings.MAX_IN_FLIGHT_REQUESTS
+    if limit and metrics.HTTP_IN_FLIGHT.value() > limit:
+        return True
+    pool = pool_status(engine)
+    return pool is not None and pool["checked_out"] >= pool["capacity"]
+
+
+_SHED_BODY = json.dumps({"detail": "Server busy, please retry"}).encode("utf-8")
+
+
+class LoadSheddingMiddleware:
+    """Pure ASGI middleware rejecting requests up front while the worker is saturated."""
+
+    def __init__(self, app, engine: Engine):
+        self.app = app
+        self.engine = engine
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.LOAD_SHEDDING_ENABLED
+            or scope["path"].startswith(EXEMPT_PATHS)
+            or not should_shed(self.engine)
+        ):
+            await self.app(scope, receive, send)
+            return
+        metrics.REQUESTS_SHED.inc()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_SHED_BODY)).encode("latin-1")),
+                (b"retry-after", b"1"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _SHED_BODY})
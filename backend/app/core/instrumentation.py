@@ -0,0 +1,204 @@
+"""Per-request SQL and latency instrumentation.
+
+`install_query_hooks` attaches cursor-execute listeners to an engine. While a
+request is in flight, `RequestInstrumentationMiddleware` keeps a `RequestStats` in
+a context variable; the listeners add every statement's count and duration to it.
+The context is copied into the threadpool that runs sync endpoints and
+dependencies, and the stats object is shared, so their queries are counted too.
+
+On the way out the middleware adds a `Server-Timing` header (visible in browser
+devtools) and logs one `key=value` line per request at DEBUG level. If a request
+exceeds SLOW_REQUEST_QUERY_THRESHOLD statements or SLOW_REQUEST_DB_MS_THRESHOLD
+milliseconds of DB time, the line is logged at WARNING with the route template
+and the fingerprint of the most repeated statement. A high repeat count for one
+fingerprint is the signature of an N+1 query.
+
+The same measurements feed the Prometheus metrics in core/metrics.py.
+"""
+import hashlib
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger("app.requests")
+
+
+@dataclass
+class RequestStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: Optional[str] = None
+    statement_counts: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.statements += 1
+        self.db_seconds += elapsed
+        if elapsed > self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+        self.statement_counts[statement] = self.statement_counts.get(statement, 0) + 1
+
+    def most_repeated(self):
+        """(statement, count) for the statement executed most often, or (None, 0)."""
+        if not self.statement_counts:
+            return None, 0
+        return max(self.statement_counts.items(), key=lambda item: item[1])
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAM = r"(?:\?|%\(\w+\)s|:\w+)"
+_IN_LIST_RE = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+
+
+def fingerprint(statement: str) -> str:
+    """Short stable id for a statement shape: literals, numbers and IN lists are normalised away."""
+    normalised = _WHITESPACE_RE.sub(" ", statement).strip()
+    normalised = _LITERAL_RE.sub("?", normalised)
+    normalised = _IN_LIST_RE.sub("(...)", normalised)
+    return hashlib.sha1(normalised.encode("utf-8")).hexdigest()[:12]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # On the execution context, not the connection: after_cursor_execute never fires for
+    # a failed statement, and the context is discarded with it.
+    context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - context._query_start_time)
+
+
+def install_query_hooks(engine: Engine) -> None:
+    """Attach the statement timing listeners to `engine` (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    metrics.DB_POOL_CHECKOUTS.inc()
+
+
+def _on_connect(dbapi_connection, connection_record):
+    metrics.DB_POOL_CONNECTS.inc()
+
+
+def install_pool_metrics(engine: Engine) -> None:
+    """Count pool checkouts and new connections for /metrics (idempotent)."""
+    if not event.contains(engine, "checkout", _on_checkout):
+        event.listen(engine, "checkout", _on_checkout)
+        event.listen(engine, "connect", _on_connect)
+
+
+def _server_timing(stats: RequestStats, app_seconds: float) -> str:
+    return ", ".join([
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} queries"',
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}",
+        f"app;dur={app_seconds * 1000:.1f}",
+    ])
+
+
+def _is_slow(stats: RequestStats) -> bool:
+    query_limit = settings.SLOW_REQUEST_QUERY_THRESHOLD
+    db_ms_limit = settings.SLOW_REQUEST_DB_MS_THRESHOLD
+    return bool(
+        (query_limit and stats.statements > query_limit)
+        or (db_ms_limit and stats.db_seconds * 1000 > db_ms_limit)
+    )
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+def record_metrics(scope, status_code: int, stats: RequestStats, app_seconds: float) -> None:
+    route = metrics.route_label(scope)
+    method = scope.get("method", "")
+    metrics.HTTP_REQUESTS.inc(method=method, route=route, status=str(status_code))
+    metrics.HTTP_LATENCY.observe(app_seconds, method=method, route=route)
+    metrics.DB_STATEMENTS.observe(stats.statements, route=route)
+
+
+def log_request(scope, status_code: int, stats: RequestStats, app_seconds: float) -> None:
+    slow = _is_slow(stats)
+    level = logging.WARNING if slow else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+    fields = [
+        f"method={scope.get('method')}",
+        f"route={_route_template(scope)}",
+        f"status={status_code}",
+        f"queries={stats.statements}",
+        f"db_ms={stats.db_seconds * 1000:.1f}",
+        f"slowest_ms={stats.slowest_seconds * 1000:.1f}",
+        f"app_ms={app_seconds * 1000:.1f}",
+    ]
+    if slow:
+        repeated, count = stats.most_repeated()
+        if repeated is not None:
+            fields.append(f"repeated_fingerprint={fingerprint(repeated)} repeated_count={count}")
+            fields.append(f"repeated_sql={_WHITESPACE_RE.sub(' ', repeated)[:200]!r}")
+        if stats.slowest_statement is not None:
+            fields.append(f"slowest_fingerprint={fingerprint(stats.slowest_statement)}")
+    logger.log(level, "request %s", " ".join(fields))
+
+
+class RequestInstrumentationMiddleware:
+    """Pure ASGI middleware (no response buffering, so streaming bodies are unaffected)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        metrics.HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        status_code = 500
+        app_seconds = None
+
+        async def send_wrapper(message):
+            nonlocal status_code, app_seconds
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                app_seconds = time.perf_counter() - started
+                if settings.SERVER_TIMING_ENABLED:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(stats, app_seconds).encode("latin-1")))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            metrics.HTTP_IN_FLIGHT.dec()
+            if app_seconds is None:
+                app_seconds = time.perf_counter() - started
+            record_metrics(scope, status_code, stats, app_seconds)
+            log_request(scope, status_code, stats, app_seconds)
@@ -0,0 +1,203 @@
+"""Minimal Prometheus-compatible metrics (text exposition format 0.0.4).
+
+Counters, gauges and histograms are plain in-process dicts keyed by label values
+and guarded by one lock each, so recording costs a dict update. That's cheap
+enough for the request hot path and needs no extra dependency. Values are per
+worker process. Scrape each worker, or sum by instance in Prometheus.
+
+Values that live outside the process (DB pool state, cron job results, job
+queues) are read at scrape time by routers/metrics.py and passed to
+`Registry.render` as extra families.
+"""
+import bisect
+import math
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latencies: 5ms .. 10s
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+Family = Tuple[str, str, str, List[Sample]]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+        return entry[2] if entry else 0
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = [(key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items()]
+        samples = []
+        for key, (counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                samples.append((f"{self.name}_bucket", dict(labels, le=_format_value(bound)), cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, count))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self, extra: Iterable[Family] = ()) -> str:
+        """Exposition text for every registered metric plus `extra` (name, kind, help, samples) families."""
+        families = [(m.name, m.kind, m.documentation, m.samples()) for m in self._metrics.values()]
+        families.extend(extra)
+        lines = []
+        for name, kind, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# HTTP and DB pool (recorded by core/instrumentation.py)
+HTTP_REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "Time until the response started.", ("method", "route")
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests currently being handled.")
+DB_STATEMENTS = REGISTRY.histogram(
+    "http_request_db_statements", "SQL statements executed per request.", ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 250),
+)
+REQUESTS_SHED = REGISTRY.counter("http_requests_shed_total", "Requests rejected with 503 by load shedding.")
+DB_POOL_CHECKOUTS = REGISTRY.counter("db_pool_checkouts_total", "Connections checked out of the pool.")
+DB_POOL_CONNECTS = REGISTRY.counter("db_pool_connections_created_total", "New DB connections opened by the pool.")
+
+# In-process caches (services/log_dimensions.py)
+CACHE_REQUESTS = REGISTRY.counter("cache_requests_total", "In-process cache lookups.", ("cache", "result"))
+
+# Activity log ingestion
+LOGS_INGESTED = REGISTRY.counter("activity_logs_ingested_total", "Activity logs written by POST /api/logs.")
+
+# Payment gateway (core/gateway.py)
+GATEWAY_LATENCY = REGISTRY.histogram(
+    "gateway_request_duration_seconds", "Calls to the payment gateway hub.", ("endpoint", "outcome"),
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+GATEWAY_RETRIES = REGISTRY.counter("gateway_retries_total", "Gateway hub calls retried after a failed attempt.", ("endpoint",))
+GATEWAY_REJECTED = REGISTRY.counter(
+    "gateway_requests_rejected_total", "Gateway hub calls failed fast by the open circuit breaker.", ("endpoint",),
+)
+GATEWAY_CIRCUIT_OPEN = REGISTRY.gauge("gateway_circuit_open", "1 while the gateway circuit breaker is open.")
+
+
+def route_label(scope) -> str:
+    """Route template for labels; unmatched paths collapse into one value to bound cardinality."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else "unmatched"
@@ -1,5 +1,8 @@
+import hashlib
+import hmac
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from uuid import UUID
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -68,3 +71,39 @@ def decode_password_reset_token(token: str) -> Optional[str]:
         return payload.get("sub")
     except JWTError:
         return None
+
+
+def _calendar_feed_signature(user_id: UUID, version: int) -> str:
+    # Version 0 signs the pre-versioning message, so URLs issued before it stay valid.
+    message = f"calendar-feed:{user_id.hex}" + (f":{version}" if version else "")
+    message = message.encode("utf-8")
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()[:32]
+
+
+def create_calendar_feed_token(user_id: UUID, version: int) -> str:
+    """Create the non-expiring token embedded in a user's calendar feed URL.
+
+    Calendar apps can't send an Authorization header, so the feed URL itself is the
+    credential: the user id plus an HMAC of it and the user's `feed_token_version`
+    under SECRET_KEY. Bumping the version revokes every earlier URL.
+    """
+    return user_id.hex + _calendar_feed_signature(user_id, version)
+
+
+def decode_calendar_feed_token(token: str) -> Optional[UUID]:
+    """Read the user id out of a calendar feed token, unverified; None if malformed.
+
+    The signature depends on the user's current version, so check it with
+    `verify_calendar_feed_token` once the user is loaded.
+    """
+    if len(token) != 64:
+        return None
+    try:
+        return UUID(hex=token[:32])
+    except ValueError:
+        return None
+
+
+def verify_calendar_feed_token(token: str, user_id: UUID, version: int) -> bool:
+    """True if `token` is the current feed token of the user."""
+    return hmac.compare_digest(token, create_calendar_feed_token(user_id, version))
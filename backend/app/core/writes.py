@@ -0,0 +1,35 @@
+"""Write helpers for sessions that keep their state across commits.
+
+SessionLocal is built with expire_on_commit=False. Every column of our models
+gets its value client-side (Python defaults, no server defaults or triggers), so
+after a flush an instance already holds exactly what the database stored, and
+reloading it after the commit (`db.refresh`, or the implicit SELECT on the first
+attribute access of an expired instance) is a wasted round trip. Handlers return
+what they wrote without refreshing.
+
+Updates go through `update_returning`: one UPDATE ... RETURNING rather than a
+SELECT, an UPDATE at flush and a reload.
+"""
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session, model):
+    """INSERT construct with ON CONFLICT support for the session's database."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(model)
+
+
+def update_returning(db: Session, model, values: dict, *criteria) -> Optional[object]:
+    """UPDATE the row matching `criteria` with `values` and return it (None if no row matches).
+
+    The returned instance replaces any stale copy in the session. With no
+    `values` this is just the lookup.
+    """
+    if not values:
+        return db.query(model).filter(*criteria).first()
+    stmt = update(model).where(*criteria).values(**values).returning(model)
+    return db.scalars(stmt, execution_options={"populate_existing": True}).first()
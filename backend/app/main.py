@@ -1,7 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, skills, events, analytics, settings, templates, categories, admin, tickets, logs, billing, webhooks
+from app.routers import auth, skills, events, analytics, settings, templates, categories, admin, tickets, logs, billing, webhooks, metrics, health
 from app.core.config import settings as app_settings
+from app.core import gateway
+from app.core.database import engine
+from app.core.health import LoadSheddingMiddleware
+from app.core.instrumentation import RequestInstrumentationMiddleware
+from app.services import payment_reconcile
 
 app = FastAPI(
     title="SkillFade API",
@@ -9,6 +14,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# 503 + Retry-After while the DB pool is exhausted (inside CORS so browsers can read it)
+app.add_middleware(LoadSheddingMiddleware, engine=engine)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -16,8 +24,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Query count / DB time per request (Server-Timing header + slow-request logs)
+app.add_middleware(RequestInstrumentationMiddleware)
+
+# Background reconciliation of pending payments; close the gateway hub's keep-alive pool
+app.add_event_handler("startup", payment_reconcile.start_reconciler)
+app.add_event_handler("shutdown", payment_reconcile.stop_reconciler)
+app.add_event_handler("shutdown", gateway.close_client)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(skills.router)
@@ -31,6 +48,8 @@ app.include_router(tickets.router)
 app.include_router(logs.router)
 app.include_router(billing.router)
 app.include_router(webhooks.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
 
 
 @app.get("/")
@@ -41,9 +60,3 @@ def root():
         "version": "1.0.0",
         "docs": "/docs"
     }
-
-
-@app.get("/health")
-def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
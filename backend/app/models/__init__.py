@@ -1,11 +1,14 @@
 from app.models.user import User
 from app.models.skill import Skill
-from app.models.event import LearningEvent, PracticeEvent
+from app.models.event import Event, LearningEvent, PracticeEvent
 from app.models.event_template import EventTemplate
 from app.models.category import Category
 from app.models.ticket import Ticket, TicketReply
-from app.models.activity_log import ActivityLog
+from app.models.activity_log import ActivityLog, ActivityActionType, ActivityPage, ActivityUserAgent
+from app.models.activity_log_rollup import ActivityLogRollup, ActivityLogDailySketch
+from app.models.activity_log_delete_job import ActivityLogDeleteJob
+from app.models.skill_month_rollup import SkillMonthRollup
 from app.models.subscription import Subscription
 from app.models.app_setting import AppSetting
 
-__all__ = ["User", "Skill", "LearningEvent", "PracticeEvent", "EventTemplate", "Category", "Ticket", "TicketReply", "ActivityLog", "Subscription", "AppSetting"]
+__all__ = ["User", "Skill", "Event", "LearningEvent", "PracticeEvent", "EventTemplate", "Category", "Ticket", "TicketReply", "ActivityLog", "ActivityActionType", "ActivityPage", "ActivityUserAgent", "ActivityLogRollup", "ActivityLogDailySketch", "ActivityLogDeleteJob", "SkillMonthRollup", "Subscription", "AppSetting"]
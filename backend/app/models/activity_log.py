@@ -1,7 +1,7 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 from datetime import datetime
 from app.core.database import Base
 
@@ -13,17 +13,54 @@ class ActivityLog(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='SET NULL'), nullable=True, index=True)
     session_id = Column(String(100), nullable=False, index=True)
     action_type = Column(String(50), nullable=False, index=True)
-    page = Column(String(255), nullable=True)
+    # Pages and user agents repeat heavily, so rows store ids into small dictionary
+    # tables (services/log_dimensions.py encodes them at ingestion).
+    page_id = Column(Integer, ForeignKey('activity_pages.id'), nullable=True)
     details = Column(JSONB, default={})
     ip_address = Column(String(45), nullable=True)  # IPv6 compatible
-    user_agent = Column(String(500), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    user_agent_id = Column(Integer, ForeignKey('activity_user_agents.id'), nullable=True)
+    # Part of the primary key because Postgres requires the partition key in every
+    # unique constraint of a partitioned table (see services/log_partitions.py).
+    created_at = Column(DateTime, default=datetime.utcnow, primary_key=True, index=True)
 
-    # Relationship
-    user = relationship("User", backref="activity_logs")
+    # Relationships
+    user = relationship("User", backref=backref("activity_logs", passive_deletes=True))  # ON DELETE SET NULL
+    page_ref = relationship("ActivityPage")
+    user_agent_ref = relationship("ActivityUserAgent")
 
     # Composite indexes for common queries
     __table_args__ = (
         Index('ix_activity_logs_user_id_created_at', 'user_id', 'created_at'),
         Index('ix_activity_logs_action_type_created_at', 'action_type', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
     )
+
+    @property
+    def page(self):
+        return self.page_ref.path if self.page_ref else None
+
+    @property
+    def user_agent(self):
+        return self.user_agent_ref.value if self.user_agent_ref else None
+
+
+class ActivityPage(Base):
+    __tablename__ = "activity_pages"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    path = Column(String(255), nullable=False, unique=True)
+
+
+class ActivityUserAgent(Base):
+    __tablename__ = "activity_user_agents"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    value = Column(String(500), nullable=False, unique=True)
+
+
+class ActivityActionType(Base):
+    """Every action_type ever logged, so filters don't need SELECT DISTINCT over activity_logs."""
+    __tablename__ = "activity_action_types"
+
+    name = Column(String(50), primary_key=True)
+    first_seen_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,23 @@
+import uuid
+from sqlalchemy import Column, String, DateTime, Integer, Text, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from app.core.database import Base
+
+
+class ActivityLogDeleteJob(Base):
+    """A bulk activity log deletion running in the background (services/log_purge.py)."""
+    __tablename__ = "activity_log_delete_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    status = Column(String(20), nullable=False, default='pending')  # pending, running, completed, failed
+    start_date = Column(DateTime, nullable=True)
+    end_date = Column(DateTime, nullable=True)
+    total_estimate = Column(Integer, nullable=True)
+    deleted_count = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    requested_by_user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # last committed batch; a stale one means the runner died
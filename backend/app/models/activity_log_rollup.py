@@ -0,0 +1,28 @@
+import uuid
+from sqlalchemy import Column, String, DateTime, Date, Integer, LargeBinary, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class ActivityLogRollup(Base):
+    """Hourly activity log counts per (action_type, page_id); see services/log_rollups.py."""
+    __tablename__ = "activity_log_rollups"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    bucket_start = Column(DateTime, nullable=False)
+    action_type = Column(String(50), nullable=False)
+    page_id = Column(Integer, ForeignKey('activity_pages.id'), nullable=True)
+    count = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index('ix_activity_log_rollups_bucket_start', 'bucket_start'),
+    )
+
+
+class ActivityLogDailySketch(Base):
+    """HyperLogLog registers of the distinct users and sessions seen on a day."""
+    __tablename__ = "activity_log_daily_sketches"
+
+    day = Column(Date, primary_key=True)
+    users_hll = Column(LargeBinary, nullable=False)
+    sessions_hll = Column(LargeBinary, nullable=False)
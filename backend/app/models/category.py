@@ -16,7 +16,7 @@ class Category(Base):
 
     # Relationships
     user = relationship("User", back_populates="categories")
-    skills = relationship("Skill", back_populates="category_obj")
+    skills = relationship("Skill", back_populates="category_obj", passive_deletes=True)  # ON DELETE SET NULL
 
     # Constraints
     __table_args__ = (
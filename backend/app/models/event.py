@@ -1,50 +1,59 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, Date, Integer, Text, ForeignKey, Index
+from sqlalchemy import Column, String, DateTime, Date, Integer, Text, ForeignKey, Index, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
 
+EVENT_KINDS = ("learning", "practice")
 
-class LearningEvent(Base):
-    __tablename__ = "learning_events"
+
+class Event(Base):
+    """One learning or practice session; `kind` says which.
+
+    Both kinds share the `events` table, so timelines, counts and aggregations
+    over a user or skill are one index scan (group by `kind` where they need
+    the split). LearningEvent and PracticeEvent map the two kinds with
+    single-table inheritance: querying either one filters on its kind, and new
+    rows get the kind set automatically.
+    """
+    __tablename__ = "events"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     skill_id = Column(UUID(as_uuid=True), ForeignKey("skills.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String(10), nullable=False)  # learning, practice
     date = Column(Date, nullable=False)
-    type = Column(String(50), nullable=False)  # reading, video, course, article, documentation, tutorial
+    type = Column(String(50), nullable=False)  # see LearningEvent / PracticeEvent
     notes = Column(Text, nullable=True)
     duration_minutes = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    # Relationships
-    skill = relationship("Skill", back_populates="learning_events")
-    user = relationship("User", back_populates="learning_events")
+    __mapper_args__ = {"polymorphic_on": kind}
 
     # Indexes
     __table_args__ = (
-        Index("idx_learning_events_skill", "skill_id", "date"),
+        CheckConstraint("kind IN ('learning', 'practice')", name="ck_events_kind"),
+        Index("ix_events_skill_date", "skill_id", "date"),
+        Index("ix_events_user_date", "user_id", "date",
+              postgresql_include=["kind", "id", "skill_id", "duration_minutes"]),
     )
 
 
-class PracticeEvent(Base):
-    __tablename__ = "practice_events"
+class LearningEvent(Event):
+    # type: reading, video, course, article, documentation, tutorial
+    __mapper_args__ = {"polymorphic_identity": "learning"}
+
+    # Relationships
+    skill = relationship("Skill", back_populates="learning_events")
+    user = relationship("User", back_populates="learning_events")
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    skill_id = Column(UUID(as_uuid=True), ForeignKey("skills.id", ondelete="CASCADE"), nullable=False)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    date = Column(Date, nullable=False)
-    type = Column(String(50), nullable=False)  # exercise, project, work, teaching, writing, building
-    notes = Column(Text, nullable=True)
-    duration_minutes = Column(Integer, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+
+class PracticeEvent(Event):
+    # type: exercise, project, work, teaching, writing, building
+    __mapper_args__ = {"polymorphic_identity": "practice"}
 
     # Relationships
     skill = relationship("Skill", back_populates="practice_events")
     user = relationship("User", back_populates="practice_events")
-
-    # Indexes
-    __table_args__ = (
-        Index("idx_practice_events_skill", "skill_id", "date"),
-    )
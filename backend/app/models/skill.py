@@ -1,7 +1,7 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint, Float, Text, Table
+from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint, Float, Text, Table, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 from datetime import datetime
 from app.core.database import Base
 
@@ -34,8 +34,8 @@ class Skill(Base):
     # Relationships
     user = relationship("User", back_populates="skills")
     category_obj = relationship("Category", back_populates="skills")
-    learning_events = relationship("LearningEvent", back_populates="skill", cascade="all, delete-orphan")
-    practice_events = relationship("PracticeEvent", back_populates="skill", cascade="all, delete-orphan")
+    learning_events = relationship("LearningEvent", back_populates="skill", cascade="all, delete-orphan", passive_deletes=True)
+    practice_events = relationship("PracticeEvent", back_populates="skill", cascade="all, delete-orphan", passive_deletes=True)
 
     # Self-referential many-to-many for dependencies
     dependencies = relationship(
@@ -43,10 +43,12 @@ class Skill(Base):
         secondary=skill_dependencies,
         primaryjoin=id == skill_dependencies.c.skill_id,
         secondaryjoin=id == skill_dependencies.c.depends_on_id,
-        backref="dependents"
+        backref=backref("dependents", passive_deletes=True),
+        passive_deletes=True,
     )
 
     # Constraints
     __table_args__ = (
         UniqueConstraint("user_id", "name", name="uq_user_skill_name"),
+        Index("ix_skills_user_active", "user_id", postgresql_where=archived_at.is_(None)),
     )
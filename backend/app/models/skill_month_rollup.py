@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Date, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class SkillMonthRollup(Base):
+    """Per-skill monthly time totals; see services/time_rollups.py.
+
+    `month` is the first day of the month. A row exists only while the skill has at
+    least one event in that month; `first_day`/`last_day` are its earliest and latest
+    event dates.
+    """
+    __tablename__ = "skill_month_rollups"
+
+    skill_id = Column(UUID(as_uuid=True), ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    learning_minutes = Column(Integer, nullable=False, default=0)
+    practice_minutes = Column(Integer, nullable=False, default=0)
+    learning_timed = Column(Integer, nullable=False, default=0)
+    learning_untimed = Column(Integer, nullable=False, default=0)
+    practice_timed = Column(Integer, nullable=False, default=0)
+    practice_untimed = Column(Integer, nullable=False, default=0)
+    first_day = Column(Date, nullable=False)
+    last_day = Column(Date, nullable=False)
+
+    __table_args__ = (
+        Index("ix_skill_month_rollups_user_month", "user_id", "month"),
+    )
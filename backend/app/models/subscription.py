@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, ForeignKey, Numeric, Text, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Integer, Numeric, Text, JSON, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -27,7 +27,14 @@ class Subscription(Base):
     currency = Column(String(3), nullable=False, default='AZN')
     raw_callback = Column(JSON, default=dict, nullable=True)
     notes = Column(Text, nullable=True)
+    # Backoff state for services/payment_reconcile.py while the order is pending
+    reconcile_attempts = Column(Integer, nullable=False, default=0, server_default='0')
+    next_reconcile_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     user = relationship("User", back_populates="subscriptions")
+
+    __table_args__ = (
+        Index("ix_subscriptions_reconcile_due", "next_reconcile_at", postgresql_where=text("status = 'pending'")),
+    )
@@ -19,7 +19,7 @@ class Ticket(Base):
 
     # Relationships
     user = relationship("User", back_populates="tickets")
-    replies = relationship("TicketReply", back_populates="ticket", cascade="all, delete-orphan", order_by="TicketReply.created_at")
+    replies = relationship("TicketReply", back_populates="ticket", cascade="all, delete-orphan", passive_deletes=True, order_by="TicketReply.created_at")
 
 
 class TicketReply(Base):
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime, JSON, Boolean
+from sqlalchemy import Column, String, DateTime, JSON, Boolean, Index, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -16,13 +16,20 @@ class User(Base):
     settings = Column(JSON, default={})
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    deleted_at = Column(DateTime, nullable=True)  # soft-deleted, purge pending (services/account_purge.py)
+    feed_token_version = Column(Integer, nullable=False, default=0, server_default='0')  # bump to revoke feed URLs
 
-    # Relationships
-    skills = relationship("Skill", back_populates="user", cascade="all, delete-orphan")
-    learning_events = relationship("LearningEvent", back_populates="user", cascade="all, delete-orphan")
-    practice_events = relationship("PracticeEvent", back_populates="user", cascade="all, delete-orphan")
-    event_templates = relationship("EventTemplate", back_populates="user", cascade="all, delete-orphan")
-    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan")
-    tickets = relationship("Ticket", back_populates="user", cascade="all, delete-orphan")
-    ticket_replies = relationship("TicketReply", back_populates="user", cascade="all, delete-orphan")
-    subscriptions = relationship("Subscription", back_populates="user", cascade="all, delete-orphan")
+    # Relationships. The foreign keys cascade in the database (ON DELETE CASCADE), so
+    # deleting a user or skill never loads these collections (passive_deletes).
+    skills = relationship("Skill", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    learning_events = relationship("LearningEvent", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    practice_events = relationship("PracticeEvent", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    event_templates = relationship("EventTemplate", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    tickets = relationship("Ticket", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    ticket_replies = relationship("TicketReply", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    subscriptions = relationship("Subscription", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_users_deleted", "deleted_at", postgresql_where=deleted_at.is_not(None)),
+    )
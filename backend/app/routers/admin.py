@@ -1,14 +1,18 @@
 from datetime import datetime, timedelta
 from typing import Optional, List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func, or_
+from sqlalchemy.exc import IntegrityError
 
 from app.core.database import get_db
 from app.core.security import get_password_hash
+from app.core.writes import update_returning
+from app.services.account_purge import run_account_purge, soft_delete_user
 from app.services.auth import get_current_admin_user
 from app.services.freshness import calculate_freshness
+from app.services.time_rollups import add_events, move_event, remove_events, snapshot
 from app.models.user import User
 from app.models.skill import Skill
 from app.models.category import Category
@@ -43,7 +47,7 @@ def get_admin_stats(
     seven_days_ago = datetime.utcnow() - timedelta(days=7)
 
     return AdminDashboardStats(
-        total_users=db.query(User).count(),
+        total_users=db.query(User).filter(User.deleted_at.is_(None)).count(),
         total_skills=db.query(Skill).count(),
         total_categories=db.query(Category).count(),
         total_learning_events=db.query(LearningEvent).count(),
@@ -51,7 +55,7 @@ def get_admin_stats(
         total_templates=db.query(EventTemplate).count(),
         total_tickets=db.query(Ticket).count(),
         open_tickets=db.query(Ticket).filter(Ticket.status.in_(["open", "in_progress"])).count(),
-        users_last_7_days=db.query(User).filter(User.created_at >= seven_days_ago).count(),
+        users_last_7_days=db.query(User).filter(User.deleted_at.is_(None), User.created_at >= seven_days_ago).count(),
         events_last_7_days=(
             db.query(LearningEvent).filter(LearningEvent.created_at >= seven_days_ago).count() +
             db.query(PracticeEvent).filter(PracticeEvent.created_at >= seven_days_ago).count()
@@ -70,7 +74,7 @@ def list_users(
     current_user: User = Depends(get_current_admin_user)
 ):
     """List all users with pagination and filtering."""
-    query = db.query(User)
+    query = db.query(User).filter(User.deleted_at.is_(None))
 
     # Apply filters
     if search:
@@ -115,7 +119,7 @@ def get_user(
     current_user: User = Depends(get_current_admin_user)
 ):
     """Get a specific user by ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -139,7 +143,7 @@ def get_user_full_details(
     current_user: User = Depends(get_current_admin_user)
 ):
     """Get comprehensive user details including all their data."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -303,7 +307,6 @@ def create_user(
     )
     db.add(user)
     db.commit()
-    db.refresh(user)
 
     return {
         "id": user.id,
@@ -326,27 +329,20 @@ def update_user(
     current_user: User = Depends(get_current_admin_user)
 ):
     """Update a user."""
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-
-    if data.email is not None:
-        existing = db.query(User).filter(User.email == data.email, User.id != user_id).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="Email already registered")
-        user.email = data.email
-
+    values = data.model_dump(exclude_none=True, exclude={"password"})
     if data.password is not None:
-        user.password_hash = get_password_hash(data.password)
-
-    if data.is_admin is not None:
-        user.is_admin = data.is_admin
+        values["password_hash"] = get_password_hash(data.password)
 
-    if data.settings is not None:
-        user.settings = data.settings
+    # A taken email fails on the users.email unique index rather than a prior SELECT
+    try:
+        user = update_returning(db, User, values, User.id == user_id, User.deleted_at.is_(None))
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
     db.commit()
-    db.refresh(user)
 
     return {
         "id": user.id,
@@ -364,11 +360,12 @@ def update_user(
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_user(
     user_id: UUID,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """Delete a user and all their data."""
-    user = db.query(User).filter(User.id == user_id).first()
+    """Delete a user and all their data (soft-deleted now, purged after the response)."""
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -376,8 +373,9 @@ def delete_user(
     if user.id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot delete your own account from admin panel")
 
-    db.delete(user)
+    soft_delete_user(db, user)
     db.commit()
+    background_tasks.add_task(run_account_purge, user.id)
 
 
 # ==================== Categories CRUD ====================
@@ -467,7 +465,6 @@ def create_category(
     cat = Category(name=data.name, user_id=data.user_id)
     db.add(cat)
     db.commit()
-    db.refresh(cat)
 
     return {
         "id": cat.id,
@@ -487,22 +484,20 @@ def update_category(
     current_user: User = Depends(get_current_admin_user)
 ):
     """Update a category."""
-    cat = db.query(Category).filter(Category.id == category_id).first()
-    if not cat:
-        raise HTTPException(status_code=404, detail="Category not found")
-
-    if data.name is not None:
-        cat.name = data.name
+    user = None
     if data.user_id is not None:
         user = db.query(User).filter(User.id == data.user_id).first()
         if not user:
             raise HTTPException(status_code=400, detail="User not found")
-        cat.user_id = data.user_id
+
+    cat = update_returning(db, Category, data.model_dump(exclude_none=True), Category.id == category_id)
+    if not cat:
+        raise HTTPException(status_code=404, detail="Category not found")
 
     db.commit()
-    db.refresh(cat)
 
-    user = db.query(User).filter(User.id == cat.user_id).first()
+    if user is None:
+        user = db.query(User).filter(User.id == cat.user_id).first()
     return {
         "id": cat.id,
         "name": cat.name,
@@ -670,7 +665,6 @@ def create_skill(
     )
     db.add(skill)
     db.commit()
-    db.refresh(skill)
 
     category = db.query(Category).filter(Category.id == skill.category_id).first() if skill.category_id else None
 
@@ -700,32 +694,20 @@ def update_skill(
     current_user: User = Depends(get_current_admin_user)
 ):
     """Update a skill."""
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
-    if not skill:
-        raise HTTPException(status_code=404, detail="Skill not found")
-
-    if data.name is not None:
-        skill.name = data.name
+    user = None
     if data.user_id is not None:
         user = db.query(User).filter(User.id == data.user_id).first()
         if not user:
             raise HTTPException(status_code=400, detail="User not found")
-        skill.user_id = data.user_id
-    if data.category_id is not None:
-        skill.category_id = data.category_id
-    if data.decay_rate is not None:
-        skill.decay_rate = data.decay_rate
-    if data.target_freshness is not None:
-        skill.target_freshness = data.target_freshness
-    if data.notes is not None:
-        skill.notes = data.notes
-    if data.archived_at is not None:
-        skill.archived_at = data.archived_at
+
+    skill = update_returning(db, Skill, data.model_dump(exclude_none=True), Skill.id == skill_id)
+    if not skill:
+        raise HTTPException(status_code=404, detail="Skill not found")
 
     db.commit()
-    db.refresh(skill)
 
-    user = db.query(User).filter(User.id == skill.user_id).first()
+    if user is None:
+        user = db.query(User).filter(User.id == skill.user_id).first()
     category = db.query(Category).filter(Category.id == skill.category_id).first() if skill.category_id else None
 
     learning_events = db.query(LearningEvent).filter(LearningEvent.skill_id == skill.id).all()
@@ -761,12 +743,10 @@ def delete_skill(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
-    """Delete a skill."""
-    skill = db.query(Skill).filter(Skill.id == skill_id).first()
-    if not skill:
+    """Delete a skill. Its events, dependencies and rollups go with it via ON DELETE CASCADE."""
+    deleted = db.query(Skill).filter(Skill.id == skill_id).delete(synchronize_session=False)
+    if not deleted:
         raise HTTPException(status_code=404, detail="Skill not found")
-
-    db.delete(skill)
     db.commit()
 
 
@@ -878,8 +858,8 @@ def create_learning_event(
         duration_minutes=data.duration_minutes
     )
     db.add(event)
+    add_events(db, [event])
     db.commit()
-    db.refresh(event)
 
     return {
         "id": event.id,
@@ -907,6 +887,7 @@ def update_learning_event(
     if not event:
         raise HTTPException(status_code=404, detail="Learning event not found")
 
+    before = snapshot(event)
     if data.skill_id is not None:
         event.skill_id = data.skill_id
     if data.user_id is not None:
@@ -920,8 +901,8 @@ def update_learning_event(
     if data.duration_minutes is not None:
         event.duration_minutes = data.duration_minutes
 
+    move_event(db, event, before)
     db.commit()
-    db.refresh(event)
 
     user = db.query(User).filter(User.id == event.user_id).first()
     skill = db.query(Skill).filter(Skill.id == event.skill_id).first()
@@ -952,6 +933,7 @@ def delete_learning_event(
         raise HTTPException(status_code=404, detail="Learning event not found")
 
     db.delete(event)
+    remove_events(db, [event])
     db.commit()
 
 
@@ -1063,8 +1045,8 @@ def create_practice_event(
         duration_minutes=data.duration_minutes
     )
     db.add(event)
+    add_events(db, [event])
     db.commit()
-    db.refresh(event)
 
     return {
         "id": event.id,
@@ -1092,6 +1074,7 @@ def update_practice_event(
     if not event:
         raise HTTPException(status_code=404, detail="Practice event not found")
 
+    before = snapshot(event)
     if data.skill_id is not None:
         event.skill_id = data.skill_id
     if data.user_id is not None:
@@ -1105,8 +1088,8 @@ def update_practice_event(
     if data.duration_minutes is not None:
         event.duration_minutes = data.duration_minutes
 
+    move_event(db, event, before)
     db.commit()
-    db.refresh(event)
 
     user = db.query(User).filter(User.id == event.user_id).first()
     skill = db.query(Skill).filter(Skill.id == event.skill_id).first()
@@ -1137,6 +1120,7 @@ def delete_practice_event(
         raise HTTPException(status_code=404, detail="Practice event not found")
 
     db.delete(event)
+    remove_events(db, [event])
     db.commit()
 
 
@@ -1235,7 +1219,6 @@ def create_template(
     )
     db.add(template)
     db.commit()
-    db.refresh(template)
 
     return {
         "id": template.id,
@@ -1258,30 +1241,20 @@ def update_template(
     current_user: User = Depends(get_current_admin_user)
 ):
     """Update an event template."""
-    template = db.query(EventTemplate).filter(EventTemplate.id == template_id).first()
-    if not template:
-        raise HTTPException(status_code=404, detail="Template not found")
-
+    user = None
     if data.user_id is not None:
         user = db.query(User).filter(User.id == data.user_id).first()
         if not user:
             raise HTTPException(status_code=400, detail="User not found")
-        template.user_id = data.user_id
-    if data.name is not None:
-        template.name = data.name
-    if data.event_type is not None:
-        template.event_type = data.event_type
-    if data.type is not None:
-        template.type = data.type
-    if data.default_duration_minutes is not None:
-        template.default_duration_minutes = data.default_duration_minutes
-    if data.default_notes is not None:
-        template.default_notes = data.default_notes
+
+    template = update_returning(db, EventTemplate, data.model_dump(exclude_none=True), EventTemplate.id == template_id)
+    if not template:
+        raise HTTPException(status_code=404, detail="Template not found")
 
     db.commit()
-    db.refresh(template)
 
-    user = db.query(User).filter(User.id == template.user_id).first()
+    if user is None:
+        user = db.query(User).filter(User.id == template.user_id).first()
 
     return {
         "id": template.id,
@@ -1412,17 +1385,14 @@ def update_ticket(
     current_user: User = Depends(get_current_admin_user)
 ):
     """Update a ticket status."""
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    if data.status is not None and data.status not in ["open", "in_progress", "resolved", "closed"]:
+        raise HTTPException(status_code=400, detail="Invalid status")
+
+    ticket = update_returning(db, Ticket, data.model_dump(exclude_none=True), Ticket.id == ticket_id)
     if not ticket:
         raise HTTPException(status_code=404, detail="Ticket not found")
 
-    if data.status is not None:
-        if data.status not in ["open", "in_progress", "resolved", "closed"]:
-            raise HTTPException(status_code=400, detail="Invalid status")
-        ticket.status = data.status
-
     db.commit()
-    db.refresh(ticket)
 
     user = db.query(User).filter(User.id == ticket.user_id).first()
     reply_count = db.query(func.count(TicketReply.id)).filter(TicketReply.ticket_id == ticket.id).scalar()
@@ -1465,7 +1435,6 @@ def add_admin_reply(
 
     db.add(reply)
     db.commit()
-    db.refresh(reply)
 
     return {
         "id": reply.id,
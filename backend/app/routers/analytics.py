@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from datetime import datetime, date, timedelta
+from datetime import date, timedelta, timezone
+from email.utils import format_datetime
 from typing import Literal
 from uuid import UUID
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.security import create_calendar_feed_token, decode_calendar_feed_token, verify_calendar_feed_token
+from app.core.writes import update_returning
 from app.models.user import User
 from app.models.skill import Skill
-from app.models.event import LearningEvent, PracticeEvent
+from app.models.event import Event
 from app.services.auth import get_current_user
-from app.services.entitlements import require_pro
+from app.services.entitlements import require_pro, can_use_feature
+from app.services.calendar_feed import feed_version, stream_feed, default_since
 from app.services.freshness import calculate_balance_ratio, get_balance_interpretation, calculate_freshness_history
+from app.services.personal_records import get_personal_records
+from app.services.time_rollups import session_counts
 from app.services.time_stats import time_summary, time_report
 from app.schemas.skill import FreshnessHistoryResponse
 from app.schemas.analytics import TimeSummaryResponse, TimeReportResponse
@@ -35,15 +43,12 @@ def get_dashboard_data(
     # Get events from last 7 days
     week_ago = date.today() - timedelta(days=7)
 
-    learning_events_week = db.query(LearningEvent).filter(
-        LearningEvent.user_id == current_user.id,
-        LearningEvent.date >= week_ago
-    ).count()
-
-    practice_events_week = db.query(PracticeEvent).filter(
-        PracticeEvent.user_id == current_user.id,
-        PracticeEvent.date >= week_ago
-    ).count()
+    week_counts = dict(db.query(Event.kind, func.count(Event.id)).filter(
+        Event.user_id == current_user.id,
+        Event.date >= week_ago
+    ).group_by(Event.kind).all())
+    learning_events_week = week_counts.get("learning", 0)
+    practice_events_week = week_counts.get("practice", 0)
 
     # Calculate weekly balance ratio
     weekly_ratio = calculate_balance_ratio(learning_events_week, practice_events_week)
@@ -81,27 +86,22 @@ def get_balance_data(
 
     start_date = today - timedelta(days=days)
 
-    # Get learning events grouped by period
-    learning_query = db.query(
-        func.date_trunc('day', LearningEvent.date).label('period'),
-        func.count(LearningEvent.id).label('count')
+    # Events per (day, kind)
+    rows = db.query(
+        func.date_trunc('day', Event.date).label('period'),
+        Event.kind,
+        func.count(Event.id).label('count')
     ).filter(
-        LearningEvent.user_id == current_user.id,
-        LearningEvent.date >= start_date
-    ).group_by('period').all()
-
-    # Get practice events grouped by period
-    practice_query = db.query(
-        func.date_trunc('day', PracticeEvent.date).label('period'),
-        func.count(PracticeEvent.id).label('count')
-    ).filter(
-        PracticeEvent.user_id == current_user.id,
-        PracticeEvent.date >= start_date
-    ).group_by('period').all()
+        Event.user_id == current_user.id,
+        Event.date >= start_date
+    ).group_by('period', Event.kind).all()
 
     # Format data for chart
-    learning_data = {str(row.period.date()): row.count for row in learning_query}
-    practice_data = {str(row.period.date()): row.count for row in practice_query}
+    per_kind = {"learning": {}, "practice": {}}
+    for row in rows:
+        per_kind[row.kind][str(row.period.date())] = row.count
+    learning_data = per_kind["learning"]
+    practice_data = per_kind["practice"]
 
     # Generate all dates in range
     all_dates = []
@@ -153,51 +153,26 @@ def get_calendar_data(
     else:
         last_day = date(target_year, target_month + 1, 1) - timedelta(days=1)
 
-    # Get all learning events for the month with skill names
-    learning_events = db.query(LearningEvent, Skill.name).join(
-        Skill, LearningEvent.skill_id == Skill.id
+    # All events for the month with skill names, learning before practice on each day
+    events = db.query(Event, Skill.name).join(
+        Skill, Event.skill_id == Skill.id
     ).filter(
-        LearningEvent.user_id == current_user.id,
-        LearningEvent.date >= first_day,
-        LearningEvent.date <= last_day
-    ).all()
-
-    # Get all practice events for the month with skill names
-    practice_events = db.query(PracticeEvent, Skill.name).join(
-        Skill, PracticeEvent.skill_id == Skill.id
-    ).filter(
-        PracticeEvent.user_id == current_user.id,
-        PracticeEvent.date >= first_day,
-        PracticeEvent.date <= last_day
-    ).all()
+        Event.user_id == current_user.id,
+        Event.date >= first_day,
+        Event.date <= last_day,
+        Skill.user_id == current_user.id  # lets the join read only this user's skills
+    ).order_by(Event.date, Event.kind).all()
 
     # Group events by date
     events_by_date = {}
 
-    for event, skill_name in learning_events:
-        date_str = str(event.date)
-        if date_str not in events_by_date:
-            events_by_date[date_str] = []
-        events_by_date[date_str].append({
-            "id": str(event.id),
-            "skill_name": skill_name,
-            "skill_id": str(event.skill_id),
-            "type": event.type,
-            "event_type": "learning",
-            "notes": event.notes,
-            "duration_minutes": event.duration_minutes
-        })
-
-    for event, skill_name in practice_events:
-        date_str = str(event.date)
-        if date_str not in events_by_date:
-            events_by_date[date_str] = []
-        events_by_date[date_str].append({
+    for event, skill_name in events:
+        events_by_date.setdefault(str(event.date), []).append({
             "id": str(event.id),
             "skill_name": skill_name,
             "skill_id": str(event.skill_id),
             "type": event.type,
-            "event_type": "practice",
+            "event_type": event.kind,
             "notes": event.notes,
             "duration_minutes": event.duration_minutes
         })
@@ -209,6 +184,96 @@ def get_calendar_data(
     }
 
 
+def _feed_url(user: User) -> str:
+    token = create_calendar_feed_token(user.id, user.feed_token_version)
+    return f"{settings.BACKEND_URL}/api/analytics/calendar/feed/{token}.ics"
+
+
+@router.get("/calendar/feed-url")
+def get_calendar_feed_url(
+    current_user: User = Depends(get_current_user),
+    _pro: User = Depends(require_pro),
+):
+    """
+    Get the private iCalendar subscription URL for the current user (PRO).
+    """
+    return {"url": _feed_url(current_user)}
+
+
+@router.post("/calendar/feed-url/regenerate")
+def regenerate_calendar_feed_url(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke the current calendar feed URL and return a new one.
+
+    Not PRO-gated, so a URL that leaked can be revoked after a downgrade too.
+    """
+    user = update_returning(
+        db, User, {"feed_token_version": User.feed_token_version + 1}, User.id == current_user.id
+    )
+    db.commit()
+    return {"url": _feed_url(user)}
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """Evaluate If-None-Match.
+
+    If-Modified-Since alone never yields 304: Last-Modified is the latest event
+    `updated_at`, which deletes and skill renames don't move, so only the ETag
+    (which does cover them) can prove the client's copy is current.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+
+
+@router.get("/calendar/feed/{token}.ics")
+def get_calendar_feed(
+    token: str,
+    request: Request,
+    since: date = Query(None, description="Only include events on or after this date; defaults to one year ago"),
+    db: Session = Depends(get_db)
+):
+    """
+    iCalendar feed of the user's events, authenticated by the token in the URL (PRO).
+
+    Carries an ETag over the feed contents (and Last-Modified from the latest event
+    write), so clients revalidating with If-None-Match get 304 Not Modified until
+    something changes.
+    """
+    user_id = decode_calendar_feed_token(token)
+    user = db.query(User).filter(User.id == user_id, User.deleted_at.is_(None)).first() if user_id else None
+    if not user or not verify_calendar_feed_token(token, user.id, user.feed_token_version):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Calendar feed not found"
+        )
+    if not can_use_feature(user, db, "calendar_export"):
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail={"error": "pro_required", "upgrade_url": "/pricing"},
+        )
+
+    since = default_since(since)
+    version = feed_version(db, user, since)
+    headers = {
+        "ETag": version.etag,
+        "Last-Modified": format_datetime(version.last_modified.replace(tzinfo=timezone.utc), usegmt=True),
+        "Cache-Control": "private, no-cache",
+    }
+    if _not_modified(request, version.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return StreamingResponse(
+        stream_feed(db, user, since, version),
+        media_type="text/calendar; charset=utf-8",
+        headers=headers,
+    )
+
+
 @router.get("/skills-by-freshness")
 def get_skills_by_freshness(
     current_user: User = Depends(get_current_user),
@@ -320,39 +385,12 @@ def get_period_comparison(
     current_month_start = date(today.year, today.month, 1)
 
     # Last month range
-    if today.month == 1:
-        last_month_start = date(today.year - 1, 12, 1)
-        last_month_end = date(today.year - 1, 12, 31)
-    else:
-        last_month_start = date(today.year, today.month - 1, 1)
-        if today.month == 2:
-            last_month_end = date(today.year, today.month, 1) - timedelta(days=1)
-        else:
-            last_month_end = date(today.year, today.month, 1) - timedelta(days=1)
+    last_month_start = (current_month_start - timedelta(days=1)).replace(day=1)
 
-    # Current month events
-    current_learning = db.query(LearningEvent).filter(
-        LearningEvent.user_id == current_user.id,
-        LearningEvent.date >= current_month_start
-    ).count()
-
-    current_practice = db.query(PracticeEvent).filter(
-        PracticeEvent.user_id == current_user.id,
-        PracticeEvent.date >= current_month_start
-    ).count()
-
-    # Last month events
-    last_learning = db.query(LearningEvent).filter(
-        LearningEvent.user_id == current_user.id,
-        LearningEvent.date >= last_month_start,
-        LearningEvent.date <= last_month_end
-    ).count()
-
-    last_practice = db.query(PracticeEvent).filter(
-        PracticeEvent.user_id == current_user.id,
-        PracticeEvent.date >= last_month_start,
-        PracticeEvent.date <= last_month_end
-    ).count()
+    # Session counts from the monthly rollup; the current month is open-ended,
+    # so future-dated events count towards it.
+    current_learning, current_practice = session_counts(db, current_user.id, current_month_start)
+    last_learning, last_practice = session_counts(db, current_user.id, last_month_start, last_month_start)
 
     # Calculate changes
     learning_change = current_learning - last_learning
@@ -464,8 +502,6 @@ def get_skill_personal_records(
     """
     Get personal records for a specific skill.
     """
-    from app.services.freshness import calculate_personal_records
-
     skill = db.query(Skill).filter(
         Skill.id == skill_id,
         Skill.user_id == current_user.id
@@ -477,15 +513,7 @@ def get_skill_personal_records(
             detail="Skill not found"
         )
 
-    learning_events = [(e.date, e.type) for e in skill.learning_events]
-    practice_events = [(e.date, e.type) for e in skill.practice_events]
-
-    records = calculate_personal_records(
-        skill_created_at=skill.created_at.date(),
-        learning_events=learning_events,
-        practice_events=practice_events,
-        base_decay_rate=skill.decay_rate or 0.02
-    )
+    records = get_personal_records(db, skill)
 
     return {
         "skill_id": str(skill.id),
@@ -39,7 +39,6 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
     db.add(new_user)
     db.commit()
-    db.refresh(new_user)
 
     return new_user
 
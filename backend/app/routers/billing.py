@@ -1,6 +1,11 @@
+import asyncio
 import logging
+import time
+import uuid
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core import gateway
@@ -9,6 +14,7 @@ from app.core.database import get_db
 from app.models.subscription import Subscription
 from app.models.user import User
 from app.services import billing as billing_service
+from app.services import payment_reconcile
 from app.services.auth import get_current_user
 from app.services.entitlements import get_user_plan
 
@@ -16,6 +22,10 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/billing", tags=["Billing"])
 
+# GET /status?wait=N long-polls a pending order, re-reading it every STATUS_POLL_SECONDS.
+MAX_STATUS_WAIT_SECONDS = 20
+STATUS_POLL_SECONDS = 1.0
+
 
 @router.get("/me")
 def get_my_plan(
@@ -75,45 +85,49 @@ def create_checkout(
     sub = Subscription(
         user_id=current_user.id, plan="lifetime", status="pending",
         provider="epoint", order_id=order_id, amount=price, currency="AZN",
+        # The webhook normally settles it first; the reconciler is the fallback.
+        next_reconcile_at=payment_reconcile.next_check_at(0),
     )
     db.add(sub)
     db.commit()
     return {"redirect_url": result["redirect_url"], "order_id": order_id}
 
 
+def _order_status(db: Session, order_id: str, user_id: uuid.UUID) -> Optional[str]:
+    """The order's status. Ends the read transaction, so no connection is held between long-poll reads."""
+    try:
+        return db.query(Subscription.status).filter(
+            Subscription.order_id == order_id,
+            Subscription.user_id == user_id,
+        ).scalar()
+    finally:
+        db.rollback()
+
+
 @router.get("/status")
-def checkout_status(
+async def checkout_status(
     order_id: str,
+    wait: int = Query(0, ge=0, le=MAX_STATUS_WAIT_SECONDS),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Authoritative status of the caller's payment; reconciles a pending order with the hub."""
-    sub = db.query(Subscription).filter(
-        Subscription.order_id == order_id,
-        Subscription.user_id == current_user.id,
-    ).first()
-    if not sub:
+    """Status of the caller's payment, read from the database only.
+
+    A pending order is settled by the hub webhook or, failing that, by the background
+    reconciler (services/payment_reconcile.py); polling this never calls the hub.
+    With `wait=N` a pending order is long-polled: the response comes as soon as its
+    status changes, or after N seconds. The wait holds no thread, and the blocking
+    database reads run in the threadpool, never on the event loop.
+    """
+    user_id = current_user.id
+    status = await run_in_threadpool(_order_status, db, order_id, user_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="unknown order")
 
-    if sub.status == "pending":
-        try:
-            hub = gateway.get_status(order_id)
-        except gateway.GatewayError as exc:
-            logger.warning("Reconcile for %s: hub error: %s", order_id, exc)
-            hub = None
-        except Exception:
-            logger.warning("Reconcile for %s failed to reach hub", order_id)
-            hub = None
-        if hub:
-            if hub.get("status") == "success":
-                billing_service.activate_subscription(sub, hub)
-                db.commit()
-            elif hub.get("status") in ("failed", "error"):
-                billing_service.fail_subscription(sub)
-                db.commit()
+    deadline = time.monotonic() + wait
+    while status == "pending" and time.monotonic() < deadline:
+        await asyncio.sleep(STATUS_POLL_SECONDS)
+        status = await run_in_threadpool(_order_status, db, order_id, user_id)
 
-    return {
-        "order_id": order_id,
-        "status": sub.status,
-        "is_pro": get_user_plan(current_user, db).is_pro,
-    }
+    plan = await run_in_threadpool(get_user_plan, current_user, db)
+    return {"order_id": order_id, "status": status, "is_pro": plan.is_pro}
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional
 from app.core.database import get_db
 from app.models.user import User
 from app.models.category import Category
@@ -9,17 +9,19 @@ from app.models.skill import Skill
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from app.services.auth import get_current_user
 from app.services.entitlements import get_limit
+from app.services.skill_writes import CATEGORY_EXISTS, DuplicateNameError, insert_category, update_owned
 from uuid import UUID
 
 router = APIRouter(prefix="/api/categories", tags=["Categories"])
 
 
-def enrich_category(category: Category, db: Session) -> dict:
-    """Add skill count to category response."""
-    skill_count = db.query(func.count(Skill.id)).filter(
-        Skill.category_id == category.id,
-        Skill.archived_at.is_(None)
-    ).scalar()
+def enrich_category(category: Category, db: Session, skill_count: Optional[int] = None) -> dict:
+    """Add skill count to category response (counted unless the caller already knows it)."""
+    if skill_count is None:
+        skill_count = db.query(func.count(Skill.id)).filter(
+            Skill.category_id == category.id,
+            Skill.archived_at.is_(None)
+        ).scalar()
 
     return {
         "id": category.id,
@@ -66,29 +68,16 @@ def create_category(
                 detail={"error": "pro_required", "upgrade_url": "/pricing", "limit": "categories"},
             )
 
-    # Check if category name already exists for this user
-    existing_category = db.query(Category).filter(
-        Category.user_id == current_user.id,
-        Category.name == category_data.name
-    ).first()
-
-    if existing_category:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Category with this name already exists"
-        )
-
-    # Create new category
-    new_category = Category(
-        user_id=current_user.id,
-        name=category_data.name
-    )
+    # The name's uniqueness is enforced by the insert itself (ON CONFLICT DO NOTHING)
+    try:
+        new_category = insert_category(db, current_user.id, category_data.name)
+    except DuplicateNameError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    db.add(new_category)
     db.commit()
-    db.refresh(new_category)
 
-    return enrich_category(new_category, db)
+    # A brand-new category has no skills yet
+    return enrich_category(new_category, db, skill_count=0)
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
@@ -124,10 +113,12 @@ def update_category(
     """
     Update a category's name.
     """
-    category = db.query(Category).filter(
-        Category.id == category_id,
-        Category.user_id == current_user.id
-    ).first()
+    values = {"name": category_data.name} if category_data.name is not None else {}
+    # A clashing name fails on uq_user_category_name rather than a prior SELECT
+    try:
+        category = update_owned(db, Category, category_id, current_user.id, values, duplicate=CATEGORY_EXISTS)
+    except DuplicateNameError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     if not category:
         raise HTTPException(
@@ -135,25 +126,7 @@ def update_category(
             detail="Category not found"
         )
 
-    # Update name if provided
-    if category_data.name is not None:
-        # Check for duplicate name
-        existing_category = db.query(Category).filter(
-            Category.user_id == current_user.id,
-            Category.name == category_data.name,
-            Category.id != category_id
-        ).first()
-
-        if existing_category:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Category with this name already exists"
-            )
-
-        category.name = category_data.name
-
     db.commit()
-    db.refresh(category)
 
     return enrich_category(category, db)
 
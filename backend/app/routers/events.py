@@ -1,19 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from pydantic import ValidationError
+from sqlalchemy import and_, insert, or_, select
 from sqlalchemy.orm import Session
-from typing import List, Union
+from typing import List, Literal, Optional, Union
+from datetime import date, datetime
+import base64
+import binascii
+import io
+import uuid
 from app.core.database import get_db
 from app.models.user import User
 from app.models.skill import Skill
-from app.models.event import LearningEvent, PracticeEvent
+from app.models.event import Event, LearningEvent, PracticeEvent
 from app.schemas.event import (
     LearningEventCreate, LearningEventUpdate, LearningEventResponse,
-    PracticeEventCreate, PracticeEventUpdate, PracticeEventResponse
+    PracticeEventCreate, PracticeEventUpdate, PracticeEventResponse,
+    BulkEventCreate, BulkEventItem, BulkEventResponse
 )
 from app.services.auth import get_current_user
+from app.services.csv_import import CsvImportError, import_events_csv
+from app.services.entitlements import require_pro
+from app.services.time_rollups import add_events, move_event, range_totals, remove_events, snapshot
 from uuid import UUID
 
 router = APIRouter(prefix="/api", tags=["Events"])
 
+_BULK_SCHEMAS = {
+    "learning": LearningEventCreate,
+    "practice": PracticeEventCreate,
+}
+_RESPONSES = {
+    "learning": LearningEventResponse,
+    "practice": PracticeEventResponse,
+}
+
+
+def _first_error(exc: ValidationError) -> str:
+    """Flatten a pydantic error into one readable line for per-item results."""
+    err = exc.errors()[0]
+    loc = ".".join(str(part) for part in err["loc"])
+    return f"{loc}: {err['msg']}" if loc else err["msg"]
+
 
 @router.get("/skills/{skill_id}/events")
 def get_skill_events(
@@ -36,34 +63,106 @@ def get_skill_events(
             detail="Skill not found"
         )
 
-    # Get all events
-    learning_events = db.query(LearningEvent).filter(
-        LearningEvent.skill_id == skill_id
-    ).order_by(LearningEvent.date.desc()).all()
+    # Both kinds in one pass, newest first (learning before practice on the same day)
+    events = db.query(Event).filter(
+        Event.skill_id == skill_id
+    ).order_by(Event.date.desc(), Event.kind).all()
 
-    practice_events = db.query(PracticeEvent).filter(
-        PracticeEvent.skill_id == skill_id
-    ).order_by(PracticeEvent.date.desc()).all()
+    return {"events": [
+        {**_RESPONSES[event.kind].model_validate(event).model_dump(), "event_type": event.kind}
+        for event in events
+    ]}
 
-    # Combine and format
-    events = []
 
-    for event in learning_events:
-        events.append({
-            **LearningEventResponse.model_validate(event).model_dump(),
-            "event_type": "learning"
-        })
+def _encode_cursor(event_date: date, event_id: UUID) -> str:
+    raw = f"{event_date.isoformat()}|{event_id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
 
-    for event in practice_events:
-        events.append({
-            **PracticeEventResponse.model_validate(event).model_dump(),
-            "event_type": "practice"
-        })
 
-    # Sort by date descending
-    events.sort(key=lambda x: x["date"], reverse=True)
+def _decode_cursor(cursor: str):
+    """Opaque timeline cursor -> (date, id) of the last event already returned."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        event_date, event_id = raw.split("|")
+        return date.fromisoformat(event_date), UUID(event_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
 
-    return {"events": events}
+
+@router.get("/skills/{skill_id}/timeline")
+def get_skill_timeline(
+    skill_id: UUID,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    start: Optional[date] = Query(None, description="Only events on or after this date"),
+    end: Optional[date] = Query(None, description="Only events on or before this date"),
+    event_type: Optional[Literal["learning", "practice"]] = None,
+    type: Optional[str] = Query(None, max_length=50, description="Event sub-type, e.g. 'reading'"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Page through a skill's learning and practice events, newest first.
+
+    Events are read in (date desc, id) order and paged with a keyset cursor, so
+    any page costs the same regardless of how much history exists. The first
+    page (no cursor) also carries session/duration totals for the filters, read
+    from the monthly rollup (only partial months at the range edges scan events).
+    The rollup has no sub-type dimension, so totals are null when `type` is set.
+    """
+    skill_exists = db.query(Skill.id).filter(
+        Skill.id == skill_id,
+        Skill.user_id == current_user.id
+    ).first()
+
+    if not skill_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Skill not found"
+        )
+
+    filters = []
+    if start is not None:
+        filters.append(Event.date >= start)
+    if end is not None:
+        filters.append(Event.date <= end)
+    if type is not None:
+        filters.append(Event.type == type)
+    if event_type is not None:
+        filters.append(Event.kind == event_type)
+
+    page_filters = list(filters)
+    if cursor is not None:
+        after_date, after_id = _decode_cursor(cursor)
+        page_filters.append(or_(
+            Event.date < after_date,
+            and_(Event.date == after_date, Event.id > after_id),
+        ))
+
+    rows = db.execute(
+        select(
+            Event.kind.label("event_type"),
+            Event.id, Event.skill_id, Event.user_id, Event.date, Event.type,
+            Event.notes, Event.duration_minutes, Event.created_at,
+        )
+        .where(Event.skill_id == skill_id, *page_filters)
+        .order_by(Event.date.desc(), Event.id)
+        .limit(limit + 1)
+    ).mappings().all()
+
+    has_more = len(rows) > limit
+    events = [dict(row) for row in rows[:limit]]
+    next_cursor = _encode_cursor(events[-1]["date"], events[-1]["id"]) if has_more else None
+
+    totals = None
+    if cursor is None and type is None:
+        sessions, timed, minutes = range_totals(db, skill_id, start, end, event_type)
+        totals = {"sessions": sessions, "timed_sessions": timed, "minutes": minutes}
+
+    return {"events": events, "next_cursor": next_cursor, "totals": totals}
 
 
 @router.post("/skills/{skill_id}/learning-events", response_model=LearningEventResponse, status_code=status.HTTP_201_CREATED)
@@ -99,8 +198,8 @@ def create_learning_event(
     )
 
     db.add(new_event)
+    add_events(db, [new_event])
     db.commit()
-    db.refresh(new_event)
 
     return new_event
 
@@ -138,8 +237,8 @@ def create_practice_event(
     )
 
     db.add(new_event)
+    add_events(db, [new_event])
     db.commit()
-    db.refresh(new_event)
 
     return new_event
 
@@ -165,6 +264,7 @@ def update_learning_event(
             detail="Event not found"
         )
 
+    before = snapshot(event)
     # Update fields if provided
     if event_data.date is not None:
         event.date = event_data.date
@@ -175,8 +275,8 @@ def update_learning_event(
     if event_data.duration_minutes is not None:
         event.duration_minutes = event_data.duration_minutes
 
+    move_event(db, event, before)
     db.commit()
-    db.refresh(event)
 
     return event
 
@@ -202,6 +302,7 @@ def update_practice_event(
             detail="Event not found"
         )
 
+    before = snapshot(event)
     # Update fields if provided
     if event_data.date is not None:
         event.date = event_data.date
@@ -212,8 +313,8 @@ def update_practice_event(
     if event_data.duration_minutes is not None:
         event.duration_minutes = event_data.duration_minutes
 
+    move_event(db, event, before)
     db.commit()
-    db.refresh(event)
 
     return event
 
@@ -239,6 +340,7 @@ def delete_learning_event(
         )
 
     db.delete(event)
+    remove_events(db, [event])
     db.commit()
 
     return None
@@ -265,6 +367,107 @@ def delete_practice_event(
         )
 
     db.delete(event)
+    remove_events(db, [event])
     db.commit()
 
     return None
+
+
+@router.post("/events/bulk", response_model=BulkEventResponse)
+def create_events_bulk(
+    bulk_data: BulkEventCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    _pro: User = Depends(require_pro),
+):
+    """
+    Log many learning/practice events across skills in one request (PRO).
+
+    Each item carries `skill_id`, `event_type` ('learning' or 'practice') and the
+    usual event fields. Invalid items are reported per index; valid ones of both
+    kinds are inserted with one executemany INSERT (a single multi-row VALUES
+    statement on psycopg2 for batches this size).
+    """
+    results = [None] * len(bulk_data.events)
+    parsed = []
+
+    for index, raw in enumerate(bulk_data.events):
+        try:
+            item = BulkEventItem.model_validate(raw)
+            fields = _BULK_SCHEMAS[item.event_type].model_validate(raw)
+        except ValidationError as exc:
+            results[index] = {"index": index, "status": "error", "error": _first_error(exc)}
+            continue
+        parsed.append((index, item, fields))
+
+    # One ownership check for every referenced skill.
+    skill_ids = {item.skill_id for _, item, _ in parsed}
+    owned = set()
+    if skill_ids:
+        owned = {
+            row.id for row in db.query(Skill.id).filter(
+                Skill.user_id == current_user.id,
+                Skill.id.in_(skill_ids)
+            )
+        }
+
+    now = datetime.utcnow()
+    rows = []
+    for index, item, fields in parsed:
+        if item.skill_id not in owned:
+            results[index] = {"index": index, "status": "error", "error": "Skill not found"}
+            continue
+        event_id = uuid.uuid4()
+        rows.append({
+            "id": event_id,
+            "kind": item.event_type,
+            "skill_id": item.skill_id,
+            "user_id": current_user.id,
+            "date": fields.date,
+            "type": fields.type.value,
+            "notes": fields.notes,
+            "duration_minutes": fields.duration_minutes,
+            "created_at": now,
+        })
+        results[index] = {"index": index, "status": "created", "id": event_id, "event_type": item.event_type}
+
+    if rows:
+        db.execute(insert(Event.__table__), rows)
+        add_events(db, rows)
+    db.commit()
+
+    return {
+        "created": len(rows),
+        "failed": len(results) - len(rows),
+        "results": results,
+    }
+
+
+@router.post("/events/import")
+def import_events(
+    file: UploadFile = File(..., description="UTF-8 CSV with skill, event_type, date, type columns"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    _pro: User = Depends(require_pro),
+):
+    """
+    Import historical events from a CSV file (PRO).
+
+    The file is parsed incrementally and inserted in batches inside one transaction.
+    Unknown skills and categories are created on the fly. Invalid rows are skipped and
+    reported by line number; a malformed file imports nothing.
+    """
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = import_events_csv(db, current_user, stream)
+        db.commit()
+    except CsvImportError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc)
+        )
+    finally:
+        stream.detach()
+
+    return report
@@ -0,0 +1,24 @@
+"""Liveness and readiness probes (see core/health.py)."""
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.core import health
+from app.core.database import get_db
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("")
+@router.get("/live")
+def liveness():
+    """The process is up. Never touches the database, so a slow DB doesn't get workers restarted."""
+    return {"status": "healthy"}
+
+
+@router.get("/ready")
+def readiness(db: Session = Depends(get_db)):
+    """Whether this worker should receive traffic; 503 while it can't serve requests promptly."""
+    result = health.readiness(db.get_bind())
+    body = {"status": "ready" if result["ready"] else "not_ready", "checks": result["checks"]}
+    return JSONResponse(body, status_code=200 if result["ready"] else 503)
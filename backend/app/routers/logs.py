@@ -1,25 +1,42 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import desc
 from typing import Optional
 from uuid import UUID
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 
+from app.core import metrics
 from app.core.database import get_db
 from app.models.user import User
 from app.models.activity_log import ActivityLog
+from app.models.activity_log_delete_job import ActivityLogDeleteJob
 from app.schemas.activity_log import (
     ActivityLogCreate,
     ActivityLogResponse,
     AdminActivityLogResponse,
     ActivityLogStats,
-    BulkDeleteRequest
+    BulkDeleteRequest,
+    BulkDeleteJobResponse
 )
 from app.services.auth import get_optional_current_user, get_current_admin_user
+from app.services.log_dimensions import encode_page, encode_user_agent, list_action_types, register_action_type
+from app.services.log_purge import create_delete_job, run_delete_job
+from app.services.log_rollups import compute_stats, discount_deleted_log
 
 router = APIRouter(prefix="/api", tags=["Activity Logs"])
 
 
+def _naive_utc(value: datetime) -> datetime:
+    """Convert to the naive UTC `created_at` is stored in.
+
+    Comparing the column with a plain timestamp constant lets Postgres prune
+    activity_logs partitions at plan time; an aware value would be cast per row.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 @router.post("/logs", response_model=ActivityLogResponse, status_code=status.HTTP_201_CREATED)
 async def create_log(
     log_data: ActivityLogCreate,
@@ -36,17 +53,30 @@ async def create_log(
         user_id=current_user.id if current_user else None,
         session_id=log_data.session_id,
         action_type=log_data.action_type,
-        page=log_data.page,
+        page_id=encode_page(db, log_data.page),
         details=log_data.details or {},
         ip_address=client_ip,
-        user_agent=user_agent
+        user_agent_id=encode_user_agent(db, user_agent)
     )
 
     db.add(new_log)
     db.commit()
-    db.refresh(new_log)
+    metrics.LOGS_INGESTED.inc()
+    register_action_type(db, log_data.action_type)
 
-    return new_log
+    # Page and user agent are echoed from the request: reading them through
+    # new_log.page / .user_agent would load both dictionary rows.
+    return {
+        "id": new_log.id,
+        "user_id": new_log.user_id,
+        "session_id": new_log.session_id,
+        "action_type": new_log.action_type,
+        "page": log_data.page[:255] if log_data.page else None,
+        "details": new_log.details,
+        "ip_address": new_log.ip_address,
+        "user_agent": user_agent or None,
+        "created_at": new_log.created_at,
+    }
 
 
 # Admin endpoints
@@ -72,17 +102,21 @@ async def list_logs(
         query = query.filter(ActivityLog.user_id.is_(None))
 
     if start_date:
-        query = query.filter(ActivityLog.created_at >= start_date)
+        query = query.filter(ActivityLog.created_at >= _naive_utc(start_date))
 
     if end_date:
-        query = query.filter(ActivityLog.created_at <= end_date)
+        query = query.filter(ActivityLog.created_at <= _naive_utc(end_date))
 
     # Get total count
     total = query.count()
 
     # Apply pagination
     offset = (page - 1) * page_size
-    logs = query.order_by(desc(ActivityLog.created_at)).offset(offset).limit(page_size).all()
+    logs = query.options(
+        joinedload(ActivityLog.user),
+        joinedload(ActivityLog.page_ref),
+        joinedload(ActivityLog.user_agent_ref),
+    ).order_by(desc(ActivityLog.created_at)).offset(offset).limit(page_size).all()
 
     # Enrich with user emails
     enriched_logs = []
@@ -115,54 +149,11 @@ async def get_stats(
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Get activity log statistics. Admin only."""
-    # Total logs
-    total_logs = db.query(func.count(ActivityLog.id)).scalar()
-
-    # Unique users (excluding anonymous)
-    unique_users = db.query(func.count(func.distinct(ActivityLog.user_id))).filter(
-        ActivityLog.user_id.isnot(None)
-    ).scalar()
-
-    # Unique sessions
-    unique_sessions = db.query(func.count(func.distinct(ActivityLog.session_id))).scalar()
-
-    # Logs in last 24 hours
-    last_24h = datetime.now(timezone.utc) - timedelta(hours=24)
-    logs_last_24h = db.query(func.count(ActivityLog.id)).filter(
-        ActivityLog.created_at >= last_24h
-    ).scalar()
-
-    # Top 5 pages
-    top_pages = db.query(
-        ActivityLog.page,
-        func.count(ActivityLog.id).label('count')
-    ).filter(
-        ActivityLog.page.isnot(None)
-    ).group_by(
-        ActivityLog.page
-    ).order_by(
-        desc('count')
-    ).limit(5).all()
-
-    # Top 5 actions
-    top_actions = db.query(
-        ActivityLog.action_type,
-        func.count(ActivityLog.id).label('count')
-    ).group_by(
-        ActivityLog.action_type
-    ).order_by(
-        desc('count')
-    ).limit(5).all()
+    """Get activity log statistics. Admin only.
 
-    return {
-        "total_logs": total_logs,
-        "unique_users": unique_users,
-        "unique_sessions": unique_sessions,
-        "logs_last_24h": logs_last_24h,
-        "top_pages": [{"page": p, "count": c} for p, c in top_pages],
-        "top_actions": [{"action": a, "count": c} for a, c in top_actions]
-    }
+    Served from hourly rollups plus the not-yet-rolled tail (services/log_rollups.py).
+    """
+    return compute_stats(db)
 
 
 @router.delete("/admin/logs/{log_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -180,37 +171,56 @@ async def delete_log(
             detail="Activity log not found"
         )
 
+    discount_deleted_log(db, log)
     db.delete(log)
     db.commit()
     return None
 
 
-@router.post("/admin/logs/bulk-delete", response_model=dict)
+@router.post("/admin/logs/bulk-delete", response_model=BulkDeleteJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def bulk_delete_logs(
     delete_request: BulkDeleteRequest,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Bulk delete activity logs by date range. Admin only."""
+    """Start a background bulk delete of activity logs by date range. Admin only.
+
+    Returns the job; poll GET /admin/logs/bulk-delete/{job_id} for progress.
+    """
     if not delete_request.start_date and not delete_request.end_date:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="At least one of start_date or end_date is required"
         )
 
-    query = db.query(ActivityLog)
+    job = create_delete_job(
+        db,
+        _naive_utc(delete_request.start_date) if delete_request.start_date else None,
+        _naive_utc(delete_request.end_date) if delete_request.end_date else None,
+        actor_id=current_user.id,
+    )
+    db.commit()
+    background_tasks.add_task(run_delete_job, job.id)
+    return job
 
-    if delete_request.start_date:
-        query = query.filter(ActivityLog.created_at >= delete_request.start_date)
 
-    if delete_request.end_date:
-        query = query.filter(ActivityLog.created_at <= delete_request.end_date)
+@router.get("/admin/logs/bulk-delete/{job_id}", response_model=BulkDeleteJobResponse)
+async def get_bulk_delete_job(
+    job_id: UUID,
+    current_user: User = Depends(get_current_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Get the progress of a bulk delete job. Admin only."""
+    job = db.query(ActivityLogDeleteJob).filter(ActivityLogDeleteJob.id == job_id).first()
 
-    count = query.count()
-    query.delete(synchronize_session=False)
-    db.commit()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Delete job not found"
+        )
 
-    return {"deleted_count": count}
+    return job
 
 
 @router.get("/admin/logs/action-types", response_model=list)
@@ -218,6 +228,8 @@ async def get_action_types(
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Get list of distinct action types. Admin only."""
-    action_types = db.query(func.distinct(ActivityLog.action_type)).all()
-    return [at[0] for at in action_types]
+    """Get list of distinct action types. Admin only.
+
+    Served from the activity_action_types dimension (services/log_dimensions.py).
+    """
+    return list_action_types(db)
@@ -0,0 +1,94 @@
+"""Prometheus scrape endpoint.
+
+In-process counters come from core/metrics.py. State that lives in the database
+or the connection pool is read here at scrape time, so it is current and the
+same from every worker: pool usage, the last alert run, pending bulk-delete
+jobs and how far the stats rollups lag behind.
+"""
+import hmac
+import json
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.database import engine, get_db
+from app.models.activity_log_delete_job import ActivityLogDeleteJob
+from app.services.log_rollups import get_watermark
+from app.services.site_settings import KEY_ALERTS_LAST_RUN, get_setting
+
+router = APIRouter(tags=["Monitoring"])
+
+DELETE_JOB_STATUSES = ("pending", "running", "completed", "failed")
+
+
+def _check_token(request: Request) -> None:
+    if not settings.METRICS_TOKEN:
+        return
+    supplied = request.headers.get("authorization", "")
+    if not hmac.compare_digest(supplied, f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+
+def _pool_families():
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return []
+    return [
+        ("db_pool_size", "gauge", "Configured pool size.", [("db_pool_size", {}, pool.size())]),
+        ("db_pool_checked_out", "gauge", "Connections currently checked out.",
+         [("db_pool_checked_out", {}, pool.checkedout())]),
+        ("db_pool_overflow", "gauge", "Connections open beyond pool_size (negative while the pool is filling).",
+         [("db_pool_overflow", {}, pool.overflow())]),
+    ]
+
+
+def _alert_families(db: Session):
+    raw = get_setting(db, KEY_ALERTS_LAST_RUN)
+    if raw is None:
+        return []
+    run = json.loads(raw)
+    finished_at = datetime.fromisoformat(run["finished_at"]).replace(tzinfo=timezone.utc)  # stored as naive UTC
+    return [
+        ("alerts_last_run_timestamp_seconds", "gauge", "When process_all_alerts last finished (unix time).",
+         [("alerts_last_run_timestamp_seconds", {}, round(finished_at.timestamp()))]),
+        ("alerts_last_run_duration_seconds", "gauge", "How long the last alert run took.",
+         [("alerts_last_run_duration_seconds", {}, run["duration_seconds"])]),
+        ("alerts_last_run_sent", "gauge", "Alerts found by the last run, per type.",
+         [("alerts_last_run_sent", {"type": kind}, count) for kind, count in sorted(run["alerts"].items())]),
+    ]
+
+
+def _delete_job_families(db: Session):
+    counts = dict(
+        db.query(ActivityLogDeleteJob.status, func.count(ActivityLogDeleteJob.id))
+        .group_by(ActivityLogDeleteJob.status)
+        .all()
+    )
+    return [
+        ("activity_log_delete_jobs", "gauge", "Bulk activity log delete jobs by status.",
+         [("activity_log_delete_jobs", {"status": status}, counts.get(status, 0)) for status in DELETE_JOB_STATUSES]),
+    ]
+
+
+def _rollup_families(db: Session):
+    watermark = get_watermark(db)
+    if watermark is None:
+        return []
+    lag = (datetime.utcnow() - watermark).total_seconds()
+    return [
+        ("activity_log_rollup_lag_seconds", "gauge", "Age of the newest hour folded into the stats rollups.",
+         [("activity_log_rollup_lag_seconds", {}, round(lag))]),
+    ]
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def scrape_metrics(request: Request, db: Session = Depends(get_db)):
+    """Prometheus text exposition of this worker's metrics plus shared DB state."""
+    _check_token(request)
+    extra = _pool_families() + _alert_families(db) + _delete_job_families(db) + _rollup_families(db)
+    return PlainTextResponse(metrics.REGISTRY.render(extra), media_type=metrics.CONTENT_TYPE)
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Dict, Any
 from app.core.database import get_db
 from app.models.user import User
+from app.services.account_purge import run_account_purge, soft_delete_user
 from app.services.auth import get_current_user
-import json
+from app.services.export import ExportFormat, gzip_chunks, stream_export
 
 router = APIRouter(prefix="/api/settings", tags=["Settings"])
 
@@ -42,7 +44,6 @@ def update_settings(
 
     current_user.settings = current_settings
     db.commit()
-    db.refresh(current_user)
 
     return {
         "settings": current_user.settings
@@ -51,73 +52,44 @@ def update_settings(
 
 @router.get("/export")
 def export_data(
+    request: Request,
+    format: ExportFormat = Query("json", description="json (single document) or ndjson (one record per line)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
-    Export all user data as JSON. Free for every plan — your data is always yours.
+    Export all user data. Free for every plan — your data is always yours.
+
+    Streamed from server-side cursors so memory stays flat regardless of history
+    size; gzip-encoded when the client accepts it.
     """
-    from app.models.skill import Skill
-    from app.models.event import LearningEvent, PracticeEvent
-
-    # Get all user data
-    skills = db.query(Skill).filter(Skill.user_id == current_user.id).all()
-
-    export_data = {
-        "user": {
-            "id": str(current_user.id),
-            "email": current_user.email,
-            "created_at": current_user.created_at.isoformat(),
-            "settings": current_user.settings
-        },
-        "skills": []
+    body = stream_export(db, current_user, format)
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    headers = {
+        "Content-Disposition": f'attachment; filename="skillfade-export.{format}"',
+        "Vary": "Accept-Encoding",
     }
+    if "gzip" in request.headers.get("accept-encoding", "").lower():
+        body = gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
 
-    for skill in skills:
-        skill_data = {
-            "id": str(skill.id),
-            "name": skill.name,
-            "category": skill.category_obj.name if skill.category_obj else None,
-            "created_at": skill.created_at.isoformat(),
-            "archived_at": skill.archived_at.isoformat() if skill.archived_at else None,
-            "learning_events": [],
-            "practice_events": []
-        }
-
-        for event in skill.learning_events:
-            skill_data["learning_events"].append({
-                "id": str(event.id),
-                "date": event.date.isoformat(),
-                "type": event.type,
-                "notes": event.notes,
-                "duration_minutes": event.duration_minutes,
-                "created_at": event.created_at.isoformat()
-            })
-
-        for event in skill.practice_events:
-            skill_data["practice_events"].append({
-                "id": str(event.id),
-                "date": event.date.isoformat(),
-                "type": event.type,
-                "notes": event.notes,
-                "duration_minutes": event.duration_minutes,
-                "created_at": event.created_at.isoformat()
-            })
-
-        export_data["skills"].append(skill_data)
-
-    return export_data
+    return StreamingResponse(body, media_type=media_type, headers=headers)
 
 
 @router.delete("/account")
 def delete_account(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Permanently delete user account and all associated data.
+
+    The account is soft-deleted at once (one UPDATE, after which its tokens no
+    longer resolve); its data is purged in batches after the response.
     """
-    db.delete(current_user)
+    soft_delete_user(db, current_user)
     db.commit()
+    background_tasks.add_task(run_account_purge, current_user.id)
 
     return {"message": "Account successfully deleted"}
@@ -9,7 +9,8 @@ from app.models.skill import Skill
 from app.models.category import Category
 from app.schemas.skill import SkillCreate, SkillUpdate, SkillResponse, SkillArchive, SkillDependencyUpdate
 from app.services.auth import get_current_user
-from app.services.entitlements import require_pro, get_limit, can_use_feature
+from app.services.entitlements import PRO_FEATURES, PlanInfo, get_user_plan, require_pro
+from app.services.skill_writes import SKILL_EXISTS, DuplicateNameError, ensure_category, insert_skill, update_owned
 from app.services.freshness import calculate_freshness
 from uuid import UUID
 
@@ -18,9 +19,9 @@ router = APIRouter(prefix="/api/skills", tags=["Skills"])
 PRO_REQUIRED_DETAIL = {"error": "pro_required", "upgrade_url": "/pricing"}
 
 
-def _require_feature(user: User, db: Session, feature: str):
-    """402 if the user is not entitled to a PRO-only field/feature."""
-    if not can_use_feature(user, db, feature):
+def _require_feature(plan: PlanInfo, feature: str):
+    """402 if the user's plan does not include a PRO-only field/feature."""
+    if feature in PRO_FEATURES and not plan.is_pro:
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED, detail=PRO_REQUIRED_DETAIL
         )
@@ -157,14 +158,15 @@ def create_skill(
     """
     Create a new skill.
     """
-    # PRO-only fields
+    # One plan lookup covers the PRO-only fields and the free-tier cap.
+    plan = get_user_plan(current_user, db)
     if skill_data.target_freshness is not None:
-        _require_feature(current_user, db, "freshness_targets")
+        _require_feature(plan, "freshness_targets")
     if skill_data.notes:
-        _require_feature(current_user, db, "skill_notes")
+        _require_feature(plan, "skill_notes")
 
     # Free-tier skill cap (None = unlimited for PRO / grandfathered)
-    skill_limit = get_limit(current_user, db, "skills")
+    skill_limit = plan.limits.get("skills")
     if skill_limit is not None:
         active_count = db.query(func.count(Skill.id)).filter(
             Skill.user_id == current_user.id,
@@ -176,59 +178,31 @@ def create_skill(
                 detail={**PRO_REQUIRED_DETAIL, "limit": "skills"},
             )
 
-    # Check if skill name already exists for this user
-    existing_skill = db.query(Skill).filter(
-        Skill.user_id == current_user.id,
-        Skill.name == skill_data.name
-    ).first()
-
-    if existing_skill:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Skill with this name already exists"
-        )
-
     # Handle category
-    category_id = None
+    category = None
     if skill_data.category_id:
         # Verify category belongs to user
         category = db.query(Category).filter(
             Category.id == skill_data.category_id,
             Category.user_id == current_user.id
         ).first()
-        if category:
-            category_id = category.id
     elif skill_data.category_name:
-        # Check if category with this name exists
-        category = db.query(Category).filter(
-            Category.user_id == current_user.id,
-            Category.name == skill_data.category_name
-        ).first()
-        if category:
-            category_id = category.id
-        else:
-            # Create new category
-            new_category = Category(
-                user_id=current_user.id,
-                name=skill_data.category_name
-            )
-            db.add(new_category)
-            db.flush()
-            category_id = new_category.id
-
-    # Create new skill
-    new_skill = Skill(
-        user_id=current_user.id,
-        name=skill_data.name,
-        category_id=category_id,
-        decay_rate=skill_data.decay_rate if skill_data.decay_rate is not None else 0.02,
-        target_freshness=skill_data.target_freshness,
-        notes=skill_data.notes
-    )
+        category = ensure_category(db, current_user.id, skill_data.category_name)
+
+    # The name's uniqueness is enforced by the insert itself (ON CONFLICT DO NOTHING)
+    try:
+        new_skill = insert_skill(db, {
+            "user_id": current_user.id,
+            "name": skill_data.name,
+            "category_id": category.id if category else None,
+            "decay_rate": skill_data.decay_rate if skill_data.decay_rate is not None else 0.02,
+            "target_freshness": skill_data.target_freshness,
+            "notes": skill_data.notes,
+        }, category=category)
+    except DuplicateNameError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    db.add(new_skill)
     db.commit()
-    db.refresh(new_skill)
 
     return enrich_skill_with_metrics(new_skill, db)
 
@@ -266,83 +240,72 @@ def update_skill(
     """
     Update a skill's name or category.
     """
-    skill = db.query(Skill).filter(
-        Skill.id == skill_id,
-        Skill.user_id == current_user.id
-    ).first()
+    pro_fields = skill_data.target_freshness is not None or skill_data.notes
+    # A missing skill is a 404 before the plan check or any category upsert runs; plain
+    # edits get theirs from the UPDATE itself.
+    if pro_fields or skill_data.category_name:
+        owned = db.query(Skill.id).filter(Skill.id == skill_id, Skill.user_id == current_user.id).scalar()
+        if owned is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Skill not found"
+            )
 
-    if not skill:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Skill not found"
-        )
+    # PRO-only fields
+    if pro_fields:
+        plan = get_user_plan(current_user, db)
+        if skill_data.target_freshness is not None:
+            _require_feature(plan, "freshness_targets")
+        if skill_data.notes:
+            _require_feature(plan, "skill_notes")
 
     # Update fields if provided
+    values = {}
     if skill_data.name is not None:
-        # Check for duplicate name
-        existing_skill = db.query(Skill).filter(
-            Skill.user_id == current_user.id,
-            Skill.name == skill_data.name,
-            Skill.id != skill_id
-        ).first()
-
-        if existing_skill:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Skill with this name already exists"
-            )
-
-        skill.name = skill_data.name
+        values["name"] = skill_data.name
 
     # Handle category update
     if skill_data.category_id is not None:
         if skill_data.category_id == "":
             # Clear category
-            skill.category_id = None
+            values["category_id"] = None
         else:
             # Verify category belongs to user
-            category = db.query(Category).filter(
+            category_id = db.query(Category.id).filter(
                 Category.id == skill_data.category_id,
                 Category.user_id == current_user.id
-            ).first()
-            if category:
-                skill.category_id = category.id
+            ).scalar()
+            if category_id:
+                values["category_id"] = category_id
     elif skill_data.category_name is not None:
         if skill_data.category_name == "":
             # Clear category
-            skill.category_id = None
+            values["category_id"] = None
         else:
-            # Check if category with this name exists
-            category = db.query(Category).filter(
-                Category.user_id == current_user.id,
-                Category.name == skill_data.category_name
-            ).first()
-            if category:
-                skill.category_id = category.id
-            else:
-                # Create new category
-                new_category = Category(
-                    user_id=current_user.id,
-                    name=skill_data.category_name
-                )
-                db.add(new_category)
-                db.flush()
-                skill.category_id = new_category.id
+            values["category_id"] = ensure_category(db, current_user.id, skill_data.category_name).id
 
     if skill_data.decay_rate is not None:
-        skill.decay_rate = skill_data.decay_rate
+        values["decay_rate"] = skill_data.decay_rate
 
     if skill_data.target_freshness is not None:
-        _require_feature(current_user, db, "freshness_targets")
-        skill.target_freshness = skill_data.target_freshness
+        values["target_freshness"] = skill_data.target_freshness
 
     if skill_data.notes is not None:
-        if skill_data.notes:
-            _require_feature(current_user, db, "skill_notes")
-        skill.notes = skill_data.notes
+        values["notes"] = skill_data.notes
+
+    # A clashing name fails on uq_user_skill_name rather than a prior SELECT
+    try:
+        skill = update_owned(db, Skill, skill_id, current_user.id, values, duplicate=SKILL_EXISTS)
+    except DuplicateNameError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if not skill:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Skill not found"
+        )
 
     db.commit()
-    db.refresh(skill)
 
     return enrich_skill_with_metrics(skill, db)
 
@@ -421,6 +384,5 @@ def update_skill_dependencies(
     # Update dependencies
     skill.dependencies = dependencies
     db.commit()
-    db.refresh(skill)
 
     return enrich_skill_with_metrics(skill, db)
@@ -4,6 +4,7 @@ from sqlalchemy import func
 from typing import List
 from uuid import UUID
 from app.core.database import get_db
+from app.core.writes import update_returning
 from app.models.user import User
 from app.models.event_template import EventTemplate
 from app.schemas.event_template import EventTemplateCreate, EventTemplateUpdate, EventTemplateResponse
@@ -60,7 +61,6 @@ def create_template(
 
     db.add(new_template)
     db.commit()
-    db.refresh(new_template)
 
     return new_template
 
@@ -98,10 +98,12 @@ def update_template(
     """
     Update an event template.
     """
-    template = db.query(EventTemplate).filter(
+    # Only the fields provided, written and read back in one UPDATE ... RETURNING
+    template = update_returning(
+        db, EventTemplate, template_data.model_dump(exclude_none=True),
         EventTemplate.id == template_id,
-        EventTemplate.user_id == current_user.id
-    ).first()
+        EventTemplate.user_id == current_user.id,
+    )
 
     if not template:
         raise HTTPException(
@@ -109,19 +111,7 @@ def update_template(
             detail="Template not found"
         )
 
-    if template_data.name is not None:
-        template.name = template_data.name
-    if template_data.event_type is not None:
-        template.event_type = template_data.event_type
-    if template_data.type is not None:
-        template.type = template_data.type
-    if template_data.default_duration_minutes is not None:
-        template.default_duration_minutes = template_data.default_duration_minutes
-    if template_data.default_notes is not None:
-        template.default_notes = template_data.default_notes
-
     db.commit()
-    db.refresh(template)
 
     return template
 
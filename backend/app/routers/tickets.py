@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy import func
 from typing import List
 from uuid import UUID
@@ -63,7 +64,8 @@ def create_ticket(
 
     db.add(new_ticket)
     db.commit()
-    db.refresh(new_ticket)
+    # A new ticket has no replies; spares the response a lazy load
+    set_committed_value(new_ticket, "replies", [])
 
     return new_ticket
 
@@ -127,6 +129,5 @@ def add_reply(
 
     db.add(new_reply)
     db.commit()
-    db.refresh(new_reply)
 
     return new_reply
@@ -42,3 +42,19 @@ class ActivityLogStats(BaseModel):
 class BulkDeleteRequest(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+
+
+class BulkDeleteJobResponse(BaseModel):
+    id: UUID
+    status: str
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]
+    total_estimate: Optional[int]
+    deleted_count: int
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
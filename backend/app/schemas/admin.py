@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
+from datetime import date as date_type  # for fields named `date`, which shadow the type
 from uuid import UUID
 
 
@@ -116,7 +117,7 @@ class AdminLearningEventCreate(AdminLearningEventBase):
 class AdminLearningEventUpdate(BaseModel):
     skill_id: Optional[UUID] = None
     user_id: Optional[UUID] = None
-    date: Optional[date] = None
+    date: Optional[date_type] = None
     type: Optional[str] = Field(None, max_length=50)
     notes: Optional[str] = None
     duration_minutes: Optional[int] = None
@@ -149,7 +150,7 @@ class AdminPracticeEventCreate(AdminPracticeEventBase):
 class AdminPracticeEventUpdate(BaseModel):
     skill_id: Optional[UUID] = None
     user_id: Optional[UUID] = None
-    date: Optional[date] = None
+    date: Optional[date_type] = None
     type: Optional[str] = Field(None, max_length=50)
     notes: Optional[str] = None
     duration_minutes: Optional[int] = None
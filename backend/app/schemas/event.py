@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, Dict, List, Literal, Optional
 from datetime import datetime, date
+from datetime import date as date_type  # for fields named `date`, which shadow the type
 from uuid import UUID
 from enum import Enum
 
@@ -35,7 +36,7 @@ class LearningEventCreate(LearningEventBase):
 
 
 class LearningEventUpdate(BaseModel):
-    date: Optional[date] = None
+    date: Optional[date_type] = None
     type: Optional[LearningEventType] = None
     notes: Optional[str] = Field(None, max_length=500)
     duration_minutes: Optional[int] = Field(None, gt=0)
@@ -63,7 +64,7 @@ class PracticeEventCreate(PracticeEventBase):
 
 
 class PracticeEventUpdate(BaseModel):
-    date: Optional[date] = None
+    date: Optional[date_type] = None
     type: Optional[PracticeEventType] = None
     notes: Optional[str] = Field(None, max_length=500)
     duration_minutes: Optional[int] = Field(None, gt=0)
@@ -77,3 +78,31 @@ class PracticeEventResponse(PracticeEventBase):
 
     class Config:
         from_attributes = True
+
+
+# Bulk logging (PRO). Items are validated one by one in the router so a single bad
+# row is reported in the per-item results instead of rejecting the whole batch.
+MAX_BULK_EVENTS = 500
+
+
+class BulkEventCreate(BaseModel):
+    events: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BULK_EVENTS)
+
+
+class BulkEventItem(BaseModel):
+    skill_id: UUID
+    event_type: Literal["learning", "practice"]
+
+
+class BulkEventResult(BaseModel):
+    index: int
+    status: Literal["created", "error"]
+    id: Optional[UUID] = None
+    event_type: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkEventResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkEventResult]
@@ -0,0 +1,98 @@
+"""Asynchronous purge of deleted accounts.
+
+`DELETE /api/settings/account` and the admin user delete only soft-delete the
+account: `soft_delete_user` stamps `users.deleted_at` and swaps the email for a
+tombstone, so existing tokens stop resolving and the address can be registered
+again at once. That is a single UPDATE however much data the account holds.
+
+`run_account_purge` is then scheduled to run after the response, in its own
+session. It removes the account's rows in batches of BATCH_SIZE, committing after
+each batch: it detaches the activity logs, then deletes the events and the skills.
+Last it deletes the user row, and the database cascades the small remainder
+(categories, templates, tickets, subscriptions). The relationships are
+passive_deletes, so no delete ever loads a collection into the worker.
+
+If a worker dies mid-purge the account stays soft-deleted;
+`purge_deleted_accounts` (run_account_purge.py, from cron) finishes it.
+"""
+import logging
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.activity_log import ActivityLog
+from app.models.event import Event
+from app.models.skill import Skill
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+
+def soft_delete_user(db: Session, user: User) -> None:
+    """Mark the account deleted. Caller commits and schedules `run_account_purge(user.id)`."""
+    user.deleted_at = datetime.utcnow()
+    user.email = f"deleted-{user.id}@deleted.invalid"
+
+
+def _delete_batch(db: Session, model, owner_column, user_id: UUID, batch_size: int) -> int:
+    ids = [row_id for (row_id,) in db.query(model.id).filter(owner_column == user_id).limit(batch_size)]
+    if not ids:
+        return 0
+    return db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+
+
+def _detach_logs_batch(db: Session, user_id: UUID, batch_size: int) -> int:
+    """Anonymise a batch of the user's activity logs (what ON DELETE SET NULL would do)."""
+    batch = (
+        db.query(ActivityLog.id, ActivityLog.created_at)
+        .filter(ActivityLog.user_id == user_id)
+        .order_by(ActivityLog.created_at)
+        .limit(batch_size)
+        .all()
+    )
+    if not batch:
+        return 0
+    # Bounding created_at lets Postgres touch only the partitions the batch spans.
+    return db.query(ActivityLog).filter(
+        ActivityLog.id.in_([row.id for row in batch]),
+        ActivityLog.created_at >= batch[0].created_at,
+        ActivityLog.created_at <= batch[-1].created_at,
+    ).update({ActivityLog.user_id: None}, synchronize_session=False)
+
+
+def purge_account(db: Session, user_id: UUID, batch_size: int = BATCH_SIZE) -> bool:
+    """Remove a soft-deleted account batch by batch, committing each. False if there is nothing to purge."""
+    pending = db.query(User.id).filter(User.id == user_id, User.deleted_at.is_not(None)).scalar()
+    if pending is None:
+        return False
+    while _detach_logs_batch(db, user_id, batch_size):
+        db.commit()
+    for model in (Event, Skill):
+        while _delete_batch(db, model, model.user_id, user_id, batch_size):
+            db.commit()
+    db.query(User).filter(User.id == user_id).delete(synchronize_session=False)
+    db.commit()
+    return True
+
+
+def run_account_purge(user_id: UUID) -> None:
+    """Purge one account in its own session (runs after the response is sent)."""
+    db = SessionLocal()
+    try:
+        purge_account(db, user_id)
+    except Exception:
+        # The account stays soft-deleted; the next purge_deleted_accounts sweep retries it.
+        logger.exception("Purge of deleted account %s failed", user_id)
+        db.rollback()
+    finally:
+        db.close()
+
+
+def purge_deleted_accounts(db: Session, batch_size: int = BATCH_SIZE) -> int:
+    """Finish every pending purge. Returns the number of accounts removed."""
+    pending = [user_id for (user_id,) in db.query(User.id).filter(User.deleted_at.is_not(None))]
+    return sum(purge_account(db, user_id, batch_size) for user_id in pending)
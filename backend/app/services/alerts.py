@@ -1,14 +1,18 @@
+import json
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Tuple
+from sqlalchemy import case, func
 from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.models.user import User
 from app.models.skill import Skill
-from app.models.event import LearningEvent, PracticeEvent
+from app.models.event import Event
 from app.services.freshness import calculate_freshness
+from app.services.site_settings import KEY_ALERTS_LAST_RUN, set_setting
 
 
 def send_email(to_email: str, subject: str, body: str, require_alerts_enabled: bool = True) -> bool:
@@ -73,7 +77,7 @@ def check_decay_alerts(db: Session) -> List[Tuple[User, Skill, float]]:
     """
     alerts = []
 
-    users = db.query(User).all()
+    users = db.query(User).filter(User.deleted_at.is_(None)).all()
 
     for user in users:
         # Check user settings for alert preferences
@@ -120,7 +124,7 @@ def check_practice_gap_alerts(db: Session) -> List[Tuple[User, Skill, int, int]]
     """
     alerts = []
 
-    users = db.query(User).all()
+    users = db.query(User).filter(User.deleted_at.is_(None)).all()
 
     for user in users:
         # Check user settings
@@ -160,10 +164,11 @@ def check_imbalance_alerts(db: Session) -> List[Tuple[User, int, int]]:
     """
     alerts = []
 
-    users = db.query(User).all()
+    users = db.query(User).filter(User.deleted_at.is_(None)).all()
     today = date.today()
     month_ago = today - timedelta(days=30)
     two_months_ago = today - timedelta(days=60)
+    span = case((Event.date >= month_ago, "last"), else_="prev").label("span")
 
     for user in users:
         # Check user settings
@@ -173,31 +178,19 @@ def check_imbalance_alerts(db: Session) -> List[Tuple[User, int, int]]:
         if not user_settings.get('imbalance_alerts_enabled', True):
             continue
 
-        # Get last month's events
-        last_month_learning = db.query(LearningEvent).filter(
-            LearningEvent.user_id == user.id,
-            LearningEvent.date >= month_ago,
-            LearningEvent.date < today
-        ).count()
-
-        last_month_practice = db.query(PracticeEvent).filter(
-            PracticeEvent.user_id == user.id,
-            PracticeEvent.date >= month_ago,
-            PracticeEvent.date < today
-        ).count()
-
-        # Get two months ago events
-        prev_month_learning = db.query(LearningEvent).filter(
-            LearningEvent.user_id == user.id,
-            LearningEvent.date >= two_months_ago,
-            LearningEvent.date < month_ago
-        ).count()
-
-        prev_month_practice = db.query(PracticeEvent).filter(
-            PracticeEvent.user_id == user.id,
-            PracticeEvent.date >= two_months_ago,
-            PracticeEvent.date < month_ago
-        ).count()
+        # Last month's and the month before's events per kind, in one range scan
+        counts = {
+            (row.span, row.kind): row.count
+            for row in db.query(span, Event.kind, func.count(Event.id).label("count")).filter(
+                Event.user_id == user.id,
+                Event.date >= two_months_ago,
+                Event.date < today
+            ).group_by(span, Event.kind)
+        }
+        last_month_learning = counts.get(("last", "learning"), 0)
+        last_month_practice = counts.get(("last", "practice"), 0)
+        prev_month_learning = counts.get(("prev", "learning"), 0)
+        prev_month_practice = counts.get(("prev", "practice"), 0)
 
         # Calculate ratios
         last_ratio = (last_month_practice / last_month_learning) if last_month_learning > 0 else 1.0
@@ -297,7 +290,10 @@ def process_all_alerts(db: Session):
     """
     Process all alert types and send emails.
     This function should be called by a scheduled job (cron, celery, etc.)
+    The run's summary is stored under KEY_ALERTS_LAST_RUN for /metrics.
     """
+    started = time.perf_counter()
+
     # Check and send decay alerts
     decay_alerts = check_decay_alerts(db)
     for user, skill, freshness in decay_alerts:
@@ -314,3 +310,14 @@ def process_all_alerts(db: Session):
         send_imbalance_alert(user, learning_count, practice_count, db)
 
     print(f"Processed alerts: {len(decay_alerts)} decay, {len(gap_alerts)} practice gap, {len(imbalance_alerts)} imbalance")
+
+    set_setting(db, KEY_ALERTS_LAST_RUN, json.dumps({
+        "finished_at": datetime.utcnow().isoformat(),
+        "duration_seconds": round(time.perf_counter() - started, 3),
+        "alerts": {
+            "decay": len(decay_alerts),
+            "practice_gap": len(gap_alerts),
+            "imbalance": len(imbalance_alerts),
+        },
+    }))
+    db.commit()
@@ -37,3 +37,10 @@ def fail_subscription(sub: Subscription) -> Subscription:
     if sub.status == "pending":
         sub.status = "failed"
     return sub
+
+
+def expire_subscription(sub: Subscription) -> Subscription:
+    """Give up on a checkout that never produced a result. A late success webhook still activates it."""
+    if sub.status == "pending":
+        sub.status = "expired"
+    return sub
@@ -0,0 +1,148 @@
+"""iCalendar (ICS) feed of a user's learning and practice events (PRO).
+
+Calendar apps poll a subscribed feed every few minutes, so the feed is built for
+conditional GET: `feed_version` is a cheap aggregate (event counts + latest
+`updated_at` per kind, plus a digest of skill names) that yields an ETag and a
+Last-Modified without touching event rows. Only when it changed does the caller
+stream the body, which `stream_feed` renders from server-side cursors. The ETag
+is the validator: deletes and skill renames change it but not Last-Modified.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.skill import Skill
+from app.models.user import User
+
+# Window used when the client doesn't pass `since`.
+FEED_DEFAULT_DAYS = 365
+YIELD_PER = 1000
+
+_KIND_LABELS = {"learning": "Learning", "practice": "Practice"}
+
+
+@dataclass
+class FeedVersion:
+    etag: str
+    last_modified: datetime
+    skill_names: Dict[UUID, str]
+
+
+def feed_version(db: Session, user: User, since: date) -> FeedVersion:
+    """Fingerprint the feed contents for `since` onward with aggregate queries only."""
+    skill_names = dict(db.query(Skill.id, Skill.name).filter(Skill.user_id == user.id).all())
+
+    parts = [since.isoformat()]
+    latest = user.created_at
+    rows = db.query(Event.kind, func.count(Event.id), func.max(Event.updated_at)).filter(
+        Event.user_id == user.id,
+        Event.date >= since,
+    ).group_by(Event.kind).order_by(Event.kind)
+    for kind, count, max_updated in rows:
+        parts.append(f"{kind}={count}:{max_updated.isoformat() if max_updated else ''}")
+        if max_updated and (latest is None or max_updated > latest):
+            latest = max_updated
+    parts.extend(f"{skill_id}={name}" for skill_id, name in sorted(skill_names.items(), key=lambda kv: str(kv[0])))
+
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+    return FeedVersion(
+        etag=f'"{digest}"',
+        last_modified=(latest or datetime.utcnow()).replace(microsecond=0),
+        skill_names=skill_names,
+    )
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT value (RFC 5545 §3.3.11)."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets (RFC 5545 §3.1), never splitting a UTF-8 character."""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    pieces = []
+    current = ""
+    size = 0
+    limit = 75
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            pieces.append(current)
+            current, size, limit = "", 0, 74  # continuation lines start with a space
+        current += char
+        size += width
+    pieces.append(current)
+    return "\r\n ".join(pieces) + "\r\n"
+
+
+def _event_lines(kind: str, skill_name: str, row, stamp: str) -> str:
+    event_id, event_date, event_type, notes, duration = row
+    summary = f"{kind}: {skill_name} ({event_type})"
+    description = []
+    if duration:
+        description.append(f"{duration} min")
+    if notes:
+        description.append(notes)
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event_id}@skillfade",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;VALUE=DATE:{event_date.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(event_date + timedelta(days=1)).strftime('%Y%m%d')}",
+        f"SUMMARY:{_escape(summary)}",
+        f"CATEGORIES:{kind.upper()}",
+    ]
+    if description:
+        lines.append(f"DESCRIPTION:{_escape(' — '.join(description))}")
+    lines.append("END:VEVENT")
+    return "".join(_fold(line) for line in lines)
+
+
+def stream_feed(db: Session, user: User, since: date, version: FeedVersion) -> Iterator[bytes]:
+    """Yield the ICS document in chunks. Closes `db` when done (see services/export.py)."""
+    stamp = version.last_modified.strftime("%Y%m%dT%H%M%SZ")
+    try:
+        yield (
+            "BEGIN:VCALENDAR\r\n"
+            "VERSION:2.0\r\n"
+            "PRODID:-//SkillFade//Activity Feed//EN\r\n"
+            "CALSCALE:GREGORIAN\r\n"
+            "METHOD:PUBLISH\r\n"
+            "X-WR-CALNAME:SkillFade activity\r\n"
+        ).encode("utf-8")
+        rows = (
+            db.query(Event.kind, Event.skill_id, Event.id, Event.date, Event.type, Event.notes,
+                     Event.duration_minutes)
+            .filter(Event.user_id == user.id, Event.date >= since)
+            .order_by(Event.date, Event.id)
+            .yield_per(YIELD_PER)
+        )
+        batch = []
+        for kind, skill_id, *row in rows:
+            batch.append(_event_lines(_KIND_LABELS[kind], version.skill_names.get(skill_id, ""), row, stamp))
+            if len(batch) >= YIELD_PER:
+                yield "".join(batch).encode("utf-8")
+                batch = []
+        if batch:
+            yield "".join(batch).encode("utf-8")
+        yield b"END:VCALENDAR\r\n"
+    finally:
+        db.close()
+
+
+def default_since(since: Optional[date]) -> date:
+    return since if since is not None else date.today() - timedelta(days=FEED_DEFAULT_DAYS)
@@ -0,0 +1,247 @@
+"""CSV import of historical learning/practice events (PRO).
+
+The upload is read row by row through `csv.DictReader` — never `read()` into memory —
+and processed in fixed-size chunks. Each chunk is validated, its skill/category names
+are resolved through a per-import cache (one IN query for the misses, one batched
+INSERT for the ones that don't exist yet), and its events are bulk-inserted with a Core
+executemany INSERT (multi-row VALUES batches on psycopg2). The whole import runs in
+the caller's transaction; nothing is committed here.
+
+Expected columns (header row required, case-insensitive, order free):
+
+    skill, event_type, date, type          required
+    category, duration_minutes, notes      optional
+
+`event_type` is 'learning' or 'practice'; `type` is one of that kind's event types.
+"""
+import csv
+import uuid
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.event import Event
+from app.models.skill import Skill
+from app.models.user import User
+from app.schemas.event import LearningEventCreate, PracticeEventCreate
+from app.services.time_rollups import add_events
+
+REQUIRED_COLUMNS = ("skill", "event_type", "date", "type")
+
+# Rows validated + inserted per round. Bounds memory and statement size.
+CHUNK_ROWS = 1000
+# Row errors beyond this are counted but not echoed back.
+MAX_REPORTED_ERRORS = 100
+
+SKILL_NAME_MAX = 100
+CATEGORY_NAME_MAX = 50
+
+_KINDS = {
+    "learning": LearningEventCreate,
+    "practice": PracticeEventCreate,
+}
+
+
+class CsvImportError(ValueError):
+    """The upload as a whole is unusable (bad header, not UTF-8)."""
+
+
+class _NameCache:
+    """Per-import name -> id cache for one of the user's name-keyed tables."""
+
+    def __init__(self):
+        self.ids: Dict[str, uuid.UUID] = {}
+        self.created: Dict[str, uuid.UUID] = {}
+
+    def missing(self, names: Iterable[str]) -> set:
+        return {n for n in names if n not in self.ids}
+
+
+def _row_error(exc: ValidationError) -> str:
+    err = exc.errors()[0]
+    loc = ".".join(str(part) for part in err["loc"])
+    return f"{loc}: {err['msg']}" if loc else err["msg"]
+
+
+def _clean(row: dict, key: str) -> Optional[str]:
+    value = row.get(key)
+    if value is None:
+        return None
+    value = value.strip()
+    return value or None
+
+
+def _parse_row(row: dict) -> dict:
+    """Validate one CSV row. Raises ValueError with a user-facing message."""
+    skill = _clean(row, "skill")
+    if not skill:
+        raise ValueError("skill: required")
+    if len(skill) > SKILL_NAME_MAX:
+        raise ValueError(f"skill: at most {SKILL_NAME_MAX} characters")
+    category = _clean(row, "category")
+    if category and len(category) > CATEGORY_NAME_MAX:
+        raise ValueError(f"category: at most {CATEGORY_NAME_MAX} characters")
+
+    kind = (_clean(row, "event_type") or "").lower()
+    if kind not in _KINDS:
+        raise ValueError("event_type: must be 'learning' or 'practice'")
+    try:
+        fields = _KINDS[kind].model_validate({
+            "date": _clean(row, "date"),
+            "type": (_clean(row, "type") or "").lower(),
+            "notes": _clean(row, "notes"),
+            "duration_minutes": _clean(row, "duration_minutes"),
+        })
+    except ValidationError as exc:
+        raise ValueError(_row_error(exc)) from None
+
+    return {"skill": skill, "category": category, "kind": kind, "fields": fields}
+
+
+def _resolve_categories(db: Session, user: User, cache: _NameCache, names: set) -> None:
+    missing = cache.missing(names)
+    if not missing:
+        return
+    for cat_id, name in db.query(Category.id, Category.name).filter(
+        Category.user_id == user.id,
+        Category.name.in_(missing),
+    ):
+        cache.ids[name] = cat_id
+    now = datetime.utcnow()
+    new_rows = []
+    for name in cache.missing(missing):
+        cat_id = uuid.uuid4()
+        cache.ids[name] = cache.created[name] = cat_id
+        new_rows.append({"id": cat_id, "user_id": user.id, "name": name, "created_at": now})
+    if new_rows:
+        db.execute(insert(Category.__table__), new_rows)
+
+
+def _resolve_skills(
+    db: Session, user: User, skills: _NameCache, categories: _NameCache, wanted: Dict[str, Optional[str]]
+) -> None:
+    """Map skill names to ids, creating unknown skills under the row's category.
+
+    Existing skills keep their category — the import never re-files them.
+    """
+    missing = skills.missing(wanted)
+    if not missing:
+        return
+    for skill_id, name in db.query(Skill.id, Skill.name).filter(
+        Skill.user_id == user.id,
+        Skill.name.in_(missing),
+    ):
+        skills.ids[name] = skill_id
+    to_create = skills.missing(missing)
+    if not to_create:
+        return
+    _resolve_categories(db, user, categories, {wanted[n] for n in to_create if wanted[n]})
+    now = datetime.utcnow()
+    new_rows = []
+    for name in to_create:
+        skill_id = uuid.uuid4()
+        skills.ids[name] = skills.created[name] = skill_id
+        category = wanted[name]
+        new_rows.append({
+            "id": skill_id,
+            "user_id": user.id,
+            "name": name,
+            "category_id": categories.ids[category] if category else None,
+            "decay_rate": 0.02,
+            "created_at": now,
+        })
+    db.execute(insert(Skill.__table__), new_rows)
+
+
+def import_events_csv(db: Session, user: User, stream: TextIO) -> dict:
+    """Import events from a text stream of CSV. Caller commits (or rolls back)."""
+    reader = csv.DictReader(stream)
+    try:
+        header = reader.fieldnames
+    except UnicodeDecodeError:
+        raise CsvImportError("File must be UTF-8 encoded CSV") from None
+    if not header:
+        raise CsvImportError("CSV file is empty")
+    reader.fieldnames = [(h or "").strip().lower() for h in header]
+    missing = [c for c in REQUIRED_COLUMNS if c not in reader.fieldnames]
+    if missing:
+        raise CsvImportError(f"Missing required column(s): {', '.join(missing)}")
+
+    skills = _NameCache()
+    categories = _NameCache()
+    # Earliest imported date per newly created skill, so its history covers the import.
+    first_dates: Dict[str, date] = {}
+    imported = 0
+    failed = 0
+    errors: List[dict] = []
+
+    while True:
+        try:
+            # Keep each row's physical line number for error reports (quoted fields
+            # may span lines, so it can't be derived from the row count).
+            chunk = [(reader.line_num, row) for row in islice(reader, CHUNK_ROWS)]
+        except UnicodeDecodeError:
+            raise CsvImportError("File must be UTF-8 encoded CSV") from None
+        except csv.Error as exc:
+            raise CsvImportError(f"Malformed CSV near line {reader.line_num}: {exc}") from None
+        if not chunk:
+            break
+
+        valid = []
+        for line, row in chunk:
+            try:
+                valid.append(_parse_row(row))
+            except ValueError as exc:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"row": line, "error": str(exc)})
+
+        wanted: Dict[str, Optional[str]] = {}
+        for item in valid:
+            wanted.setdefault(item["skill"], item["category"])
+        _resolve_skills(db, user, skills, categories, wanted)
+
+        now = datetime.utcnow()
+        rows = []
+        for item in valid:
+            fields = item["fields"]
+            name = item["skill"]
+            rows.append({
+                "id": uuid.uuid4(),
+                "kind": item["kind"],
+                "skill_id": skills.ids[name],
+                "user_id": user.id,
+                "date": fields.date,
+                "type": fields.type.value,
+                "notes": fields.notes,
+                "duration_minutes": fields.duration_minutes,
+                "created_at": now,
+            })
+            if name in skills.created and (name not in first_dates or fields.date < first_dates[name]):
+                first_dates[name] = fields.date
+        if rows:
+            db.execute(insert(Event.__table__), rows)
+            add_events(db, rows)
+        imported += len(valid)
+
+    backdated = [
+        {"id": skills.created[name], "created_at": datetime.combine(d, datetime.min.time())}
+        for name, d in first_dates.items()
+        if d < date.today()
+    ]
+    if backdated:
+        db.execute(update(Skill), backdated)
+
+    return {
+        "imported": imported,
+        "failed": failed,
+        "skills_created": len(skills.created),
+        "categories_created": len(categories.created),
+        "errors": errors,
+        "errors_truncated": failed > len(errors),
+    }
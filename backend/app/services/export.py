@@ -0,0 +1,147 @@
+"""Streaming account export.
+
+Walks the user's skills and events from server-side cursors (``yield_per``) and
+emits the export incrementally, so memory stays flat no matter how many years of
+history an account holds. Two formats:
+
+  - json   -> the same document shape the old in-memory export returned
+  - ndjson -> one self-describing record per line (user, skill, learning_event,
+              practice_event), easier to pipe into other tools
+
+`gzip_chunks` wraps either stream with a gzip content-encoding.
+"""
+import json
+import zlib
+from typing import Iterable, Iterator, Literal, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.models.category import Category
+from app.models.event import EVENT_KINDS, Event
+from app.models.skill import Skill
+from app.models.user import User
+
+ExportFormat = Literal["json", "ndjson"]
+
+# Rows fetched per server-side cursor round trip.
+YIELD_PER = 1000
+# Output is buffered up to roughly this many characters before being flushed.
+CHUNK_SIZE = 64 * 1024
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _user_record(user: User) -> dict:
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "created_at": user.created_at.isoformat(),
+        "settings": user.settings,
+    }
+
+
+def _iter_skills(db: Session, user_id) -> Iterator[Tuple[UUID, dict]]:
+    rows = (
+        db.query(Skill.id, Skill.name, Skill.created_at, Skill.archived_at, Category.name)
+        .outerjoin(Category, Skill.category_id == Category.id)
+        .filter(Skill.user_id == user_id)
+        .order_by(Skill.created_at, Skill.id)
+        .yield_per(YIELD_PER)
+    )
+    for skill_id, name, created_at, archived_at, category in rows:
+        yield skill_id, {
+            "id": str(skill_id),
+            "name": name,
+            "category": category,
+            "created_at": created_at.isoformat(),
+            "archived_at": archived_at.isoformat() if archived_at else None,
+        }
+
+
+def _iter_events(db: Session, skill_id: UUID) -> Iterator[Tuple[str, dict]]:
+    """(kind, event) for both kinds of the skill's events: learning first, each by date."""
+    rows = (
+        db.query(
+            Event.kind, Event.id, Event.date, Event.type, Event.notes,
+            Event.duration_minutes, Event.created_at,
+        )
+        .filter(Event.skill_id == skill_id)
+        .order_by(Event.kind, Event.date, Event.id)
+        .yield_per(YIELD_PER)
+    )
+    for kind, event_id, event_date, event_type, notes, duration, created_at in rows:
+        yield kind, {
+            "id": str(event_id),
+            "date": event_date.isoformat(),
+            "type": event_type,
+            "notes": notes,
+            "duration_minutes": duration,
+            "created_at": created_at.isoformat(),
+        }
+
+
+def _iter_json(db: Session, user: User) -> Iterator[str]:
+    yield '{"user":' + _dumps(_user_record(user)) + ',"skills":['
+    for i, (skill_id, skill) in enumerate(_iter_skills(db, user.id)):
+        # Re-open the skill object (drop its closing brace) to stream the event arrays into it.
+        yield ("," if i else "") + _dumps(skill)[:-1]
+        events = _iter_events(db, skill_id)
+        pending = next(events, None)
+        for kind in EVENT_KINDS:
+            yield f',"{kind}_events":['
+            j = 0
+            while pending is not None and pending[0] == kind:
+                yield ("," if j else "") + _dumps(pending[1])
+                j += 1
+                pending = next(events, None)
+            yield "]"
+        yield "}"
+    yield "]}"
+
+
+def _iter_ndjson(db: Session, user: User) -> Iterator[str]:
+    yield _dumps({"record": "user", **_user_record(user)}) + "\n"
+    for skill_id, skill in _iter_skills(db, user.id):
+        yield _dumps({"record": "skill", **skill}) + "\n"
+        for kind, event in _iter_events(db, skill_id):
+            yield _dumps({"record": f"{kind}_event", "skill_id": skill["id"], **event}) + "\n"
+
+
+def _buffered(parts: Iterable[str]) -> Iterator[bytes]:
+    """Coalesce many small string fragments into ~CHUNK_SIZE byte chunks."""
+    buf = []
+    size = 0
+    for part in parts:
+        buf.append(part)
+        size += len(part)
+        if size >= CHUNK_SIZE:
+            yield "".join(buf).encode("utf-8")
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+def stream_export(db: Session, user: User, fmt: ExportFormat = "json") -> Iterator[bytes]:
+    """Yield the user's export as UTF-8 byte chunks.
+
+    The caller's session is closed when the generator finishes — the request's own
+    `get_db` cleanup has already run by the time a streaming body is consumed.
+    """
+    parts = _iter_ndjson(db, user) if fmt == "ndjson" else _iter_json(db, user)
+    try:
+        yield from _buffered(parts)
+    finally:
+        db.close()
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip-encode a byte stream incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31 -> gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
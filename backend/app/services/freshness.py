@@ -1,5 +1,5 @@
 from datetime import date, timedelta
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 
 
 def calculate_freshness(
@@ -23,9 +23,6 @@ def calculate_freshness(
     if today is None:
         today = date.today()
 
-    # Start at 100%
-    freshness = 100.0
-
     # Get last practice date (or creation date if never practiced)
     if practice_events:
         last_practice = max(pe[0] for pe in practice_events)
@@ -35,21 +32,61 @@ def calculate_freshness(
     # Calculate days since last practice
     days_since_practice = (today - last_practice).days
 
-    # Apply base decay
+    # Recent learning events (last 30 days)
+    recent_learning = sum(1 for le in learning_events if (today - le[0]).days <= 30)
+
+    return _freshness_value(days_since_practice, recent_learning, base_decay_rate)
+
+
+def _freshness_value(days_since_practice: int, recent_learning: int, base_decay_rate: float) -> float:
+    """The freshness formula itself, shared by the single-day and the per-day callers."""
+    # Start at 100%, apply base decay
+    freshness = 100.0
     freshness *= (1 - base_decay_rate) ** days_since_practice
 
-    # Boost from recent learning events (last 30 days)
-    recent_learning = [
-        le for le in learning_events
-        if (today - le[0]).days <= 30
-    ]
-    learning_boost = min(len(recent_learning) * 2, 15)  # Max 15% boost
+    # Boost from recent learning events
+    learning_boost = min(recent_learning * 2, 15)  # Max 15% boost
     freshness = min(100, freshness + learning_boost)
 
     # Ensure bounds
     return max(0.0, min(100.0, freshness))
 
 
+def _daily_freshness(
+    skill_created_at: date,
+    learning_dates: List[date],
+    practice_dates: List[date],
+    base_decay_rate: float,
+    start: date,
+    end: date,
+) -> Iterator[Tuple[date, float]]:
+    """
+    Yield (day, freshness) for every day in start..end.
+
+    Same values as calling calculate_freshness with only the events up to each
+    day, but in one sweep: both date lists must be sorted, and two pointers
+    track the last practice so far and the learning events of the trailing
+    30 days. O(days + events) instead of O(days * events).
+    """
+    practice_idx = 0
+    last_practice = None
+    window_lo = window_hi = 0  # learning_dates[window_lo:window_hi] are within 30 days before `day`
+    day = start
+    while day <= end:
+        while practice_idx < len(practice_dates) and practice_dates[practice_idx] <= day:
+            last_practice = practice_dates[practice_idx]
+            practice_idx += 1
+        while window_hi < len(learning_dates) and learning_dates[window_hi] <= day:
+            window_hi += 1
+        window_start = day - timedelta(days=30)
+        while window_lo < window_hi and learning_dates[window_lo] < window_start:
+            window_lo += 1
+
+        anchor = last_practice if last_practice is not None else skill_created_at
+        yield day, _freshness_value((day - anchor).days, window_hi - window_lo, base_decay_rate)
+        day += timedelta(days=1)
+
+
 def calculate_freshness_history(
     skill_created_at: date,
     learning_events: List[Tuple[date, str]],
@@ -65,26 +102,17 @@ def calculate_freshness_history(
     today = date.today()
     start_date = max(skill_created_at, today - timedelta(days=days))
 
-    history = []
-    current_date = start_date
-
-    while current_date <= today:
-        # Filter events up to current_date
-        past_learning = [(d, t) for d, t in learning_events if d <= current_date]
-        past_practice = [(d, t) for d, t in practice_events if d <= current_date]
-
-        freshness = calculate_freshness(
-            skill_created_at=skill_created_at,
-            learning_events=past_learning,
-            practice_events=past_practice,
-            base_decay_rate=base_decay_rate,
-            today=current_date
+    return [
+        (day, round(freshness, 2))
+        for day, freshness in _daily_freshness(
+            skill_created_at,
+            sorted(d for d, _ in learning_events),
+            sorted(d for d, _ in practice_events),
+            base_decay_rate,
+            start_date,
+            today,
         )
-
-        history.append((current_date, round(freshness, 2)))
-        current_date += timedelta(days=1)
-
-    return history
+    ]
 
 
 def get_freshness_indicator(freshness: float) -> str:
@@ -169,7 +197,8 @@ def calculate_personal_records(
     skill_created_at: date,
     learning_events: List[Tuple[date, str]],
     practice_events: List[Tuple[date, str]],
-    base_decay_rate: float = 0.02
+    base_decay_rate: float = 0.02,
+    today: date = None
 ) -> dict:
     """
     Calculate personal records for a skill.
@@ -180,36 +209,30 @@ def calculate_personal_records(
     - Most active week (total events)
     - Longest practice gap recovered from
 
+    Event dates are sorted once; everything else is a single pass over the days
+    or the sorted dates, so this stays fast for skills with tens of thousands
+    of events.
+
     Returns: dict with record information
     """
-    today = date.today()
-    start_date = skill_created_at
-
-    # Calculate freshness history
-    history = []
-    current_date = start_date
-    while current_date <= today:
-        past_learning = [(d, t) for d, t in learning_events if d <= current_date]
-        past_practice = [(d, t) for d, t in practice_events if d <= current_date]
-
-        freshness = calculate_freshness(
-            skill_created_at=skill_created_at,
-            learning_events=past_learning,
-            practice_events=past_practice,
-            base_decay_rate=base_decay_rate,
-            today=current_date
-        )
-        history.append((current_date, freshness))
-        current_date += timedelta(days=1)
+    if today is None:
+        today = date.today()
 
-    # Calculate longest fresh streak (freshness > 70%)
+    learning_dates = sorted(d for d, _ in learning_events)
+    practice_dates = sorted(d for d, _ in practice_events)
+
+    # Longest fresh streak (freshness > 70%) and first day of peak freshness
     longest_fresh_streak = 0
     current_streak = 0
     streak_start = None
     longest_streak_start = None
     longest_streak_end = None
+    peak_freshness = None
+    peak_date = None
 
-    for i, (d, f) in enumerate(history):
+    for d, f in _daily_freshness(
+        skill_created_at, learning_dates, practice_dates, base_decay_rate, skill_created_at, today
+    ):
         if f > 70:
             if current_streak == 0:
                 streak_start = d
@@ -220,42 +243,37 @@ def calculate_personal_records(
                 longest_streak_end = d
         else:
             current_streak = 0
-
-    # Peak freshness
-    peak_freshness = max((f for d, f in history), default=0)
-    peak_date = None
-    for d, f in history:
-        if f == peak_freshness:
+        if peak_freshness is None or f > peak_freshness:
+            peak_freshness = f
             peak_date = d
-            break
 
-    # Most active week
-    all_events = sorted(
-        [(d, 'learning') for d, _ in learning_events] +
-        [(d, 'practice') for d, _ in practice_events]
-    )
+    if peak_freshness is None:
+        peak_freshness = 0
 
+    # Most active week: 7-day window starting on an event date, two pointers
+    # over the merged sorted dates. Later duplicates of a start date are skipped
+    # because they would count the same window.
+    all_dates = sorted(learning_dates + practice_dates)
     most_active_week_start = None
     most_active_week_events = 0
-
-    if all_events:
-        # Sliding window of 7 days
-        for start_idx in range(len(all_events)):
-            start_d = all_events[start_idx][0]
-            week_end = start_d + timedelta(days=7)
-            week_events = sum(1 for d, _ in all_events if start_d <= d < week_end)
-            if week_events > most_active_week_events:
-                most_active_week_events = week_events
-                most_active_week_start = start_d
+    window_end = 0
+    for start_idx, start_d in enumerate(all_dates):
+        if start_idx and all_dates[start_idx - 1] == start_d:
+            continue
+        week_end = start_d + timedelta(days=7)
+        while window_end < len(all_dates) and all_dates[window_end] < week_end:
+            window_end += 1
+        week_events = window_end - start_idx
+        if week_events > most_active_week_events:
+            most_active_week_events = week_events
+            most_active_week_start = start_d
 
     # Longest practice gap recovered from (gap followed by practice that brought freshness back up)
     longest_gap_recovered = 0
-    if len(practice_events) >= 2:
-        sorted_practice = sorted(practice_events, key=lambda x: x[0])
-        for i in range(1, len(sorted_practice)):
-            gap = (sorted_practice[i][0] - sorted_practice[i-1][0]).days
-            if gap > longest_gap_recovered:
-                longest_gap_recovered = gap
+    for previous, current in zip(practice_dates, practice_dates[1:]):
+        gap = (current - previous).days
+        if gap > longest_gap_recovered:
+            longest_gap_recovered = gap
 
     return {
         "longest_fresh_streak_days": longest_fresh_streak,
@@ -0,0 +1,111 @@
+"""Small dimension tables derived from activity log ingestion, with in-process caches.
+
+`activity_action_types` lists every action_type ever logged. `register_action_type`
+upserts into it from POST /api/logs, but only when this process hasn't seen the
+value yet, so steady-state ingestion costs no extra query. The admin filter
+dropdown reads the same cache, refreshed from the table every CACHE_TTL_SECONDS
+so values first seen by other workers show up too.
+
+`activity_pages` and `activity_user_agents` dictionary-encode the two long,
+heavily repeated strings of a log row: rows store small integer ids and
+`encode_page` / `encode_user_agent` intern values through a bounded per-process
+cache, so only the first occurrence of a value costs a lookup or insert.
+
+Writes made here are committed immediately, before anything is cached, so a
+cached id always refers to a committed row.
+"""
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.models.activity_log import ActivityActionType, ActivityPage, ActivityUserAgent
+
+CACHE_TTL_SECONDS = 60
+# Bounded so a flood of distinct user agents can't grow a worker without limit.
+INTERN_CACHE_SIZE = 10_000
+
+_action_types: Set[str] = set()
+_action_types_loaded_at: Optional[float] = None
+_page_ids: Dict[str, int] = {}
+_user_agent_ids: Dict[str, int] = {}
+
+
+def _insert_ignore(db: Session, model, values: dict, index_elements: Optional[List[str]] = None):
+    """INSERT ... ON CONFLICT DO NOTHING on `index_elements` (default: the primary key)."""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    keys = index_elements or [column.name for column in model.__table__.primary_key]
+    return db.execute(dialect.insert(model.__table__).values(**values).on_conflict_do_nothing(index_elements=keys))
+
+
+def _intern(db: Session, model, column_name: str, value: str, cache: Dict[str, int]) -> int:
+    cached = cache.get(value)
+    if cached is not None:
+        metrics.CACHE_REQUESTS.inc(cache=model.__tablename__, result="hit")
+        return cached
+    metrics.CACHE_REQUESTS.inc(cache=model.__tablename__, result="miss")
+    column = getattr(model, column_name)
+    row_id = db.query(model.id).filter(column == value).scalar()
+    if row_id is None:
+        _insert_ignore(db, model, {column_name: value}, index_elements=[column_name])
+        db.commit()
+        row_id = db.query(model.id).filter(column == value).scalar()
+    if len(cache) >= INTERN_CACHE_SIZE:
+        cache.clear()
+    cache[value] = row_id
+    return row_id
+
+
+def encode_page(db: Session, path: Optional[str]) -> Optional[int]:
+    """Id of `path` in activity_pages, inserting it on first sight. Call before staging other writes."""
+    if not path:
+        return None
+    return _intern(db, ActivityPage, "path", path[:255], _page_ids)
+
+
+def encode_user_agent(db: Session, user_agent: Optional[str]) -> Optional[int]:
+    """Id of `user_agent` in activity_user_agents, inserting it on first sight."""
+    if not user_agent:
+        return None
+    return _intern(db, ActivityUserAgent, "value", user_agent[:500], _user_agent_ids)
+
+
+def page_paths(db: Session, page_ids: Iterable[int]) -> Dict[int, str]:
+    ids = [page_id for page_id in page_ids if page_id is not None]
+    if not ids:
+        return {}
+    return dict(db.query(ActivityPage.id, ActivityPage.path).filter(ActivityPage.id.in_(ids)).all())
+
+
+def register_action_type(db: Session, name: str) -> None:
+    """Record `name` in the dimension table if this process hasn't yet.
+
+    Commits its own (rare) write, and only caches `name` once that succeeded.
+    """
+    if name in _action_types:
+        metrics.CACHE_REQUESTS.inc(cache="activity_action_types", result="hit")
+        return
+    metrics.CACHE_REQUESTS.inc(cache="activity_action_types", result="miss")
+    _insert_ignore(db, ActivityActionType, {"name": name})
+    db.commit()
+    _action_types.add(name)
+
+
+def list_action_types(db: Session) -> List[str]:
+    global _action_types_loaded_at
+    now = time.monotonic()
+    if _action_types_loaded_at is None or now - _action_types_loaded_at > CACHE_TTL_SECONDS:
+        _action_types.update(name for (name,) in db.query(ActivityActionType.name))
+        _action_types_loaded_at = now
+    return sorted(_action_types)
+
+
+def reset_caches() -> None:
+    """Forget everything cached (tests, or after restoring a database)."""
+    global _action_types_loaded_at
+    _action_types.clear()
+    _action_types_loaded_at = None
+    _page_ids.clear()
+    _user_agent_ids.clear()
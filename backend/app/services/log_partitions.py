@@ -0,0 +1,201 @@
+"""Monthly partitioning and retention for `activity_logs`.
+
+On Postgres `activity_logs` is range-partitioned on `created_at` (migration 013),
+one partition per calendar month named `activity_logs_yYYYYmMM`, plus a DEFAULT
+partition that only catches rows no monthly partition covers. `run_maintenance`
+(called from run_log_maintenance.py) creates the partitions for the coming months
+ahead of time and enforces retention by detaching and dropping whole months, which
+is a catalog operation rather than a multi-million-row DELETE. Expired rows that
+landed in DEFAULT are deleted row by row, and rows DEFAULT holds for a month being
+created are moved into the new partition.
+
+On databases without partitioning (SQLite in development and tests) retention
+falls back to deleting the expired rows.
+"""
+import re
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.activity_log import ActivityLog
+from app.services.log_rollups import purge_rollups_before
+
+PARENT_TABLE = "activity_logs"
+DEFAULT_PARTITION = "activity_logs_default"
+
+_NAME_RE = re.compile(r"^activity_logs_y(\d{4})m(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Inverse of `partition_name`; None for anything else (e.g. the default partition)."""
+    match = _NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def retention_cutoff(today: date, retention_months: int) -> date:
+    """First day that is still retained: the current month plus `retention_months` before it."""
+    return add_months(month_start(today), -retention_months)
+
+
+def expired_partitions(names: List[str], cutoff: date) -> List[str]:
+    """Monthly partitions whose whole range lies before `cutoff`."""
+    expired = []
+    for name in names:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+def is_partitioned(db: Session) -> bool:
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    relkind = db.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": PARENT_TABLE},
+    ).scalar()
+    return relkind == "p"
+
+
+def existing_partitions(db: Session) -> List[str]:
+    rows = db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(:table)"
+    ), {"table": PARENT_TABLE}).scalars().all()
+    return sorted(rows)
+
+
+def _month_bounds(month: date) -> Dict[str, datetime]:
+    return {
+        "start": datetime.combine(month, datetime.min.time()),
+        "end": datetime.combine(add_months(month, 1), datetime.min.time()),
+    }
+
+
+def _create_partition(db: Session, month: date, default_exists: bool) -> None:
+    """Create one monthly partition, first moving that month's rows out of DEFAULT.
+
+    Postgres refuses to create a partition while DEFAULT holds rows in its range, so
+    those rows (logged before the month was created ahead of time) are moved: DEFAULT
+    is detached, the month created, the rows re-inserted through the parent (which
+    routes them to the new month) and deleted from DEFAULT, then DEFAULT is attached
+    again. Everything runs in the caller's transaction.
+    """
+    name = partition_name(month)
+    bounds = _month_bounds(month)
+    strays = default_exists and db.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE created_at >= :start AND created_at < :end)"
+    ), bounds).scalar()
+    if strays:
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    db.execute(text(
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF {PARENT_TABLE} '
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+    if strays:
+        in_month = "WHERE created_at >= :start AND created_at < :end"
+        db.execute(text(f"INSERT INTO {PARENT_TABLE} SELECT * FROM {DEFAULT_PARTITION} {in_month}"), bounds)
+        db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} {in_month}"), bounds)
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+
+
+def ensure_partitions(db: Session, today: date, ahead: int, dry_run: bool = False) -> List[str]:
+    """Create monthly partitions from the current month through `ahead` months later."""
+    existing = set(existing_partitions(db))
+    created = []
+    current = month_start(today)
+    for offset in range(ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        if not dry_run:
+            _create_partition(db, month, DEFAULT_PARTITION in existing)
+        created.append(name)
+    return created
+
+
+def drop_expired_partitions(db: Session, cutoff: date, dry_run: bool = False) -> List[str]:
+    dropped = expired_partitions(existing_partitions(db), cutoff)
+    if not dry_run:
+        for name in dropped:
+            db.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"'))
+            db.execute(text(f'DROP TABLE "{name}"'))
+    return dropped
+
+
+def delete_expired_rows(db: Session, cutoff: date, dry_run: bool = False, table: Optional[str] = None) -> int:
+    """Row-level retention: for unpartitioned tables, or on `table` (the DEFAULT partition)."""
+    before = datetime.combine(cutoff, datetime.min.time())
+    if table is not None:
+        verb = "SELECT count(*)" if dry_run else "DELETE"
+        result = db.execute(text(f"{verb} FROM {table} WHERE created_at < :before"), {"before": before})
+        return result.scalar() if dry_run else result.rowcount
+    query = db.query(ActivityLog).filter(ActivityLog.created_at < before)
+    if dry_run:
+        return query.count()
+    return query.delete(synchronize_session=False)
+
+
+def run_maintenance(
+    db: Session,
+    today: Optional[date] = None,
+    retention_months: Optional[int] = None,
+    ahead: Optional[int] = None,
+    dry_run: bool = False,
+) -> Dict:
+    """Create upcoming partitions and apply the retention policy. Commits unless `dry_run`."""
+    today = today or datetime.utcnow().date()
+    if retention_months is None:
+        retention_months = settings.ACTIVITY_LOG_RETENTION_MONTHS
+    if ahead is None:
+        ahead = settings.ACTIVITY_LOG_PARTITIONS_AHEAD
+
+    partitioned = is_partitioned(db)
+    cutoff = retention_cutoff(today, retention_months) if retention_months > 0 else None
+    report = {
+        "partitioned": partitioned,
+        "cutoff": cutoff.isoformat() if cutoff else None,
+        "created_partitions": [],
+        "dropped_partitions": [],
+        "deleted_rows": 0,
+    }
+
+    # Retention commits on its own first, so a failure creating partitions can't hold it back.
+    if partitioned and cutoff:
+        report["dropped_partitions"] = drop_expired_partitions(db, cutoff, dry_run)
+        if DEFAULT_PARTITION in existing_partitions(db):
+            report["deleted_rows"] = delete_expired_rows(db, cutoff, dry_run, table=DEFAULT_PARTITION)
+    elif cutoff:
+        report["deleted_rows"] = delete_expired_rows(db, cutoff, dry_run)
+    if cutoff and not dry_run:
+        purge_rollups_before(db, cutoff)
+        db.commit()
+
+    if partitioned:
+        report["created_partitions"] = ensure_partitions(db, today, ahead, dry_run)
+
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return report
@@ -0,0 +1,151 @@
+"""Background bulk deletion of activity logs.
+
+`POST /api/admin/logs/bulk-delete` only records an `ActivityLogDeleteJob` and
+schedules `run_delete_job`, which deletes the range in batches of BATCH_SIZE rows,
+oldest first, committing after each batch. Short transactions keep row locks and
+WAL bursts small, and `deleted_count` on the job doubles as progress for the admin
+UI to poll; `total_estimate` comes from the hourly rollups rather than a count of
+the range. Expiring whole months is better left to the retention policy in
+services/log_partitions.py, which drops partitions instead of rows.
+
+Each committed batch also stamps `heartbeat_at`. A job whose process died (a
+restart or deploy mid-job) stops heartbeating; `resume_stalled_jobs`, run from
+run_log_maintenance.py, picks up such jobs and pending ones that never started
+after STALLED_AFTER. Batches are idempotent, so resuming just continues.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.writes import update_returning
+from app.models.activity_log import ActivityLog
+from app.models.activity_log_delete_job import ActivityLogDeleteJob
+from app.services.log_rollups import estimate_count, invalidate_rollups
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+STALLED_AFTER = timedelta(minutes=15)
+
+
+def create_delete_job(
+    db: Session,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    actor_id: Optional[UUID] = None,
+) -> ActivityLogDeleteJob:
+    """Record a pending job. Caller commits and schedules `run_delete_job`."""
+    job = ActivityLogDeleteJob(start_date=start_date, end_date=end_date, requested_by_user_id=actor_id)
+    db.add(job)
+    return job
+
+
+def _in_range(job: ActivityLogDeleteJob):
+    conditions = []
+    if job.start_date:
+        conditions.append(ActivityLog.created_at >= job.start_date)
+    if job.end_date:
+        conditions.append(ActivityLog.created_at <= job.end_date)
+    return conditions
+
+
+def _delete_batch(db: Session, job: ActivityLogDeleteJob, batch_size: int) -> int:
+    batch = (
+        db.query(ActivityLog.id, ActivityLog.created_at)
+        .filter(*_in_range(job))
+        .order_by(ActivityLog.created_at)
+        .limit(batch_size)
+        .all()
+    )
+    if not batch:
+        return 0
+    # Bounding created_at as well lets Postgres touch only the partitions the batch spans.
+    return db.query(ActivityLog).filter(
+        ActivityLog.id.in_([row.id for row in batch]),
+        ActivityLog.created_at >= batch[0].created_at,
+        ActivityLog.created_at <= batch[-1].created_at,
+    ).delete(synchronize_session=False)
+
+
+def _stalled(cutoff: datetime):
+    return or_(
+        and_(ActivityLogDeleteJob.status == "pending", ActivityLogDeleteJob.created_at < cutoff),
+        and_(
+            ActivityLogDeleteJob.status == "running",
+            func.coalesce(ActivityLogDeleteJob.heartbeat_at, ActivityLogDeleteJob.created_at) < cutoff,
+        ),
+    )
+
+
+def run_delete_job(job_id: UUID, batch_size: int = BATCH_SIZE, stalled_before: Optional[datetime] = None) -> bool:
+    """Execute a pending job in its own session (runs after the response is sent).
+
+    With `stalled_before`, also take over a job that stalled before then (see
+    `resume_stalled_jobs`). The claim is a single conditional UPDATE, so a job
+    runs in one place at a time. Returns whether this call ran the job.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        claimable = ActivityLogDeleteJob.status == "pending"
+        if stalled_before is not None:
+            claimable = or_(claimable, _stalled(stalled_before))
+        job = update_returning(
+            db,
+            ActivityLogDeleteJob,
+            {"status": "running", "heartbeat_at": now, "started_at": func.coalesce(ActivityLogDeleteJob.started_at, now)},
+            ActivityLogDeleteJob.id == job_id,
+            claimable,
+        )
+        if job is None:
+            db.rollback()
+            return False
+        if job.total_estimate is None:
+            job.total_estimate = estimate_count(db, job.start_date, job.end_date)
+        db.commit()
+
+        while True:
+            deleted = _delete_batch(db, job, batch_size)
+            if not deleted:
+                break
+            job.deleted_count += deleted
+            job.heartbeat_at = datetime.utcnow()
+            db.commit()
+
+        invalidate_rollups(db, job.start_date, job.end_date)
+        job.status = "completed"
+        job.finished_at = datetime.utcnow()
+        db.commit()
+    except Exception as exc:
+        logger.exception("Activity log delete job %s failed", job_id)
+        db.rollback()
+        job = db.get(ActivityLogDeleteJob, job_id)
+        if job is not None:
+            job.status = "failed"
+            job.error = str(exc)[:1000]
+            job.finished_at = datetime.utcnow()
+            db.commit()
+    finally:
+        db.close()
+    return True
+
+
+def resume_stalled_jobs(
+    db: Session,
+    stalled_after: timedelta = STALLED_AFTER,
+    batch_size: int = BATCH_SIZE,
+    now: Optional[datetime] = None,
+) -> int:
+    """Re-run every job left pending or running with no progress for `stalled_after`.
+
+    Returns the number of jobs this call ran (to completion or failure).
+    """
+    cutoff = (now or datetime.utcnow()) - stalled_after
+    stalled = [job_id for (job_id,) in db.query(ActivityLogDeleteJob.id).filter(_stalled(cutoff))]
+    db.rollback()
+    return sum(run_delete_job(job_id, batch_size, stalled_before=cutoff) for job_id in stalled)
@@ -0,0 +1,152 @@
+"""Background reconciliation of pending payments with the gateway hub.
+
+The hub's signed webhook is what normally flips a pending Subscription to active
+or failed. This reconciler is the backup for a webhook that is late or lost, so
+that GET /api/billing/status can answer from the database alone.
+
+Every PAYMENT_RECONCILE_INTERVAL_SECONDS a background thread runs
+`reconcile_pending`:
+
+1. It claims up to BATCH_SIZE pending orders that are due (`next_reconcile_at`
+   has passed). Each claimed order has its next check pushed out with exponential
+   backoff (BASE_DELAY doubling up to MAX_DELAY), and the claim is committed at
+   once. Other workers running the same loop skip claimed rows (FOR UPDATE SKIP
+   LOCKED, then the pushed-out due time), so each order costs one hub call per
+   backoff step however many workers or polling browsers there are.
+2. It asks the hub for each order's status, at most PAYMENT_RECONCILE_CONCURRENCY
+   calls at a time, outside any transaction. The gateway client's retries and
+   circuit breaker apply (core/gateway.py).
+3. It applies terminal results to rows that are still pending, re-read under a
+   row lock, so a webhook that landed meanwhile is never overwritten.
+
+A checkout older than EXPIRE_AFTER with no success or failure from the hub
+(still pending there, or the hub unreachable) is marked `expired`. Abandoned
+checkouts therefore leave the pending set instead of being polled every
+MAX_DELAY forever. The webhook still activates an expired order if it pays late.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core import gateway
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.subscription import Subscription
+from app.services import billing as billing_service
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+BASE_DELAY = timedelta(seconds=15)
+MAX_DELAY = timedelta(hours=1)
+EXPIRE_AFTER = timedelta(hours=48)
+
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def next_check_at(attempts: int, now: Optional[datetime] = None) -> datetime:
+    """When an order checked `attempts` times so far is next due."""
+    delay = min(BASE_DELAY * 2 ** min(attempts, 16), MAX_DELAY)
+    return (now or datetime.utcnow()) + delay
+
+
+def _hub_status(order_id: str) -> Optional[dict]:
+    try:
+        return gateway.get_status(order_id)
+    except gateway.GatewayError as exc:
+        logger.warning("Reconcile for %s: hub error: %s", order_id, exc)
+    except Exception:
+        logger.warning("Reconcile for %s failed to reach hub", order_id)
+    return None
+
+
+def reconcile_pending(db: Session, batch_size: int = BATCH_SIZE, now: Optional[datetime] = None) -> dict:
+    """Check one batch of due pending orders with the hub. Returns counts per outcome."""
+    now = now or datetime.utcnow()
+    claimed = (
+        db.query(Subscription)
+        .filter(
+            Subscription.status == "pending",
+            Subscription.order_id.is_not(None),
+            or_(Subscription.next_reconcile_at.is_(None), Subscription.next_reconcile_at <= now),
+        )
+        .order_by(Subscription.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    counts = {"checked": len(claimed), "activated": 0, "failed": 0, "expired": 0, "unreachable": 0}
+    if not claimed:
+        db.rollback()
+        return counts
+    for sub in claimed:
+        sub.next_reconcile_at = next_check_at(sub.reconcile_attempts, now)
+        sub.reconcile_attempts += 1
+    orders = {sub.id: sub.order_id for sub in claimed}
+    abandoned = {sub.id for sub in claimed if sub.created_at <= now - EXPIRE_AFTER}
+    db.commit()
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.PAYMENT_RECONCILE_CONCURRENCY)) as pool:
+        results = dict(zip(orders, pool.map(_hub_status, orders.values())))
+    counts["unreachable"] = sum(hub is None for hub in results.values())
+
+    settled = {sub_id: hub for sub_id, hub in results.items()
+               if hub and hub.get("status") in ("success", "failed", "error")}
+    expiring = abandoned - settled.keys()
+    if not settled and not expiring:
+        return counts
+    still_pending = (
+        db.query(Subscription)
+        .filter(Subscription.id.in_(settled.keys() | expiring), Subscription.status == "pending")
+        .with_for_update()
+        .populate_existing()
+    )
+    for sub in still_pending:
+        hub = settled.get(sub.id)
+        if hub is None:
+            billing_service.expire_subscription(sub)
+            counts["expired"] += 1
+        elif hub["status"] == "success":
+            billing_service.activate_subscription(sub, hub)
+            counts["activated"] += 1
+        else:
+            billing_service.fail_subscription(sub)
+            counts["failed"] += 1
+    db.commit()
+    return counts
+
+
+def _run(interval: float) -> None:
+    while not _stop.wait(interval):
+        db = SessionLocal()
+        try:
+            reconcile_pending(db)
+        except Exception:
+            logger.exception("Payment reconcile run failed")
+            db.rollback()
+        finally:
+            db.close()
+
+
+def start_reconciler() -> None:
+    """Start the reconcile loop (app startup). PAYMENT_RECONCILE_INTERVAL_SECONDS=0 disables it."""
+    global _thread
+    interval = settings.PAYMENT_RECONCILE_INTERVAL_SECONDS
+    if interval <= 0 or (_thread is not None and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, args=(interval,), name="payment-reconcile", daemon=True)
+    _thread.start()
+
+
+def stop_reconciler() -> None:
+    """Stop the reconcile loop (app shutdown), letting a run in progress finish."""
+    _stop.set()
+    if _thread is not None:
+        _thread.join(timeout=30)
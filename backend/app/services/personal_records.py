@@ -0,0 +1,71 @@
+"""Memoized personal records for `/api/analytics/skills/{id}/personal-records`.
+
+Records only change when the skill's events change (or a day passes), so results
+are cached per process keyed by (skill, data version, date). The data version is
+the count and latest `updated_at` of the skill's learning and practice events,
+plus the skill's own creation date and decay rate: adding, editing or deleting an
+event changes it. Checking it costs one indexed aggregate query instead of
+loading every event.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core import metrics
+from app.models.event import Event
+from app.models.skill import Skill
+from app.services.freshness import calculate_personal_records
+
+CACHE_SIZE = 1024
+
+_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _data_version(db: Session, skill: Skill) -> tuple:
+    rows = (
+        db.query(Event.kind, func.count(Event.id), func.max(Event.updated_at))
+        .filter(Event.skill_id == skill.id)
+        .group_by(Event.kind)
+        .order_by(Event.kind)
+        .all()
+    )
+    return (skill.created_at, skill.decay_rate, *(tuple(row) for row in rows))
+
+
+def get_personal_records(db: Session, skill: Skill, today: Optional[date] = None) -> dict:
+    """Personal records for `skill` as of `today`, computed at most once per data version."""
+    if today is None:
+        today = date.today()
+    key = (skill.id, _data_version(db, skill), today)
+    with _lock:
+        records = _cache.get(key)
+        if records is not None:
+            _cache.move_to_end(key)
+    if records is not None:
+        metrics.CACHE_REQUESTS.inc(cache="personal_records", result="hit")
+        return records
+    metrics.CACHE_REQUESTS.inc(cache="personal_records", result="miss")
+
+    records = calculate_personal_records(
+        skill_created_at=skill.created_at.date(),
+        learning_events=[(e.date, e.type) for e in skill.learning_events],
+        practice_events=[(e.date, e.type) for e in skill.practice_events],
+        base_decay_rate=skill.decay_rate or 0.02,
+        today=today,
+    )
+    with _lock:
+        _cache[key] = records
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return records
+
+
+def reset_cache() -> None:
+    """Forget every cached result (tests)."""
+    with _lock:
+        _cache.clear()
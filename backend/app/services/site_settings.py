@@ -15,6 +15,10 @@ from app.models.app_setting import AppSetting
 # Recognized keys (kept narrow on purpose — add to this list when new ones land)
 KEY_LIFETIME_PRICE_AZN = "lifetime_price_azn"
 KEY_EARLY_BIRD_PRICE_AZN = "early_bird_price_azn"
+# Internal (not admin-editable): end of the rolled-up activity log range, ISO datetime
+KEY_LOG_ROLLUP_WATERMARK = "log_rollup_watermark"
+# Internal: JSON summary of the last process_all_alerts run (read by /metrics)
+KEY_ALERTS_LAST_RUN = "alerts_last_run"
 
 ENV_FALLBACKS = {
     KEY_LIFETIME_PRICE_AZN: lambda: settings.EPOINT_LIFETIME_PRICE_AZN,
@@ -0,0 +1,91 @@
+"""Single-statement writes for skills and categories.
+
+Skill and category names are unique per user (uq_user_skill_name,
+uq_user_category_name). Rather than SELECTing for a duplicate and then writing,
+these helpers let the constraint decide: inserts are INSERT ... ON CONFLICT ...
+RETURNING and updates are UPDATE ... RETURNING, with a unique violation raised as
+DuplicateNameError. Each write is one round trip that hands back the row, and two
+requests racing for the same name can no longer both pass the check.
+
+Caller commits.
+"""
+import uuid
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.writes import dialect_insert, update_returning
+from app.models.category import Category
+from app.models.skill import Skill
+
+SKILL_EXISTS = "Skill with this name already exists"
+CATEGORY_EXISTS = "Category with this name already exists"
+
+
+class DuplicateNameError(ValueError):
+    """The user already has a skill / category with this name."""
+
+
+def insert_category(db: Session, user_id: uuid.UUID, name: str) -> Category:
+    """Create the category; DuplicateNameError if the user already has one by that name."""
+    stmt = (
+        dialect_insert(db, Category).values(user_id=user_id, name=name)
+        .on_conflict_do_nothing(index_elements=["user_id", "name"])
+        .returning(Category)
+    )
+    category = db.scalars(stmt).first()
+    if category is None:
+        raise DuplicateNameError(CATEGORY_EXISTS)
+    return category
+
+
+def ensure_category(db: Session, user_id: uuid.UUID, name: str) -> Category:
+    """The user's category called `name`, created if it does not exist yet.
+
+    DO NOTHING leaves an existing row untouched (no new row version or row lock), so
+    it is read back with a SELECT when the insert returns nothing.
+    """
+    stmt = (
+        dialect_insert(db, Category).values(user_id=user_id, name=name)
+        .on_conflict_do_nothing(index_elements=["user_id", "name"])
+        .returning(Category)
+    )
+    category = db.scalars(stmt).first()
+    if category is None:
+        category = db.query(Category).filter(Category.user_id == user_id, Category.name == name).one()
+    return category
+
+
+def insert_skill(db: Session, values: dict, category: Optional[Category] = None) -> Skill:
+    """Create a skill from column `values`; DuplicateNameError if the name is taken.
+
+    The new skill has no events and no dependencies, and its category is the one
+    passed in, so those relationships are set up front: building the response
+    from it issues no further queries.
+    """
+    stmt = (
+        dialect_insert(db, Skill).values(**values)
+        .on_conflict_do_nothing(index_elements=["user_id", "name"])
+        .returning(Skill)
+    )
+    skill = db.scalars(stmt).first()
+    if skill is None:
+        raise DuplicateNameError(SKILL_EXISTS)
+    for name in ("learning_events", "practice_events", "dependencies", "dependents"):
+        set_committed_value(skill, name, [])
+    set_committed_value(skill, "category_obj", category)
+    return skill
+
+
+def update_owned(db: Session, model, row_id: uuid.UUID, user_id: uuid.UUID, values: dict, duplicate: str):
+    """UPDATE the user's row and return it (None if there is no such row).
+
+    A unique violation rolls the session back and raises DuplicateNameError(`duplicate`).
+    """
+    try:
+        return update_returning(db, model, values, model.id == row_id, model.user_id == user_id)
+    except IntegrityError:
+        db.rollback()
+        raise DuplicateNameError(duplicate)
@@ -0,0 +1,300 @@
+"""Per-skill monthly time totals (`skill_month_rollups`) for the time reports.
+
+Every (skill, month) that has events has one row with the learning/practice
+minutes, the timed/untimed session counts per kind, and the first/last event
+day. Readers get O(skills x months) rows instead of the event history:
+
+- `skill_totals`: all-time sessions/minutes per skill (time summary),
+- `month_cells`: per-(skill, month) totals for an exact date range; whole months
+  come from the rollup, the partial months at either end from the events,
+- `session_counts`: learning/practice sessions over whole months (period comparison),
+- `range_totals`: one skill's sessions/minutes over an optional date range (timeline).
+
+The event write paths keep the table in step inside their own transaction
+(caller commits): `add_events` after inserting events of either kind (ORM objects
+or Core row dicts), `remove_events` after deleting them, and `move_event` after
+editing one, with the `snapshot` taken before the edit, so date, duration and
+skill changes move minutes between months.
+
+Additions are a multi-row upsert that adds to the counters, so concurrent writes
+to the same month can't lose each other's counts. Removals subtract, then re-read
+the month's first/last day from the events (one index range per month) and drop
+the row once the month has no events left. `rebuild` recomputes rows from the
+events; rebuild_time_rollups.py runs it (or `rollup_drift` to only check) to
+repair drift.
+"""
+from collections import namedtuple
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import extract, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.skill import Skill
+from app.models.skill_month_rollup import SkillMonthRollup
+
+COUNTERS = (
+    "learning_minutes", "practice_minutes",
+    "learning_timed", "learning_untimed", "practice_timed", "practice_untimed",
+)
+# Rows per multi-row upsert; 11 columns each stays well under SQLite's bound-parameter limit.
+BATCH_SIZE = 1000
+
+EventEntry = namedtuple("EventEntry", "kind skill_id user_id date duration_minutes")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def snapshot(event) -> EventEntry:
+    """The fields of an event (ORM object or row dict) that the rollup depends on."""
+    if isinstance(event, dict):
+        return EventEntry(
+            event["kind"], event["skill_id"], event["user_id"], event["date"], event.get("duration_minutes")
+        )
+    return EventEntry(event.kind, event.skill_id, event.user_id, event.date, event.duration_minutes)
+
+
+def _empty_cell(skill_id: UUID, user_id: UUID, month: date) -> dict:
+    cell = dict.fromkeys(COUNTERS, 0)
+    cell.update(skill_id=skill_id, user_id=user_id, month=month, first_day=None, last_day=None)
+    return cell
+
+
+def _widen(cell: dict, first: date, last: date) -> None:
+    cell["first_day"] = first if cell["first_day"] is None else min(cell["first_day"], first)
+    cell["last_day"] = last if cell["last_day"] is None else max(cell["last_day"], last)
+
+
+def _fold(cells: Dict[tuple, dict], entries: Iterable[EventEntry]) -> Dict[tuple, dict]:
+    for entry in entries:
+        key = (entry.skill_id, month_start(entry.date))
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = _empty_cell(entry.skill_id, entry.user_id, key[1])
+        if entry.duration_minutes is None:
+            cell[f"{entry.kind}_untimed"] += 1
+        else:
+            cell[f"{entry.kind}_timed"] += 1
+            cell[f"{entry.kind}_minutes"] += entry.duration_minutes
+        _widen(cell, entry.date, entry.date)
+    return cells
+
+
+def _upsert(db: Session, cells: List[dict]) -> None:
+    """Insert cells, adding onto the counters (and widening the days) of existing rows."""
+    postgres = db.get_bind().dialect.name == "postgresql"
+    dialect = postgresql if postgres else sqlite
+    least, greatest = (func.least, func.greatest) if postgres else (func.min, func.max)
+    table = SkillMonthRollup.__table__
+    for start in range(0, len(cells), BATCH_SIZE):
+        stmt = dialect.insert(table).values(cells[start:start + BATCH_SIZE])
+        set_ = {name: table.c[name] + stmt.excluded[name] for name in COUNTERS}
+        set_["first_day"] = least(table.c.first_day, stmt.excluded.first_day)
+        set_["last_day"] = greatest(table.c.last_day, stmt.excluded.last_day)
+        db.execute(stmt.on_conflict_do_update(index_elements=["skill_id", "month"], set_=set_))
+
+
+def _subtract(db: Session, entries: List[EventEntry]) -> None:
+    db.flush()  # the day refresh reads the events as they are after this change
+    table = SkillMonthRollup.__table__
+    for (skill_id, month), cell in _fold({}, entries).items():
+        in_cell = (table.c.skill_id == skill_id, table.c.month == month)
+        db.execute(table.update().where(*in_cell).values({name: table.c[name] - cell[name] for name in COUNTERS}))
+
+        first_day, last_day = db.query(func.min(Event.date), func.max(Event.date)).filter(
+            Event.skill_id == skill_id, Event.date >= month, Event.date < next_month(month)
+        ).one()
+        if first_day is not None:
+            db.execute(table.update().where(*in_cell).values(first_day=first_day, last_day=last_day))
+        else:
+            db.execute(table.delete().where(*in_cell))
+
+
+def add_events(db: Session, events: Iterable) -> None:
+    """Count newly inserted events (ORM objects or row dicts). Caller commits."""
+    cells = _fold({}, (snapshot(event) for event in events))
+    if cells:
+        _upsert(db, list(cells.values()))
+
+
+def remove_events(db: Session, events: Iterable) -> None:
+    """Discount deleted events; call after `db.delete`. Caller commits."""
+    _subtract(db, [snapshot(event) for event in events])
+
+
+def move_event(db: Session, event, before: EventEntry) -> None:
+    """Re-count an edited event that was counted as `before`. Caller commits."""
+    after = snapshot(event)
+    if after == before:
+        return
+    _subtract(db, [before])
+    _upsert(db, list(_fold({}, [after]).values()))
+
+
+def _aggregate(
+    db: Session,
+    cells: Dict[tuple, dict],
+    user_id: Optional[UUID] = None,
+    skill_ids: Optional[List[UUID]] = None,
+    first: Optional[date] = None,
+    last: Optional[date] = None,
+) -> Dict[tuple, dict]:
+    """Fold per-(skill, month) aggregates of the matching events into `cells`."""
+    year = extract("year", Event.date)
+    month = extract("month", Event.date)
+    query = (
+        db.query(
+            Event.skill_id,
+            Skill.user_id,
+            Event.kind,
+            year,
+            month,
+            func.count(Event.id),
+            func.count(Event.duration_minutes),
+            func.coalesce(func.sum(Event.duration_minutes), 0),
+            func.min(Event.date),
+            func.max(Event.date),
+        )
+        .join(Skill, Skill.id == Event.skill_id)
+        .group_by(Event.skill_id, Skill.user_id, Event.kind, year, month)
+    )
+    if user_id is not None:
+        query = query.filter(Skill.user_id == user_id)
+    if skill_ids is not None:
+        query = query.filter(Event.skill_id.in_(skill_ids))
+    if first is not None:
+        query = query.filter(Event.date >= first)
+    if last is not None:
+        query = query.filter(Event.date <= last)
+    for skill_id, owner_id, kind, row_year, row_month, sessions, timed, minutes, first_day, last_day in query:
+        key = (skill_id, date(int(row_year), int(row_month), 1))
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = _empty_cell(skill_id, owner_id, key[1])
+        cell[f"{kind}_timed"] += timed
+        cell[f"{kind}_untimed"] += sessions - timed
+        cell[f"{kind}_minutes"] += int(minutes)
+        _widen(cell, first_day, last_day)
+    return cells
+
+
+def rebuild(db: Session, user_id: Optional[UUID] = None) -> int:
+    """Recompute the rows of one user (or everyone) from the events. Returns rows written. Caller commits."""
+    table = SkillMonthRollup.__table__
+    delete = table.delete()
+    if user_id is not None:
+        delete = delete.where(table.c.user_id == user_id)
+    db.execute(delete)
+    cells = _aggregate(db, {}, user_id=user_id)
+    if cells:
+        _upsert(db, list(cells.values()))
+    return len(cells)
+
+
+def rollup_drift(db: Session, user_id: UUID) -> bool:
+    """True when the user's stored rows differ from what `rebuild` would write."""
+    expected = _aggregate(db, {}, user_id=user_id)
+    table = SkillMonthRollup.__table__
+    stored = {
+        (row["skill_id"], row["month"]): dict(row)
+        for row in db.execute(select(table).where(table.c.user_id == user_id)).mappings()
+    }
+    return stored != expected
+
+
+def skill_totals(db: Session, user_id: UUID) -> Dict[UUID, Tuple[int, int, int]]:
+    """skill_id -> (sessions, timed sessions, minutes) over all of the user's history."""
+    r = SkillMonthRollup
+    rows = db.query(
+        r.skill_id,
+        func.sum(r.learning_timed + r.learning_untimed + r.practice_timed + r.practice_untimed),
+        func.sum(r.learning_timed + r.practice_timed),
+        func.sum(r.learning_minutes + r.practice_minutes),
+    ).filter(r.user_id == user_id).group_by(r.skill_id)
+    return {skill_id: (int(sessions), int(timed), int(minutes)) for skill_id, sessions, timed, minutes in rows}
+
+
+def month_cells(db: Session, skill_ids: List[UUID], start: date, end: date) -> List[dict]:
+    """Per-(skill, month) totals of the events of `skill_ids` dated within [start, end].
+
+    Months entirely inside the range are read from the rollup. The partial months at
+    either end are aggregated from the events, restricted to the range, so the first
+    and last cells only count days inside it.
+    """
+    if not skill_ids:
+        return []
+    whole_from = start if start.day == 1 else next_month(start)
+    whole_until = next_month(end) if next_month(end) - timedelta(days=1) == end else month_start(end)  # exclusive
+
+    cells: Dict[tuple, dict] = {}
+    if whole_from < whole_until:
+        table = SkillMonthRollup.__table__
+        rows = db.execute(select(table).where(
+            table.c.skill_id.in_(skill_ids),
+            table.c.month >= whole_from,
+            table.c.month < whole_until,
+        )).mappings()
+        for row in rows:
+            cells[(row["skill_id"], row["month"])] = dict(row)
+        partial = [(start, whole_from - timedelta(days=1)), (whole_until, end)]
+    else:
+        partial = [(start, end)]
+
+    for first, last in partial:
+        if first <= last:
+            _aggregate(db, cells, skill_ids=skill_ids, first=first, last=last)
+    return list(cells.values())
+
+
+def session_counts(db: Session, user_id: UUID, first_month: date, last_month: Optional[date] = None) -> Tuple[int, int]:
+    """(learning, practice) sessions of the user in months [first_month, last_month]; open-ended when None."""
+    r = SkillMonthRollup
+    query = db.query(
+        func.coalesce(func.sum(r.learning_timed + r.learning_untimed), 0),
+        func.coalesce(func.sum(r.practice_timed + r.practice_untimed), 0),
+    ).filter(r.user_id == user_id, r.month >= first_month)
+    if last_month is not None:
+        query = query.filter(r.month <= last_month)
+    learning, practice = query.one()
+    return int(learning), int(practice)
+
+
+def range_totals(
+    db: Session,
+    skill_id: UUID,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    kind: Optional[str] = None,
+) -> Tuple[int, int, int]:
+    """(sessions, timed sessions, minutes) of one skill within [start, end], either bound open.
+
+    Open bounds are closed at the skill's first/last event day from the rollup, then
+    `month_cells` does the rest, so only partial edge months touch the events.
+    `kind` ("learning" or "practice") restricts the counts to that kind.
+    """
+    if start is None or end is None:
+        r = SkillMonthRollup
+        first_day, last_day = db.query(func.min(r.first_day), func.max(r.last_day)).filter(r.skill_id == skill_id).one()
+        if first_day is None:
+            return 0, 0, 0
+        start = start if start is not None else first_day
+        end = end if end is not None else last_day
+    if start > end:
+        return 0, 0, 0
+    kinds = (kind,) if kind is not None else ("learning", "practice")
+    sessions = timed = minutes = 0
+    for cell in month_cells(db, [skill_id], start, end):
+        for k in kinds:
+            timed += cell[f"{k}_timed"]
+            sessions += cell[f"{k}_timed"] + cell[f"{k}_untimed"]
+            minutes += cell[f"{k}_minutes"]
+    return sessions, timed, minutes
@@ -5,21 +5,32 @@ and practice event. Nothing here logs, recommends, or predicts — it only sums
 formats what the user manually recorded, and reuses the deterministic freshness
 engine for the hours-vs-freshness overlay.
 
+Sums and counts come from the per-skill monthly rollup (services/time_rollups.py):
+whole months are read from `skill_month_rollups`, and only the partial months at
+the ends of a report range are aggregated from the events. The overlay needs event
+dates: it reads them per (skill, day) up to the report end and evaluates freshness
+with bisection.
+
 Two entry points:
   - time_summary(db, user)              -> FREE: account + per-skill totals + coverage
   - time_report(db, user, start, end)   -> PRO:  full date-range breakdown
 """
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
+from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.models.event import LearningEvent, PracticeEvent
+from app.models.category import Category
+from app.models.event import Event
 from app.models.skill import Skill
 from app.models.user import User
-from app.services.freshness import calculate_freshness
+from app.services.freshness import _freshness_value
+from app.services.time_rollups import month_cells, skill_totals
 
 
 def _hours(minutes: int) -> float:
@@ -47,30 +58,27 @@ def _month_end(year: int, month: int) -> date:
 
 def time_summary(db: Session, user: User) -> dict:
     """FREE: account total hours + per-skill totals + duration coverage."""
-    skills = db.query(Skill).filter(Skill.user_id == user.id).all()
+    skills = db.query(Skill.id, Skill.name, Skill.archived_at).filter(Skill.user_id == user.id).all()
+
+    stats = skill_totals(db, user.id)
 
     total_minutes = 0
     total_sessions = 0
     timed_sessions = 0
     per_skill = []
 
-    for skill in skills:
-        s_minutes = 0
-        s_sessions = 0
-        for event in list(skill.learning_events) + list(skill.practice_events):
-            total_sessions += 1
-            s_sessions += 1
-            if event.duration_minutes is not None:
-                timed_sessions += 1
-                total_minutes += event.duration_minutes
-                s_minutes += event.duration_minutes
+    for skill_id, name, archived_at in skills:
+        s_sessions, s_timed, s_minutes = stats.get(skill_id, (0, 0, 0))
+        total_sessions += s_sessions
+        timed_sessions += s_timed
+        total_minutes += s_minutes
 
         # Show active skills always; archived skills only if they hold history.
-        if s_sessions > 0 or skill.archived_at is None:
+        if s_sessions > 0 or archived_at is None:
             per_skill.append({
-                "skill_id": str(skill.id),
-                "skill_name": skill.name,
-                "archived": skill.archived_at is not None,
+                "skill_id": str(skill_id),
+                "skill_name": name,
+                "archived": archived_at is not None,
                 "hours": _hours(s_minutes),
                 "sessions": s_sessions,
             })
@@ -95,13 +103,30 @@ def time_report(
 ) -> dict:
     """PRO: full breakdown for [start, end] — totals, per-skill, per-category,
     monthly trend, and the hours-vs-freshness overlay."""
-    query = db.query(Skill).filter(
+    query = db.query(Skill.id, Skill.name, Skill.category_id, Skill.created_at, Skill.decay_rate).filter(
         Skill.user_id == user.id,
         Skill.archived_at.is_(None),  # match the rest of analytics — archived skills excluded
     )
     if skill_id is not None:
         query = query.filter(Skill.id == skill_id)
     skills = query.all()
+    skill_ids = [skill.id for skill in skills]
+    category_ids = {skill.category_id for skill in skills if skill.category_id is not None}
+    category_names = (
+        dict(db.query(Category.id, Category.name).filter(Category.id.in_(category_ids)).all())
+        if category_ids else {}
+    )
+
+    # skill_id -> its (skill, month) cells within the range; month -> minutes per kind
+    by_skill = defaultdict(list)
+    month_learning = defaultdict(int)
+    month_practice = defaultdict(int)
+    for cell in month_cells(db, skill_ids, start, end):
+        by_skill[cell["skill_id"]].append(cell)
+        key = f"{cell['month'].year:04d}-{cell['month'].month:02d}"
+        month_learning[key] += cell["learning_minutes"]
+        month_practice[key] += cell["practice_minutes"]
+    month_minutes = {key: month_learning[key] + month_practice[key] for key in month_learning}
 
     totals = {
         "minutes": 0, "sessions": 0, "timed": 0, "untimed": 0,
@@ -111,64 +136,44 @@ def time_report(
     cat_minutes = defaultdict(int)
     cat_sessions = defaultdict(int)
     cat_skill_count = defaultdict(int)
-    month_minutes = defaultdict(int)
-    month_learning = defaultdict(int)
-    month_practice = defaultdict(int)
     all_dates: list[date] = []
 
     for skill in skills:
-        category = skill.category_obj.name if skill.category_obj else "Uncategorized"
-        s = {"minutes": 0, "sessions": 0, "learning": 0, "practice": 0, "untimed": 0, "dates": []}
-
-        events = (
-            [(e, "learning") for e in skill.learning_events]
-            + [(e, "practice") for e in skill.practice_events]
-        )
-        for event, kind in events:
-            if event.date < start or event.date > end:
-                continue
-            s["sessions"] += 1
-            s["dates"].append(event.date)
-            all_dates.append(event.date)
-            minutes = event.duration_minutes
-            if minutes is None:
-                s["untimed"] += 1
-                continue
-            month_key = f"{event.date.year:04d}-{event.date.month:02d}"
-            s["minutes"] += minutes
-            month_minutes[month_key] += minutes
-            if kind == "learning":
-                s["learning"] += minutes
-                month_learning[month_key] += minutes
-            else:
-                s["practice"] += minutes
-                month_practice[month_key] += minutes
-
-        if s["sessions"] == 0:
+        cells = by_skill.get(skill.id)
+        if not cells:
             continue  # skill has no activity in this window
-
-        totals["sessions"] += s["sessions"]
-        totals["minutes"] += s["minutes"]
-        totals["timed"] += s["sessions"] - s["untimed"]
-        totals["untimed"] += s["untimed"]
-        totals["learning_minutes"] += s["learning"]
-        totals["practice_minutes"] += s["practice"]
-
-        cat_minutes[category] += s["minutes"]
-        cat_sessions[category] += s["sessions"]
+        category = category_names.get(skill.category_id, "Uncategorized")
+        learning_minutes = sum(cell["learning_minutes"] for cell in cells)
+        practice_minutes = sum(cell["practice_minutes"] for cell in cells)
+        minutes = learning_minutes + practice_minutes
+        timed = sum(cell["learning_timed"] + cell["practice_timed"] for cell in cells)
+        sessions = timed + sum(cell["learning_untimed"] + cell["practice_untimed"] for cell in cells)
+        first = min(cell["first_day"] for cell in cells)
+        last = max(cell["last_day"] for cell in cells)
+        all_dates.extend((first, last))
+
+        totals["sessions"] += sessions
+        totals["minutes"] += minutes
+        totals["timed"] += timed
+        totals["untimed"] += sessions - timed
+        totals["learning_minutes"] += learning_minutes
+        totals["practice_minutes"] += practice_minutes
+
+        cat_minutes[category] += minutes
+        cat_sessions[category] += sessions
         cat_skill_count[category] += 1
 
         per_skill.append({
             "skill_id": str(skill.id),
             "skill_name": skill.name,
             "category": category,
-            "hours": _hours(s["minutes"]),
-            "sessions": s["sessions"],
-            "learning_hours": _hours(s["learning"]),
-            "practice_hours": _hours(s["practice"]),
-            "first_activity": min(s["dates"]).isoformat() if s["dates"] else None,
-            "last_activity": max(s["dates"]).isoformat() if s["dates"] else None,
-            "untimed_sessions": s["untimed"],
+            "hours": _hours(minutes),
+            "sessions": sessions,
+            "learning_hours": _hours(learning_minutes),
+            "practice_hours": _hours(practice_minutes),
+            "first_activity": first.isoformat(),
+            "last_activity": last.isoformat(),
+            "untimed_sessions": sessions - timed,
         })
 
     per_skill.sort(key=lambda p: p["hours"], reverse=True)
@@ -187,13 +192,14 @@ def time_report(
         reverse=True,
     )
 
+    histories = _skill_histories(db, skills, end)
     by_month = []
     hours_vs_freshness = []
     for year, month in _iter_months(start, end):
         key = f"{year:04d}-{month:02d}"
         by_month.append({
             "month": key,
-            "hours": _hours(month_minutes[key]),
+            "hours": _hours(month_minutes.get(key, 0)),
             "learning_hours": _hours(month_learning[key]),
             "practice_hours": _hours(month_practice[key]),
         })
@@ -202,8 +208,8 @@ def time_report(
         as_of = min(_month_end(year, month), end)
         hours_vs_freshness.append({
             "month": key,
-            "hours": _hours(month_minutes[key]),
-            "avg_freshness": _avg_freshness(skills, as_of),
+            "hours": _hours(month_minutes.get(key, 0)),
+            "avg_freshness": _avg_freshness(histories, as_of),
         })
 
     return {
@@ -226,25 +232,75 @@ def time_report(
     }
 
 
-def _avg_freshness(skills: list, as_of: date) -> Optional[float]:
+@dataclass
+class SkillHistory:
+    """What the freshness formula needs about one skill, as sorted per-day data."""
+    created: date
+    decay_rate: float
+    practice_days: List[date]
+    learning_days: List[date]
+    learning_cumulative: List[int]  # learning events on or before learning_days[i]: learning_cumulative[i + 1]
+
+    def learning_between(self, first: date, last: date) -> int:
+        return (
+            self.learning_cumulative[bisect_right(self.learning_days, last)]
+            - self.learning_cumulative[bisect_left(self.learning_days, first)]
+        )
+
+
+def _skill_histories(db: Session, skills: list, until: date) -> List[SkillHistory]:
+    """Per-day event data for `skills` up to `until`: one row per (skill, kind, day)."""
+    practice_days = defaultdict(list)
+    learning_days = defaultdict(list)
+    learning_counts = defaultdict(list)
+    skill_ids = [skill.id for skill in skills]
+    if skill_ids:
+        rows = (
+            db.query(Event.skill_id, Event.kind, Event.date, func.count(Event.id))
+            .filter(Event.skill_id.in_(skill_ids), Event.date <= until)
+            .group_by(Event.skill_id, Event.kind, Event.date)
+            .order_by(Event.skill_id, Event.kind, Event.date)
+        )
+        for row_skill_id, kind, day, count in rows:
+            if kind == "practice":
+                practice_days[row_skill_id].append(day)
+            else:
+                learning_days[row_skill_id].append(day)
+                learning_counts[row_skill_id].append(count)
+
+    histories = []
+    for skill in skills:
+        cumulative = [0]
+        for count in learning_counts[skill.id]:
+            cumulative.append(cumulative[-1] + count)
+        histories.append(SkillHistory(
+            created=skill.created_at.date(),
+            decay_rate=skill.decay_rate or 0.02,
+            practice_days=practice_days[skill.id],
+            learning_days=learning_days[skill.id],
+            learning_cumulative=cumulative,
+        ))
+    return histories
+
+
+def _avg_freshness(histories: List[SkillHistory], as_of: date) -> Optional[float]:
     """Mean freshness across the given skills as of `as_of`, using each skill's own
-    events filtered to that date. Reuses the pure freshness engine.
+    events up to that date. Same result as calculate_freshness over those events:
+    the last practice and the 30-day learning count are found by bisection.
 
     Skills created after `as_of` are skipped — they didn't exist yet, so they must not
     bias the month toward 100%. Returns None when no skill existed yet, so the overlay
     shows an honest gap rather than a misleading 0 or 100.
     """
     values = []
-    for skill in skills:
-        if skill.created_at.date() > as_of:
+    for history in histories:
+        if history.created > as_of:
             continue  # skill did not exist yet this month
-        learning = [(e.date, e.type) for e in skill.learning_events if e.date <= as_of]
-        practice = [(e.date, e.type) for e in skill.practice_events if e.date <= as_of]
-        values.append(calculate_freshness(
-            skill_created_at=skill.created_at.date(),
-            learning_events=learning,
-            practice_events=practice,
-            base_decay_rate=skill.decay_rate or 0.02,
-            today=as_of,
+        practiced = bisect_right(history.practice_days, as_of)
+        last_practice = history.practice_days[practiced - 1] if practiced else history.created
+        values.append(_freshness_value(
+            (as_of - last_practice).days,
+            history.learning_between(as_of - timedelta(days=30), as_of),
+            history.decay_rate,
         ))
     return round(sum(values) / len(values), 1) if values else None
@@ -0,0 +1,36 @@
+"""Database setup shared by the benchmark scripts.
+
+Defaults to a throwaway in-memory SQLite database (same type shims as
+tests/conftest.py); pass a real DATABASE_URL to measure against Postgres. Against a
+real database the schema is expected to exist already (run migrations first).
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401 - register every table on Base.metadata
+from app.core.database import Base
+
+MEMORY_URL = "sqlite:///:memory:"
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(_element, _compiler, **_kw):
+    return "CHAR(36)"
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(_element, _compiler, **_kw):
+    return "JSON"
+
+
+def make_session(url: str = MEMORY_URL) -> Session:
+    """Return a session bound to `url`, creating the schema for in-memory SQLite."""
+    if url == MEMORY_URL:
+        engine = create_engine(url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine)
+    else:
+        engine = create_engine(url)
+    return sessionmaker(bind=engine, autoflush=False, autocommit=False)()
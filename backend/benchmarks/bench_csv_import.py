@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark the CSV event import on a generated file.
+
+Writes a seeded CSV (default 100k rows across 60 skills / 8 categories / 5 years of
+dates) to a temp file, then times `import_events_csv` + commit reading it through the
+same streaming path the endpoint uses.
+
+Usage (from backend/):
+    python -m benchmarks.bench_csv_import
+    python -m benchmarks.bench_csv_import --rows 250000 --memory
+    python -m benchmarks.bench_csv_import --database-url postgresql://... --max-seconds 10
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from app.core.security import get_password_hash
+from app.models.user import User
+from app.services.csv_import import import_events_csv
+from benchmarks._db import MEMORY_URL, make_session
+
+LEARNING_TYPES = ["reading", "video", "course", "article", "documentation", "tutorial"]
+PRACTICE_TYPES = ["exercise", "project", "work", "teaching", "writing", "building"]
+
+
+def generate_csv(path: str, rows: int, skills: int = 60, categories: int = 8, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    skill_names = [f"Skill {i:03d}" for i in range(skills)]
+    skill_category = {name: f"Category {rng.randrange(categories)}" for name in skill_names}
+    start = date.today() - timedelta(days=5 * 365)
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["skill", "category", "event_type", "date", "type", "duration_minutes", "notes"])
+        for _ in range(rows):
+            name = rng.choice(skill_names)
+            practice = rng.random() < 0.45
+            writer.writerow([
+                name,
+                skill_category[name],
+                "practice" if practice else "learning",
+                (start + timedelta(days=rng.randrange(5 * 365))).isoformat(),
+                rng.choice(PRACTICE_TYPES if practice else LEARNING_TYPES),
+                rng.choice([15, 30, 45, 60, 90, 120]) if rng.random() < 0.8 else "",
+                "imported from tracker" if rng.random() < 0.3 else "",
+            ])
+
+
+def run(rows: int, database_url: str, trace_memory: bool) -> dict:
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        generate_csv(path, rows)
+        db = make_session(database_url)
+        user = User(email=f"bench-{time.time_ns()}@example.com", password_hash=get_password_hash("bench"))
+        db.add(user)
+        db.commit()
+
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        with open(path, encoding="utf-8-sig", newline="") as stream:
+            report = import_events_csv(db, user, stream)
+        db.commit()
+        elapsed = time.perf_counter() - started
+        peak = None
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        db.close()
+        return {
+            "rows": rows,
+            "file_mb": os.path.getsize(path) / 1e6,
+            "seconds": elapsed,
+            "rows_per_second": rows / elapsed if elapsed else float("inf"),
+            "peak_mb": peak / 1e6 if peak is not None else None,
+            "report": report,
+        }
+    finally:
+        os.unlink(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--database-url", default=MEMORY_URL)
+    parser.add_argument("--memory", action="store_true", help="trace peak Python allocations (slower)")
+    parser.add_argument("--max-seconds", type=float, default=None, help="exit 1 if the import is slower")
+    args = parser.parse_args()
+
+    result = run(args.rows, args.database_url, args.memory)
+    report = result["report"]
+    print(f"rows:        {result['rows']:,} ({result['file_mb']:.1f} MB)")
+    print(f"imported:    {report['imported']:,} (failed {report['failed']}, "
+          f"skills {report['skills_created']}, categories {report['categories_created']})")
+    print(f"time:        {result['seconds']:.2f}s ({result['rows_per_second']:,.0f} rows/s)")
+    if result["peak_mb"] is not None:
+        print(f"peak memory: {result['peak_mb']:.1f} MB")
+
+    if args.max_seconds is not None and result["seconds"] > args.max_seconds:
+        print(f"FAIL: slower than {args.max_seconds}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+"""
+Micro-benchmarks for the freshness and time-stats engines, compared against a JSON baseline.
+
+Covers calculate_freshness, calculate_freshness_history, calculate_personal_records,
+time_summary, time_report and _avg_freshness over a matrix of event counts
+(10 .. 100k) and history windows (90 days .. 5 years). Each (events, window)
+pair is generated once with a fixed seed. The pure functions get one skill
+holding all the events. The DB-backed ones use an in-memory SQLite database
+with the same events spread across 20 skills; the session is expired before
+every call, so relationship loads are part of the measurement.
+
+Every case runs until it has at least 3 rounds and `--min-time` seconds, and the
+median per-call time is reported. If one call of a function exceeds
+`--max-call-seconds`, its larger cases are skipped and recorded as too slow.
+
+Baselines are machine specific: record them with `--save` on the machine that
+will run the comparison (e.g. the CI runner), then compare on every change. A
+case fails when its median is more than `--tolerance` slower than the baseline
+(and by more than MIN_REGRESSION_SECONDS), or when a baseline case is now too slow to run.
+
+Usage (from backend/):
+    python -m benchmarks.bench_engines                     # compare with baselines/engines.json
+    python -m benchmarks.bench_engines --save              # record a new baseline
+    python -m benchmarks.bench_engines --max-events 1000 --only personal_records
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.skill import Skill
+from app.models.user import User
+from app.services.freshness import calculate_freshness, calculate_freshness_history, calculate_personal_records
+from app.services.time_rollups import rebuild as rebuild_time_rollups
+from app.services.time_stats import _avg_freshness, _skill_histories, time_report, time_summary
+from benchmarks._db import make_session
+
+EVENT_COUNTS = (10, 100, 1_000, 10_000, 100_000)
+WINDOWS = (90, 365, 5 * 365)
+SKILLS = 20
+CASE_NAMES = ("freshness", "freshness_history", "personal_records", "time_summary", "time_report", "avg_freshness")
+BASELINE_PATH = Path(__file__).parent / "baselines" / "engines.json"
+# Ignore differences below this; tiny cases jitter by more than any tolerance.
+MIN_REGRESSION_SECONDS = 0.0005
+
+LEARNING_TYPES = ["reading", "video", "course", "article", "documentation", "tutorial"]
+PRACTICE_TYPES = ["exercise", "project", "work", "teaching", "writing", "building"]
+
+
+@dataclass
+class Dataset:
+    events: int
+    window: int
+    created_at: date
+    learning: list
+    practice: list
+    db: Session
+    user: User
+
+
+def build_dataset(events: int, window: int, seed: int = 42) -> Dataset:
+    rng = random.Random(seed * 1_000_003 + events * 31 + window)
+    today = date.today()
+    created_at = today - timedelta(days=window)
+    dates = [created_at + timedelta(days=rng.randrange(window + 1)) for _ in range(events)]
+    practice_flags = [rng.random() < 0.45 for _ in range(events)]
+    learning = [(d, rng.choice(LEARNING_TYPES)) for d, p in zip(dates, practice_flags) if not p]
+    practice = [(d, rng.choice(PRACTICE_TYPES)) for d, p in zip(dates, practice_flags) if p]
+
+    db = make_session()
+    user = User(email=f"bench-{events}-{window}@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    skills = [
+        Skill(user_id=user.id, name=f"Skill {i}", decay_rate=0.02,
+              created_at=datetime.combine(created_at, datetime.min.time()))
+        for i in range(SKILLS)
+    ]
+    db.add_all(skills)
+    db.flush()
+    rows = []
+    for i, (d, practiced) in enumerate(zip(dates, practice_flags)):
+        rows.append({
+            "kind": "practice" if practiced else "learning",
+            "skill_id": skills[i % SKILLS].id,
+            "user_id": user.id,
+            "date": d,
+            "type": rng.choice(PRACTICE_TYPES if practiced else LEARNING_TYPES),
+            "duration_minutes": rng.choice([15, 30, 45, 60, 90, None]),
+        })
+    for start in range(0, len(rows), 5000):
+        db.execute(insert(Event.__table__), rows[start:start + 5000])
+    rebuild_time_rollups(db)
+    db.commit()
+    return Dataset(events, window, created_at, learning, practice, db, user)
+
+
+def _load_histories(ds: Dataset, until: date) -> list:
+    return _skill_histories(ds.db, ds.db.query(Skill).filter(Skill.user_id == ds.user.id).all(), until)
+
+
+def _cases(ds: Dataset) -> Dict[str, tuple]:
+    """name -> (call, setup). `setup` runs before each call and isn't timed."""
+    today = date.today()
+    expire = ds.db.expire_all
+    loaded = {}
+
+    def load_histories():
+        loaded["histories"] = _load_histories(ds, today)
+
+    return {
+        "freshness": (lambda: calculate_freshness(ds.created_at, ds.learning, ds.practice, 0.02, today), None),
+        "freshness_history": (
+            lambda: calculate_freshness_history(ds.created_at, ds.learning, ds.practice, 0.02, days=ds.window), None
+        ),
+        "personal_records": (lambda: calculate_personal_records(ds.created_at, ds.learning, ds.practice, 0.02), None),
+        "time_summary": (lambda: time_summary(ds.db, ds.user), expire),
+        "time_report": (lambda: time_report(ds.db, ds.user, ds.created_at, today), expire),
+        "avg_freshness": (lambda: _avg_freshness(loaded["histories"], today), load_histories),
+    }
+
+
+def measure(call: Callable, setup: Optional[Callable], min_time: float, max_call_seconds: float) -> dict:
+    times: List[float] = []
+    while len(times) < 3 or sum(times) < min_time:
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - started)
+        if times[-1] > max_call_seconds or len(times) >= 200:
+            break
+    return {"median_s": round(statistics.median(times), 6), "min_s": round(min(times), 6), "rounds": len(times)}
+
+
+def run(event_counts=EVENT_COUNTS, windows=WINDOWS, only=None, min_time=0.2, max_call_seconds=2.0,
+        progress: Callable[[str], None] = lambda line: None) -> Dict[str, dict]:
+    """Run the matrix. Returns `{"<function>/<events>ev/<window>d": result}`."""
+    results: Dict[str, dict] = {}
+    too_slow: Dict[str, int] = {}  # function -> smallest event count that exceeded the budget
+    for window in windows:
+        for events in event_counts:
+            names = [name for name in (only or CASE_NAMES) if events < too_slow.get(name, float("inf"))]
+            skipped = [name for name in (only or CASE_NAMES) if name not in names]
+            for name in skipped:
+                results[f"{name}/{events}ev/{window}d"] = {"skipped": "too slow"}
+            if not names:
+                continue
+            ds = build_dataset(events, window)
+            cases = _cases(ds)
+            for name in names:
+                key = f"{name}/{events}ev/{window}d"
+                call, setup = cases[name]
+                results[key] = measure(call, setup, min_time, max_call_seconds)
+                if results[key]["median_s"] > max_call_seconds:
+                    too_slow[name] = min(events, too_slow.get(name, events))
+                progress(f"{key:<42} {_format(results[key])}")
+            ds.db.close()
+    return results
+
+
+def _format(result: dict) -> str:
+    if "skipped" in result:
+        return f"skipped ({result['skipped']})"
+    return f"{result['median_s'] * 1000:10.3f} ms  (min {result['min_s'] * 1000:.3f}, {result['rounds']} rounds)"
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Human-readable regressions of `results` against `baseline` (empty when none)."""
+    regressions = []
+    for key, base in baseline.items():
+        current = results.get(key)
+        if current is None or "skipped" in base:
+            continue
+        if "skipped" in current:
+            regressions.append(f"{key}: now too slow to run (baseline {base['median_s'] * 1000:.3f} ms)")
+            continue
+        slower = current["median_s"] - base["median_s"]
+        if current["median_s"] > base["median_s"] * (1 + tolerance) and slower > MIN_REGRESSION_SECONDS:
+            regressions.append(
+                f"{key}: {current['median_s'] * 1000:.3f} ms vs baseline {base['median_s'] * 1000:.3f} ms "
+                f"({current['median_s'] / base['median_s']:.2f}x)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="allowed slowdown, 1.0 = twice as slow")
+    parser.add_argument("--max-events", type=int, default=max(EVENT_COUNTS))
+    parser.add_argument("--max-window", type=int, default=max(WINDOWS), help="days")
+    parser.add_argument("--only", action="append", choices=CASE_NAMES, help="repeatable")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds measured per case")
+    parser.add_argument("--max-call-seconds", type=float, default=2.0, help="skip larger cases past this")
+    args = parser.parse_args()
+
+    results = run(
+        event_counts=[n for n in EVENT_COUNTS if n <= args.max_events],
+        windows=[w for w in WINDOWS if w <= args.max_window],
+        only=args.only,
+        min_time=args.min_time,
+        max_call_seconds=args.max_call_seconds,
+        progress=print,
+    )
+
+    if args.save:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        # Keep baseline entries for cases this run didn't cover (--only / --max-*)
+        merged = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        merged.update(results)
+        args.baseline.write_text(json.dumps(dict(sorted(merged.items())), indent=2) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save first")
+        return
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    if regressions:
+        print("FAIL: regressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print("OK: no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+"""
+Fill a database with a seeded, production-shaped synthetic dataset.
+
+Creates `--users` accounts (`user0@loadtest.example.com` ... plus `admin@loadtest.example.com`,
+all with the `--password` password), their categories, skills, learning/practice
+events and activity logs, using multi-row INSERTs in batches. The shapes follow
+what real accounts look like:
+
+- skills per user are long-tailed (most have a handful, a few have dozens)
+- each skill has its own activity level, learning/practice mix and active window,
+  so some are fresh, some decaying and some abandoned years ago
+- a `--pro-share` of users own an active lifetime subscription (PRO routes)
+- activity logs come in sessions of weighted page views / clicks, ~20% anonymous
+
+The same seed always produces the same rows (ids included; dates are relative
+to today), so runs against a fresh database are comparable. Against Postgres, run migrations first. Rollups
+are not built; run run_log_maintenance.py afterwards to serve stats from rollups.
+The per-skill monthly time rollups are rebuilt from the generated events.
+
+Usage (from backend/):
+    python -m benchmarks.generate_dataset --users 500
+    python -m benchmarks.generate_dataset --users 5000 --logs-per-user 400 --database-url postgresql://...
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.activity_log import ActivityLog
+from app.models.category import Category
+from app.models.event import Event
+from app.models.skill import Skill
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.log_dimensions import encode_page, encode_user_agent, register_action_type
+from app.services.time_rollups import rebuild as rebuild_time_rollups
+from benchmarks._db import make_session
+
+EMAIL_DOMAIN = "loadtest.example.com"
+ADMIN_EMAIL = f"admin@{EMAIL_DOMAIN}"
+
+LEARNING_TYPES = ["reading", "video", "course", "article", "documentation", "tutorial"]
+PRACTICE_TYPES = ["exercise", "project", "work", "teaching", "writing", "building"]
+DURATIONS = [15, 20, 30, 45, 60, 90, 120, 180]
+CATEGORY_NAMES = ["Programming", "Languages", "Music", "Design", "Data", "Writing", "Fitness", "Cooking", "Finance"]
+SKILL_NAMES = [
+    "Python", "Rust", "Go", "TypeScript", "SQL", "Kubernetes", "Spanish", "German", "Japanese",
+    "Guitar", "Piano", "Figma", "Typography", "Statistics", "Machine Learning", "Excel",
+    "Copywriting", "Public Speaking", "Running", "Yoga", "Baking", "Investing", "Chess", "Photography",
+]
+# (action_type, weight, pages)
+LOG_ACTIONS = [
+    ("page_view", 60, ["/", "/dashboard", "/skills", "/analytics", "/calendar", "/settings", "/pricing"]),
+    ("click", 25, ["/dashboard", "/skills", "/analytics"]),
+    ("event_created", 10, ["/skills"]),
+    ("login", 4, ["/login"]),
+    ("signup", 1, ["/register"]),
+]
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_6) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.6 Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148",
+    "Mozilla/5.0 (X11; Linux x86_64; rv:131.0) Gecko/20100101 Firefox/131.0",
+    "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0 Mobile Safari/537.36",
+]
+
+
+class _Batcher:
+    """Buffers rows per table and writes them as multi-row INSERTs.
+
+    Any full buffer flushes every table, parents first, so foreign keys always
+    point at rows that were already written.
+    """
+
+    def __init__(self, db: Session, batch_size: int):
+        self.db = db
+        self.batch_size = batch_size
+        self.pending: Dict[object, List[dict]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, model, row: dict) -> None:
+        rows = self.pending.setdefault(model, [])
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self.flush_all()
+
+    def _flush(self, model) -> None:
+        rows = self.pending.get(model)
+        if rows:
+            self.db.execute(insert(model.__table__), rows)
+            self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+            self.pending[model] = []
+
+    def flush_all(self) -> None:
+        for model in (User, Subscription, Category, Skill, Event, ActivityLog):
+            self._flush(model)
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _skill_events(rng, batch, user_id, skill_id, today, history_days):
+    """One skill's events: its own start, active window, intensity and learning/practice mix."""
+    started = today - timedelta(days=rng.randrange(30, history_days))
+    span = (today - started).days
+    # A third of skills were abandoned part-way; the rest are still being worked on.
+    active_days = rng.randrange(7, span) if rng.random() < 0.33 else span
+    per_month = min(rng.lognormvariate(1.3, 0.9), 60)
+    practice_share = rng.betavariate(2, 2.5)
+    for _ in range(max(1, int(per_month * active_days / 30))):
+        practice = rng.random() < practice_share
+        batch.add(Event, {
+            "id": _uuid(rng),
+            "kind": "practice" if practice else "learning",
+            "skill_id": skill_id,
+            "user_id": user_id,
+            "date": started + timedelta(days=rng.randrange(active_days + 1)),
+            "type": rng.choice(PRACTICE_TYPES if practice else LEARNING_TYPES),
+            "duration_minutes": rng.choice(DURATIONS) if rng.random() < 0.75 else None,
+            "notes": None,
+        })
+
+
+def _sessions(rng, batch, user_id, count, now, history_days, page_ids, agent_ids, action_names, action_weights):
+    """`count` log rows grouped into sessions of 1-15 actions a few seconds apart."""
+    written = 0
+    while written < count:
+        session = uuid.UUID(int=rng.getrandbits(128), version=4).hex
+        at = now - timedelta(seconds=rng.randrange(history_days * 86400))
+        agent_id = rng.choice(agent_ids)
+        ip = f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+        for _ in range(min(rng.randint(1, 15), count - written)):
+            action = rng.choices(action_names, action_weights)[0]
+            batch.add(ActivityLog, {
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "session_id": session,
+                "action_type": action,
+                "page_id": rng.choice(page_ids[action]),
+                "details": {},
+                "ip_address": ip,
+                "user_agent_id": agent_id,
+                "created_at": at,
+            })
+            at += timedelta(seconds=rng.randint(2, 90))
+            written += 1
+
+
+def generate(
+    db: Session,
+    users: int = 100,
+    logs_per_user: int = 200,
+    history_years: int = 3,
+    pro_share: float = 0.3,
+    password: str = "loadtest",
+    seed: int = 42,
+    batch_size: int = 5000,
+) -> Dict[str, int]:
+    """Insert the dataset and commit. Returns row counts per table."""
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    today = now.date()
+    history_days = history_years * 365
+    password_hash = get_password_hash(password)  # bcrypt is slow; every account shares one hash
+
+    page_ids = {action: [encode_page(db, page) for page in pages] for action, _, pages in LOG_ACTIONS}
+    agent_ids = [encode_user_agent(db, agent) for agent in USER_AGENTS]
+    action_names = [action for action, _, _ in LOG_ACTIONS]
+    action_weights = [weight for _, weight, _ in LOG_ACTIONS]
+    for action in action_names:
+        register_action_type(db, action)
+
+    batch = _Batcher(db, batch_size)
+    batch.add(User, {
+        "id": _uuid(rng), "email": ADMIN_EMAIL, "password_hash": password_hash, "is_admin": True,
+        "settings": {}, "created_at": now - timedelta(days=history_days),
+    })
+    for index in range(users):
+        user_id = _uuid(rng)
+        batch.add(User, {
+            "id": user_id, "email": f"user{index}@{EMAIL_DOMAIN}", "password_hash": password_hash,
+            "is_admin": False, "settings": {}, "created_at": now - timedelta(days=rng.randrange(history_days)),
+        })
+        if rng.random() < pro_share:
+            batch.add(Subscription, {
+                "id": _uuid(rng), "user_id": user_id, "plan": "lifetime", "status": "active",
+                "provider": "epoint", "order_id": f"loadtest-{index}", "purchased_at": now,
+                "amount": Decimal("49.00"), "currency": "AZN", "raw_callback": {},
+                "created_at": now, "updated_at": now,
+            })
+
+        category_ids = []
+        for name in rng.sample(CATEGORY_NAMES, rng.randrange(0, 5)):
+            category_ids.append(_uuid(rng))
+            batch.add(Category, {"id": category_ids[-1], "user_id": user_id, "name": name, "created_at": now})
+
+        skill_count = min(int(rng.paretovariate(1.2)) + rng.randrange(1, 5), len(SKILL_NAMES))
+        for name in rng.sample(SKILL_NAMES, skill_count):
+            skill_id = _uuid(rng)
+            batch.add(Skill, {
+                "id": skill_id, "user_id": user_id, "name": name,
+                "category_id": rng.choice(category_ids) if category_ids and rng.random() < 0.7 else None,
+                "decay_rate": rng.choice([0.01, 0.02, 0.02, 0.02, 0.03, 0.05]),
+                "created_at": now - timedelta(days=history_days),
+            })
+            _skill_events(rng, batch, user_id, skill_id, today, history_days)
+
+        log_user = None if rng.random() < 0.2 else user_id
+        _sessions(rng, batch, log_user, int(rng.expovariate(1 / logs_per_user)) if logs_per_user else 0,
+                  now, history_days, page_ids, agent_ids, action_names, action_weights)
+
+    batch.flush_all()
+    batch.counts["skill_month_rollups"] = rebuild_time_rollups(db)
+    db.commit()
+    return batch.counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--logs-per-user", type=int, default=200, help="mean activity log rows per user")
+    parser.add_argument("--years", type=int, default=3, help="history window")
+    parser.add_argument("--pro-share", type=float, default=0.3)
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    args = parser.parse_args()
+
+    db = make_session(args.database_url)
+    started = time.perf_counter()
+    counts = generate(
+        db, users=args.users, logs_per_user=args.logs_per_user, history_years=args.years,
+        pro_share=args.pro_share, password=args.password, seed=args.seed, batch_size=args.batch_size,
+    )
+    db.close()
+    elapsed = time.perf_counter() - started
+    for table, count in counts.items():
+        print(f"{table + ':':<20} {count:>10,}")
+    print(f"time: {elapsed:.1f}s ({sum(counts.values()) / elapsed:,.0f} rows/s)")
+    print(f"accounts: user0..user{args.users - 1}@{EMAIL_DOMAIN}, {ADMIN_EMAIL} (password {args.password!r})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+"""
+Replay a weighted mix of API traffic against a running server and report latency per route.
+
+Logs in `--concurrency` virtual users from the generate_dataset accounts (plus
+the admin), then each one loops until `--duration` runs out. Every iteration
+picks a scenario by weight and issues the requests that page makes:
+
+- dashboard: plan, dashboard summary, skill list, categories
+- logging:   POST /api/logs page views / clicks, as the frontend tracker sends them
+- analytics: balance, calendar, time summary, one skill's freshness history, and
+             period comparison / personal records for PRO accounts
+- admin:     admin stats, activity log list and stats, user list (admin account)
+
+Latencies are grouped by route template (ids replaced by `{id}`). The report
+gives count, errors, p50/p95/p99 and the mean DB time from the Server-Timing
+header per route.
+
+Usage (from backend/, after `python -m benchmarks.generate_dataset --users 500`):
+    python -m benchmarks.load_test --base-url http://localhost:8000 --concurrency 20 --duration 60
+    python -m benchmarks.load_test --mix dashboard=2,logging=6,analytics=1,admin=1 --json report.json
+    python -m benchmarks.load_test --max-p95-ms 300    # exit 1 if any route's p95 is slower
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.generate_dataset import ADMIN_EMAIL, EMAIL_DOMAIN
+
+DEFAULT_MIX = {"dashboard": 40, "logging": 40, "analytics": 15, "admin": 5}
+_DB_TIMING_RE = re.compile(r"db;dur=([\d.]+)")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.db_ms: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, seconds: float, response: Optional[httpx.Response]) -> None:
+        self.latencies[route].append(seconds * 1000)
+        if response is None or response.status_code >= 400:
+            self.errors[route] += 1
+        if response is not None:
+            match = _DB_TIMING_RE.search(response.headers.get("server-timing", ""))
+            if match:
+                self.db_ms[route].append(float(match.group(1)))
+
+    def report(self, elapsed: float) -> List[dict]:
+        rows = []
+        for route, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            db = self.db_ms.get(route)
+            rows.append({
+                "route": route,
+                "count": len(values),
+                "errors": self.errors.get(route, 0),
+                "rps": round(len(values) / elapsed, 1),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "p99_ms": round(percentile(values, 99), 1),
+                "db_mean_ms": round(sum(db) / len(db), 1) if db else None,
+            })
+        return rows
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, token: str, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.rng = rng
+        self.session_id = f"loadtest-{rng.getrandbits(64):016x}"
+        self.skill_ids: List[str] = []
+        self.is_pro = False
+
+    async def request(self, method: str, path: str, route: Optional[str] = None, **kwargs):
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await self.client.request(method, path, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            pass
+        self.recorder.record(f"{method} {route or path}", time.perf_counter() - started, response)
+        return response
+
+    async def dashboard(self):
+        response = await self.request("GET", "/api/billing/me")
+        if response is not None and response.status_code == 200:
+            self.is_pro = response.json()["is_pro"]
+        await self.request("GET", "/api/analytics/dashboard")
+        response = await self.request("GET", "/api/skills")
+        if response is not None and response.status_code == 200:
+            self.skill_ids = [skill["id"] for skill in response.json()]
+        await self.request("GET", "/api/categories")
+
+    async def logging(self):
+        for _ in range(self.rng.randint(1, 4)):
+            await self.request("POST", "/api/logs", json={
+                "session_id": self.session_id,
+                "action_type": self.rng.choice(["page_view", "page_view", "click"]),
+                "page": self.rng.choice(["/dashboard", "/skills", "/analytics", "/calendar"]),
+            })
+
+    async def analytics(self):
+        await self.request("GET", "/api/analytics/balance", params={"period": self.rng.choice(["week", "month", "quarter"])})
+        await self.request("GET", "/api/analytics/calendar")
+        await self.request("GET", "/api/analytics/time-summary")
+        if self.skill_ids:
+            skill_id = self.rng.choice(self.skill_ids)
+            await self.request("GET", f"/api/analytics/skills/{skill_id}/freshness-history",
+                               route="/api/analytics/skills/{id}/freshness-history")
+        if self.is_pro:
+            await self.request("GET", "/api/analytics/period-comparison")
+            if self.skill_ids:
+                await self.request("GET", f"/api/analytics/skills/{skill_id}/personal-records",
+                                   route="/api/analytics/skills/{id}/personal-records")
+
+    async def admin(self):
+        await self.request("GET", "/api/admin/stats")
+        await self.request("GET", "/api/admin/logs", params={"page": self.rng.randint(1, 20)})
+        await self.request("GET", "/api/admin/logs/stats")
+        await self.request("GET", "/api/admin/users")
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _run_user(user: VirtualUser, admin: VirtualUser, mix: Dict[str, int], deadline: float):
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    await user.dashboard()  # learn the skill ids, like opening the app does
+    while time.perf_counter() < deadline:
+        scenario = user.rng.choices(names, weights)[0]
+        if scenario == "admin":
+            await admin.admin()
+        else:
+            await getattr(user, scenario)()
+
+
+async def run(base_url: str, concurrency: int, duration: float, accounts: int, password: str,
+              mix: Dict[str, int], seed: int) -> dict:
+    rng = random.Random(seed)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=concurrency + 1, max_keepalive_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        emails = [f"user{rng.randrange(accounts)}@{EMAIL_DOMAIN}" for _ in range(concurrency)]
+        tokens = await asyncio.gather(*(_login(client, email, password) for email in emails))
+        admin_token = await _login(client, ADMIN_EMAIL, password)
+        users = [VirtualUser(client, recorder, token, random.Random(rng.random())) for token in tokens]
+        admins = [VirtualUser(client, recorder, admin_token, user.rng) for user in users]
+
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(_run_user(user, admin, mix, deadline) for user, admin in zip(users, admins)))
+        elapsed = time.perf_counter() - started
+    return {"elapsed_seconds": round(elapsed, 1), "concurrency": concurrency, "routes": recorder.report(elapsed)}
+
+
+def parse_mix(raw: str) -> Dict[str, int]:
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r} (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = int(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds")
+    parser.add_argument("--accounts", type=int, default=100, help="--users passed to generate_dataset")
+    parser.add_argument("--password", default="loadtest")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help="scenario weights, e.g. dashboard=4,logging=4")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="also write the report to this file")
+    parser.add_argument("--max-p95-ms", type=float, default=None, help="exit 1 if any route's p95 is slower")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.base_url, args.concurrency, args.duration, args.accounts,
+                             args.password, args.mix, args.seed))
+    rows = result["routes"]
+    total = sum(row["count"] for row in rows)
+    print(f"{total:,} requests in {result['elapsed_seconds']}s ({total / result['elapsed_seconds']:,.0f} req/s), "
+          f"{args.concurrency} virtual users")
+    print(f"{'route':<58} {'count':>7} {'err':>5} {'p50':>8} {'p95':>8} {'p99':>8} {'db':>7}")
+    for row in rows:
+        db = f"{row['db_mean_ms']:.1f}" if row["db_mean_ms"] is not None else "-"
+        print(f"{row['route']:<58} {row['count']:>7} {row['errors']:>5} "
+              f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {db:>7}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+
+    if args.max_p95_ms is not None:
+        slow = [row["route"] for row in rows if row["p95_ms"] > args.max_p95_ms]
+        if slow:
+            print(f"FAIL: p95 over {args.max_p95_ms}ms: {', '.join(slow)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
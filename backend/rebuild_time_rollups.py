@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Rebuild the per-skill monthly time rollups from the learning/practice events.
+
+The event write paths keep `skill_month_rollups` in step; run this to repair
+drift (rows written outside the app, a restored backup) or to check for it.
+Users are rebuilt one at a time, each in its own transaction.
+
+Options:
+    --user EMAIL    rebuild only this user
+    --check         report users whose rollups differ, without changing anything
+"""
+
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services.time_rollups import rebuild, rollup_drift
+
+
+def main():
+    """Rebuild (or check) the time rollups of every user, or of one."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user", help="email of a single user")
+    parser.add_argument("--check", action="store_true")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        query = db.query(User.id, User.email).order_by(User.email)
+        if args.user:
+            query = query.filter(User.email == args.user)
+        users = query.all()
+        if args.user and not users:
+            print(f"No user with email {args.user}")
+            sys.exit(1)
+
+        drifted = 0
+        rows = 0
+        for user_id, email in users:
+            if args.check:
+                if rollup_drift(db, user_id):
+                    drifted += 1
+                    print(f"Drift: {email}")
+                continue
+            rows += rebuild(db, user_id)
+            db.commit()
+
+        if args.check:
+            print(f"{drifted} of {len(users)} user(s) have drifted rollups")
+            sys.exit(1 if drifted else 0)
+        print(f"Rebuilt {rows} rollup row(s) for {len(users)} user(s)")
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding time rollups: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+"""
+Deleted account purge script.
+
+Account deletion only soft-deletes the user and purges their data in the
+background after the response. If a worker died mid-purge the account is left
+soft-deleted; this finishes every such purge. Run it via cron once a day.
+Example crontab entry:
+30 3 * * * cd /path/to/backend && /path/to/venv/bin/python run_account_purge.py
+
+Options:
+    --batch-size N    rows deleted per transaction (default 5000)
+"""
+
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.core.database import SessionLocal
+from app.services.account_purge import BATCH_SIZE, purge_deleted_accounts
+
+
+def main():
+    """Main function to purge soft-deleted accounts."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+
+    print("Starting deleted account purge...")
+
+    db = SessionLocal()
+    try:
+        purged = purge_deleted_accounts(db, batch_size=args.batch_size)
+        print(f"Purged {purged} deleted account(s)")
+    except Exception as e:
+        print(f"Error during deleted account purge: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Activity log maintenance script.
+
+Rolls up the last complete hours of activity logs for /api/admin/logs/stats,
+creates the monthly `activity_logs` partitions for the coming months and drops
+months older than ACTIVITY_LOG_RETENTION_MONTHS, then resumes bulk delete jobs a
+restart left stalled. Run it via cron every hour so the un-rolled tail the stats
+endpoint scans stays small.
+Example crontab entry:
+5 * * * * cd /path/to/backend && /path/to/venv/bin/python run_log_maintenance.py
+
+Options:
+    --dry-run               report what would change without changing anything
+    --retention-months N    override ACTIVITY_LOG_RETENTION_MONTHS (0 keeps everything)
+    --stalled-minutes N     resume delete jobs with no progress for N minutes (default 15)
+"""
+
+import argparse
+import sys
+import os
+from datetime import timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.core.database import SessionLocal
+from app.services.log_partitions import run_maintenance
+from app.services.log_purge import STALLED_AFTER, resume_stalled_jobs
+from app.services.log_rollups import rollup_logs
+
+
+def main():
+    """Main function to maintain activity log partitions."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--retention-months", type=int, default=None)
+    parser.add_argument("--stalled-minutes", type=int, default=int(STALLED_AFTER.total_seconds() // 60))
+    args = parser.parse_args()
+
+    print("Starting activity log maintenance...")
+
+    db = SessionLocal()
+    try:
+        if not args.dry_run:
+            hours = rollup_logs(db)
+            print(f"Rolled up {hours} hour(s) of activity logs")
+        report = run_maintenance(db, retention_months=args.retention_months, dry_run=args.dry_run)
+        prefix = "[dry run] " if args.dry_run else ""
+        print(f"{prefix}Retention cutoff: {report['cutoff'] or 'disabled'}")
+        if report["partitioned"]:
+            print(f"{prefix}Created partitions: {', '.join(report['created_partitions']) or 'none'}")
+            print(f"{prefix}Dropped partitions: {', '.join(report['dropped_partitions']) or 'none'}")
+            print(f"{prefix}Deleted {report['deleted_rows']} expired rows from the default partition")
+        else:
+            print(f"{prefix}Table is not partitioned; deleted {report['deleted_rows']} expired rows")
+        if not args.dry_run:
+            resumed = resume_stalled_jobs(db, stalled_after=timedelta(minutes=args.stalled_minutes))
+            print(f"Resumed {resumed} stalled bulk delete job(s)")
+        print("Activity log maintenance completed successfully")
+    except Exception as e:
+        print(f"Error during activity log maintenance: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,21 @@ unchanged in tests.
 """
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from app.core.config import settings
 from app.core.database import Base, get_db
 from app.main import app
+from app.services.log_dimensions import reset_caches
+from app.services.personal_records import reset_cache as reset_personal_records_cache
+
+# TestClient runs the startup handlers; keep the payment reconcile loop (which opens
+# app.core.database sessions) off. Tests call reconcile_pending directly.
+settings.PAYMENT_RECONCILE_INTERVAL_SECONDS = 0
 
 
 @compiles(UUID, "sqlite")
@@ -33,6 +40,8 @@ def db_session():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
+    # As in app.core.database: deletes rely on the ON DELETE rules, which SQLite skips unless asked
+    event.listen(engine, "connect", lambda dbapi_connection, _record: dbapi_connection.execute("PRAGMA foreign_keys=ON"))
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
     session = Session()
@@ -45,13 +54,26 @@ def db_session():
 
 @pytest.fixture()
 def client(db_session):
+    # A session per request, configured like app.core.database.SessionLocal, on the
+    # test database's single connection (so it sees everything db_session committed).
+    RequestSession = sessionmaker(bind=db_session.get_bind(), autoflush=False, autocommit=False, expire_on_commit=False)
+
     def _override_get_db():
+        db = RequestSession()
         try:
-            yield db_session
+            yield db
         finally:
-            pass
+            db.close()
 
     app.dependency_overrides[get_db] = _override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_in_process_caches():
+    """Each test gets a fresh database, so in-process caches must start empty."""
+    reset_caches()
+    reset_personal_records_cache()
+    yield
@@ -0,0 +1,189 @@
+"""Tests for account soft delete and the background purge (services/account_purge.py)."""
+from datetime import date, datetime
+
+import pytest
+
+from app.core.instrumentation import install_query_hooks
+from app.core.security import create_access_token, create_calendar_feed_token, get_password_hash
+from app.models.activity_log import ActivityLog
+from app.models.category import Category
+from app.models.event import Event, LearningEvent, PracticeEvent
+from app.models.event_template import EventTemplate
+from app.models.skill import Skill, skill_dependencies
+from app.models.skill_month_rollup import SkillMonthRollup
+from app.models.subscription import Subscription
+from app.models.ticket import Ticket, TicketReply
+from app.models.user import User
+from app.routers import settings as settings_router
+from app.services import account_purge
+
+
+@pytest.fixture()
+def job_session(db_session, monkeypatch):
+    """Run background purges against the test database."""
+    monkeypatch.setattr(account_purge, "SessionLocal", lambda: db_session)
+    return db_session
+
+
+def _user(db, email="user@example.com", is_admin=False):
+    u = User(email=email, password_hash=get_password_hash("p"), is_admin=is_admin)
+    db.add(u)
+    db.commit()
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _seed(db, user, events=12):
+    category = Category(user_id=user.id, name="Cat")
+    db.add(category)
+    db.commit()
+    python, sql = Skill(user_id=user.id, name="Python", category_id=category.id), Skill(user_id=user.id, name="SQL")
+    db.add_all([python, sql])
+    db.commit()
+    python.dependencies.append(sql)
+    ticket = Ticket(user_id=user.id, subject="s", message="m")
+    db.add_all([
+        *[LearningEvent(skill_id=python.id, user_id=user.id, date=date(2026, 1, 1 + i), type="reading")
+          for i in range(events // 2)],
+        *[PracticeEvent(skill_id=sql.id, user_id=user.id, date=date(2026, 1, 1 + i), type="work")
+          for i in range(events // 2)],
+        SkillMonthRollup(skill_id=python.id, user_id=user.id, month=date(2026, 1, 1),
+                         first_day=date(2026, 1, 1), last_day=date(2026, 1, 6)),
+        EventTemplate(user_id=user.id, name="T", event_type="learning", type="reading"),
+        Subscription(user_id=user.id, plan="lifetime", status="active", provider="manual"),
+        ActivityLog(user_id=user.id, session_id="s", action_type="page_view", created_at=datetime(2026, 1, 1)),
+        ticket,
+    ])
+    db.commit()
+    db.add(TicketReply(ticket_id=ticket.id, user_id=user.id, message="r"))
+    db.commit()
+
+
+def _owned_rows(db, user_id):
+    models = (Category, Skill, Event, SkillMonthRollup, EventTemplate, Subscription, Ticket, TicketReply)
+    counts = {model.__tablename__: db.query(model).filter(model.user_id == user_id).count() for model in models}
+    counts["skill_dependencies"] = (
+        db.query(skill_dependencies).join(Skill, Skill.id == skill_dependencies.c.skill_id)
+        .filter(Skill.user_id == user_id).count()
+    )
+    counts["activity_logs"] = db.query(ActivityLog).filter(ActivityLog.user_id == user_id).count()
+    return {table: count for table, count in counts.items() if count}
+
+
+class TestDeleteAccount:
+    def test_soft_deletes_then_purges_everything(self, client, job_session):
+        user = _user(job_session)
+        _seed(job_session, user)
+        user_id = user.id
+
+        r = client.delete("/api/settings/account", headers=_auth("user@example.com"))
+        assert r.status_code == 200
+        assert r.json() == {"message": "Account successfully deleted"}
+
+        job_session.expire_all()
+        assert job_session.get(User, user_id) is None
+        assert _owned_rows(job_session, user_id) == {}
+        # Logs outlive the account, anonymised
+        assert job_session.query(ActivityLog).filter(ActivityLog.user_id.is_(None)).count() == 1
+
+    def test_token_and_email_released_at_request_time(self, client, db_session, monkeypatch):
+        scheduled = []
+        monkeypatch.setattr(settings_router, "run_account_purge", scheduled.append)
+        user = _user(db_session)
+        install_query_hooks(db_session.get_bind())
+        headers = _auth("user@example.com")
+
+        r = client.delete("/api/settings/account", headers=headers)
+        assert r.status_code == 200
+        assert 'desc="2 queries"' in r.headers["server-timing"]  # auth lookup + one UPDATE
+        assert scheduled == [user.id]
+
+        db_session.expire_all()
+        assert db_session.get(User, user.id).deleted_at is not None
+        assert client.get("/api/settings", headers=headers).status_code == 401
+        r = client.post("/api/auth/register", json={"email": "user@example.com", "password": "password123"})
+        assert r.status_code in (200, 201), r.text
+
+    def test_deleted_account_is_unreachable_before_the_purge(self, client, db_session, monkeypatch):
+        monkeypatch.setattr(settings_router, "run_account_purge", lambda user_id: None)
+        _user(db_session, "admin@example.com", is_admin=True)
+        user = _user(db_session)
+        _seed(db_session, user)  # lifetime PRO, so the feed is served while the account lives
+        feed = f"/api/analytics/calendar/feed/{create_calendar_feed_token(user.id, user.feed_token_version)}.ics"
+        assert client.get(feed).status_code == 200
+
+        assert client.delete("/api/settings/account", headers=_auth("user@example.com")).status_code == 200
+
+        admin = _auth("admin@example.com")
+        assert client.get(feed).status_code == 404
+        assert client.get(f"/api/admin/users/{user.id}", headers=admin).status_code == 404
+        assert client.get(f"/api/admin/users/{user.id}/details", headers=admin).status_code == 404
+        r = client.patch(f"/api/admin/users/{user.id}", headers=admin, json={"email": "user@example.com"})
+        assert r.status_code == 404
+        db_session.expire_all()
+        assert db_session.get(User, user.id).email.startswith("deleted-")
+
+
+class TestPurgeAccount:
+    def test_purges_in_batches(self, job_session):
+        user = _user(job_session)
+        _seed(job_session, user, events=20)
+        account_purge.soft_delete_user(job_session, user)
+        job_session.commit()
+        user_id = user.id
+
+        assert account_purge.purge_account(job_session, user_id, batch_size=3) is True
+        assert job_session.query(User).count() == 0
+        assert _owned_rows(job_session, user_id) == {}
+
+    def test_skips_live_accounts(self, job_session):
+        user = _user(job_session)
+        _seed(job_session, user)
+        assert account_purge.purge_account(job_session, user.id) is False
+        assert _owned_rows(job_session, user.id)["events"] == 12
+
+    def test_sweep_finishes_pending_purges(self, job_session):
+        gone, kept = _user(job_session, "gone@example.com"), _user(job_session, "kept@example.com")
+        _seed(job_session, gone)
+        _seed(job_session, kept)
+        account_purge.soft_delete_user(job_session, gone)
+        job_session.commit()
+        gone_id = gone.id
+
+        assert account_purge.purge_deleted_accounts(job_session, batch_size=4) == 1
+        assert _owned_rows(job_session, gone_id) == {}
+        assert job_session.get(User, kept.id) is not None
+        assert _owned_rows(job_session, kept.id)["events"] == 12
+
+
+class TestAdminDeletes:
+    def test_delete_user_purges_in_background(self, client, job_session):
+        _user(job_session, "admin@example.com", is_admin=True)
+        user = _user(job_session)
+        _seed(job_session, user)
+        user_id = user.id
+
+        r = client.delete(f"/api/admin/users/{user_id}", headers=_auth("admin@example.com"))
+        assert r.status_code == 204
+        job_session.expire_all()
+        assert job_session.get(User, user_id) is None
+        assert _owned_rows(job_session, user_id) == {}
+
+    def test_delete_skill_cascades_in_the_database(self, client, db_session):
+        admin = _user(db_session, "admin@example.com", is_admin=True)
+        _seed(db_session, admin)
+        python = db_session.query(Skill).filter(Skill.name == "Python").one()
+        install_query_hooks(db_session.get_bind())
+
+        r = client.delete(f"/api/admin/skills/{python.id}", headers=_auth("admin@example.com"))
+        assert r.status_code == 204
+        assert 'desc="2 queries"' in r.headers["server-timing"]  # auth lookup + one DELETE
+        rows = _owned_rows(db_session, admin.id)
+        assert (rows["skills"], rows["events"]) == (1, 6)
+        assert "skill_month_rollups" not in rows and "skill_dependencies" not in rows
+
+        r = client.delete(f"/api/admin/skills/{python.id}", headers=_auth("admin@example.com"))
+        assert r.status_code == 404
@@ -0,0 +1,36 @@
+"""Tests for the engine benchmark runner's baseline comparison (benchmarks/bench_engines.py)."""
+from benchmarks.bench_engines import compare, run
+
+
+def _result(ms):
+    return {"median_s": ms / 1000, "min_s": ms / 1000, "rounds": 3}
+
+
+def test_compare_flags_only_real_slowdowns():
+    baseline = {
+        "a/10ev/90d": _result(10),
+        "b/10ev/90d": _result(10),
+        "c/10ev/90d": _result(0.01),
+        "d/10ev/90d": _result(10),
+        "e/10ev/90d": {"skipped": "too slow"},
+    }
+    results = {
+        "a/10ev/90d": _result(14),              # within 50%
+        "b/10ev/90d": _result(30),              # 3x slower
+        "c/10ev/90d": _result(0.05),            # 5x, but below the noise floor
+        "d/10ev/90d": {"skipped": "too slow"},  # used to run
+        "e/10ev/90d": _result(5),               # now runs: improvement
+    }
+    regressions = compare(results, baseline, tolerance=0.5)
+    assert [line.split(":")[0] for line in regressions] == ["b/10ev/90d", "d/10ev/90d"]
+
+
+def test_run_small_matrix():
+    results = run(event_counts=[10], windows=[90], only=["freshness", "time_summary"], min_time=0)
+    assert set(results) == {"freshness/10ev/90d", "time_summary/10ev/90d"}
+    assert all(result["rounds"] >= 3 for result in results.values())
+
+
+def test_cases_past_budget_are_skipped():
+    results = run(event_counts=[10, 100], windows=[90], only=["freshness_history"], min_time=0, max_call_seconds=0)
+    assert results["freshness_history/100ev/90d"] == {"skipped": "too slow"}
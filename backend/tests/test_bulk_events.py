@@ -0,0 +1,95 @@
+"""Tests for PRO bulk event logging (POST /api/events/bulk)."""
+from app.core.security import create_access_token, get_password_hash
+from app.models.event import LearningEvent, PracticeEvent
+from app.models.skill import Skill
+from app.models.subscription import Subscription
+from app.models.user import User
+
+
+def _user(db, email="free@example.com"):
+    u = User(email=email, password_hash=get_password_hash("password123"))
+    db.add(u)
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _pro(db, email="pro@example.com"):
+    u = _user(db, email)
+    db.add(Subscription(user_id=u.id, plan="grandfathered", status="active", provider="manual"))
+    db.commit()
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _skill(db, user, name="s"):
+    s = Skill(user_id=user.id, name=name)
+    db.add(s)
+    db.commit()
+    db.refresh(s)
+    return s
+
+
+class TestBulkEvents:
+    def test_402_for_free(self, client, db_session):
+        u = _user(db_session)
+        s = _skill(db_session, u)
+        r = client.post("/api/events/bulk", headers=_auth(u.email), json={"events": [
+            {"skill_id": str(s.id), "event_type": "learning", "date": "2026-01-01", "type": "reading"},
+        ]})
+        assert r.status_code == 402
+
+    def test_inserts_across_skills_and_kinds(self, client, db_session):
+        u = _pro(db_session)
+        a = _skill(db_session, u, "a")
+        b = _skill(db_session, u, "b")
+        events = [
+            {"skill_id": str(a.id), "event_type": "learning", "date": f"2026-01-{d:02d}", "type": "reading"}
+            for d in range(1, 21)
+        ] + [
+            {"skill_id": str(b.id), "event_type": "practice", "date": "2026-02-01", "type": "project",
+             "duration_minutes": 45, "notes": "backfill"},
+        ]
+        r = client.post("/api/events/bulk", headers=_auth(u.email), json={"events": events})
+        assert r.status_code == 200
+        body = r.json()
+        assert body["created"] == 21
+        assert body["failed"] == 0
+        assert [res["index"] for res in body["results"]] == list(range(21))
+        assert db_session.query(LearningEvent).filter(LearningEvent.skill_id == a.id).count() == 20
+        practice = db_session.query(PracticeEvent).one()
+        assert str(practice.id) == body["results"][-1]["id"]
+        assert practice.duration_minutes == 45
+        assert practice.user_id == u.id
+
+    def test_reports_per_item_errors(self, client, db_session):
+        u = _pro(db_session)
+        s = _skill(db_session, u)
+        other = _skill(db_session, _user(db_session, "other@example.com"), "theirs")
+        events = [
+            {"skill_id": str(s.id), "event_type": "learning", "date": "2026-01-01", "type": "reading"},
+            {"skill_id": str(s.id), "event_type": "learning", "date": "2026-01-01", "type": "project"},
+            {"skill_id": str(other.id), "event_type": "practice", "date": "2026-01-01", "type": "project"},
+            {"skill_id": str(s.id), "event_type": "sleeping", "date": "2026-01-01", "type": "reading"},
+            {"skill_id": str(s.id), "event_type": "practice", "date": "2026-01-01", "type": "work",
+             "duration_minutes": 0},
+        ]
+        body = client.post("/api/events/bulk", headers=_auth(u.email), json={"events": events}).json()
+        assert body["created"] == 1
+        assert body["failed"] == 4
+        statuses = [res["status"] for res in body["results"]]
+        assert statuses == ["created", "error", "error", "error", "error"]
+        assert body["results"][1]["error"].startswith("type:")
+        assert body["results"][2]["error"] == "Skill not found"
+        assert body["results"][4]["error"].startswith("duration_minutes:")
+        assert db_session.query(PracticeEvent).count() == 0
+
+    def test_rejects_oversized_batch(self, client, db_session):
+        u = _pro(db_session)
+        s = _skill(db_session, u)
+        item = {"skill_id": str(s.id), "event_type": "learning", "date": "2026-01-01", "type": "reading"}
+        r = client.post("/api/events/bulk", headers=_auth(u.email), json={"events": [item] * 501})
+        assert r.status_code == 422
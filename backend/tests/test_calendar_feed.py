@@ -0,0 +1,200 @@
+"""Tests for the PRO iCalendar feed (services/calendar_feed.py + analytics endpoints)."""
+import hashlib
+import hmac
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.core.security import (
+    create_access_token,
+    create_calendar_feed_token,
+    decode_calendar_feed_token,
+    get_password_hash,
+    verify_calendar_feed_token,
+)
+from app.models.event import LearningEvent, PracticeEvent
+from app.models.skill import Skill
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.calendar_feed import _fold
+
+
+def _user(db, email="free@example.com"):
+    u = User(email=email, password_hash=get_password_hash("password123"))
+    db.add(u)
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _pro(db, email="pro@example.com"):
+    u = _user(db, email)
+    db.add(Subscription(user_id=u.id, plan="grandfathered", status="active", provider="manual"))
+    db.commit()
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _seed(db, user):
+    s = Skill(user_id=user.id, name="Python")
+    db.add(s)
+    db.commit()
+    db.refresh(s)
+    recent = date.today() - timedelta(days=3)
+    db.add_all([
+        LearningEvent(skill_id=s.id, user_id=user.id, date=recent, type="reading", notes="ch. 1, intro; basics"),
+        PracticeEvent(skill_id=s.id, user_id=user.id, date=recent, type="project", duration_minutes=45),
+        LearningEvent(skill_id=s.id, user_id=user.id, date=date.today() - timedelta(days=800), type="video"),
+    ])
+    db.commit()
+    return s
+
+
+def _feed_path(user):
+    return f"/api/analytics/calendar/feed/{create_calendar_feed_token(user.id, user.feed_token_version)}.ics"
+
+
+class TestFeedToken:
+    def test_round_trip(self, db_session):
+        u = _user(db_session)
+        token = create_calendar_feed_token(u.id, 0)
+        assert decode_calendar_feed_token(token) == u.id
+        assert verify_calendar_feed_token(token, u.id, 0)
+
+    def test_tampered_token_rejected(self, db_session):
+        u = _user(db_session)
+        token = create_calendar_feed_token(u.id, 0)
+        assert not verify_calendar_feed_token(token[:-1] + ("0" if token[-1] != "0" else "1"), u.id, 0)
+        assert decode_calendar_feed_token("not-a-token") is None
+
+    def test_urls_issued_before_versioning_still_work(self, db_session):
+        u = _user(db_session)
+        message = f"calendar-feed:{u.id.hex}".encode("utf-8")
+        legacy = u.id.hex + hmac.new(settings.SECRET_KEY.encode("utf-8"), message, hashlib.sha256).hexdigest()[:32]
+        assert verify_calendar_feed_token(legacy, u.id, 0)
+
+    def test_other_version_rejected(self, db_session):
+        u = _user(db_session)
+        assert not verify_calendar_feed_token(create_calendar_feed_token(u.id, 0), u.id, 1)
+
+
+class TestFeed:
+    def test_feed_url_requires_pro(self, client, db_session):
+        u = _user(db_session)
+        assert client.get("/api/analytics/calendar/feed-url", headers=_auth(u.email)).status_code == 402
+
+    def test_feed_url_for_pro(self, client, db_session):
+        u = _pro(db_session)
+        r = client.get("/api/analytics/calendar/feed-url", headers=_auth(u.email))
+        assert r.json()["url"].endswith(_feed_path(u))
+
+    def test_free_user_feed_is_402(self, client, db_session):
+        u = _user(db_session)
+        assert client.get(_feed_path(u)).status_code == 402
+
+    def test_unknown_token_is_404(self, client):
+        assert client.get("/api/analytics/calendar/feed/" + "0" * 64 + ".ics").status_code == 404
+
+    def test_forged_signature_is_404(self, client, db_session):
+        u = _pro(db_session)
+        assert client.get(f"/api/analytics/calendar/feed/{u.id.hex}{'0' * 32}.ics").status_code == 404
+
+    def test_regenerate_revokes_the_old_url(self, client, db_session):
+        u = _pro(db_session)
+        headers = _auth(u.email)
+        old_url = client.get("/api/analytics/calendar/feed-url", headers=headers).json()["url"]
+        old_path = old_url[old_url.index("/api/"):]
+        assert client.get(old_path).status_code == 200
+
+        r = client.post("/api/analytics/calendar/feed-url/regenerate", headers=headers)
+        assert r.status_code == 200
+        new_url = r.json()["url"]
+        assert new_url != old_url
+        assert client.get("/api/analytics/calendar/feed-url", headers=headers).json()["url"] == new_url
+        assert client.get(old_path).status_code == 404
+        assert client.get(new_url[new_url.index("/api/"):]).status_code == 200
+
+    def test_renders_events_in_window(self, client, db_session):
+        u = _pro(db_session)
+        _seed(db_session, u)
+        r = client.get(_feed_path(u))
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/calendar")
+        body = r.text
+        assert body.startswith("BEGIN:VCALENDAR\r\n")
+        assert body.endswith("END:VCALENDAR\r\n")
+        # The 800-day-old event falls outside the default one-year window.
+        assert body.count("BEGIN:VEVENT") == 2
+        assert "SUMMARY:Learning: Python (reading)" in body
+        assert "DESCRIPTION:ch. 1\\, intro\\; basics" in body
+        assert "DESCRIPTION:45 min" in body
+
+    def test_since_widens_window(self, client, db_session):
+        u = _pro(db_session)
+        _seed(db_session, u)
+        since = (date.today() - timedelta(days=1000)).isoformat()
+        assert client.get(_feed_path(u), params={"since": since}).text.count("BEGIN:VEVENT") == 3
+
+
+class TestConditionalGet:
+    def test_etag_round_trip_gives_304(self, client, db_session):
+        u = _pro(db_session)
+        _seed(db_session, u)
+        first = client.get(_feed_path(u))
+        etag = first.headers["etag"]
+        again = client.get(_feed_path(u), headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+        assert again.content == b""
+
+    def test_if_modified_since_alone_never_gives_304(self, client, db_session):
+        u = _pro(db_session)
+        _seed(db_session, u)
+        path = _feed_path(u)
+        last_modified = client.get(path).headers["last-modified"]
+        # A delete leaves max(updated_at), and so Last-Modified, where it was.
+        db_session.delete(db_session.query(PracticeEvent).first())
+        db_session.commit()
+        r = client.get(path, headers={"If-Modified-Since": last_modified})
+        assert r.headers["last-modified"] == last_modified
+        assert r.status_code == 200
+        assert r.text.count("BEGIN:VEVENT") == 1
+
+    def test_event_write_changes_etag(self, client, db_session):
+        u = _pro(db_session)
+        skill_id, user_id = _seed(db_session, u).id, u.id
+        path = _feed_path(u)
+        etag = client.get(path).headers["etag"]
+        db_session.add(PracticeEvent(skill_id=skill_id, user_id=user_id, date=date.today(), type="work"))
+        db_session.commit()
+        r = client.get(path, headers={"If-None-Match": etag})
+        assert r.status_code == 200
+        assert r.headers["etag"] != etag
+
+    def test_event_delete_changes_etag(self, client, db_session):
+        u = _pro(db_session)
+        _seed(db_session, u)
+        path = _feed_path(u)
+        etag = client.get(path).headers["etag"]
+        db_session.delete(db_session.query(PracticeEvent).first())
+        db_session.commit()
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 200
+
+    def test_skill_rename_changes_etag(self, client, db_session):
+        u = _pro(db_session)
+        _seed(db_session, u)
+        path = _feed_path(u)
+        etag = client.get(path).headers["etag"]
+        db_session.query(Skill).one().name = "Python 3"
+        db_session.commit()
+        assert client.get(path, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_fold_long_lines():
+    folded = _fold("DESCRIPTION:" + "é" * 80)
+    lines = folded.split("\r\n")
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert all(line.startswith(" ") for line in lines[1:-1])
+    assert "".join(line[1:] if i else line for i, line in enumerate(lines)) == "DESCRIPTION:" + "é" * 80
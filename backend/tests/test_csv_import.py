@@ -0,0 +1,141 @@
+"""Tests for the PRO CSV event import (POST /api/events/import + services/csv_import.py)."""
+import io
+from datetime import date
+
+import pytest
+
+from app.core.security import create_access_token, get_password_hash
+from app.models.category import Category
+from app.models.event import LearningEvent, PracticeEvent
+from app.models.skill import Skill
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services import csv_import
+from app.services.csv_import import CsvImportError, import_events_csv
+
+
+def _user(db, email="free@example.com"):
+    u = User(email=email, password_hash=get_password_hash("password123"))
+    db.add(u)
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _pro(db, email="pro@example.com"):
+    u = _user(db, email)
+    db.add(Subscription(user_id=u.id, plan="grandfathered", status="active", provider="manual"))
+    db.commit()
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _upload(text: str):
+    return {"file": ("history.csv", text.encode("utf-8"), "text/csv")}
+
+
+CSV = """Skill,Category,Event_Type,Date,Type,Duration_Minutes,Notes
+Python,Backend,learning,2025-03-01,reading,30,chapter 1
+Python,Backend,practice,2025-03-04,project,,"multi, comma"
+Rust,,learning,2025-04-01,video,45,
+"""
+
+
+class TestImportService:
+    def test_creates_skills_categories_and_events(self, db_session):
+        u = _pro(db_session)
+        report = import_events_csv(db_session, u, io.StringIO(CSV))
+        db_session.commit()
+        assert report["imported"] == 3
+        assert report["failed"] == 0
+        assert report["skills_created"] == 2
+        assert report["categories_created"] == 1
+        python = db_session.query(Skill).filter(Skill.name == "Python").one()
+        assert python.category_obj.name == "Backend"
+        # New skills are backdated to their first imported event.
+        assert python.created_at.date() == date(2025, 3, 1)
+        practice = db_session.query(PracticeEvent).one()
+        assert practice.notes == "multi, comma"
+        assert practice.duration_minutes is None
+        assert db_session.query(LearningEvent).count() == 2
+
+    def test_reuses_existing_skill_and_keeps_its_category(self, db_session):
+        u = _pro(db_session)
+        existing = Skill(user_id=u.id, name="Python")
+        db_session.add(existing)
+        db_session.commit()
+        report = import_events_csv(db_session, u, io.StringIO(CSV))
+        assert report["skills_created"] == 1
+        db_session.refresh(existing)
+        assert existing.category_id is None
+        assert db_session.query(LearningEvent).filter(LearningEvent.skill_id == existing.id).count() == 1
+
+    def test_row_errors_reported_with_line_numbers(self, db_session):
+        u = _pro(db_session)
+        text = (
+            "skill,event_type,date,type,duration_minutes\n"
+            "Python,learning,2025-03-01,reading,30\n"
+            ",learning,2025-03-01,reading,\n"
+            "Python,watching,2025-03-01,reading,\n"
+            "Python,practice,2025-13-01,project,\n"
+            "Python,practice,2025-03-01,reading,\n"
+            "Python,practice,2025-03-01,project,-5\n"
+        )
+        report = import_events_csv(db_session, u, io.StringIO(text))
+        assert report["imported"] == 1
+        assert report["failed"] == 5
+        assert [e["row"] for e in report["errors"]] == [3, 4, 5, 6, 7]
+        assert report["errors"][0]["error"] == "skill: required"
+        assert report["errors"][2]["error"].startswith("date:")
+        assert report["errors"][3]["error"].startswith("type:")
+
+    def test_processes_in_chunks_with_one_cache(self, db_session, monkeypatch):
+        monkeypatch.setattr(csv_import, "CHUNK_ROWS", 2)
+        monkeypatch.setattr(csv_import, "MAX_REPORTED_ERRORS", 1)
+        u = _pro(db_session)
+        rows = "".join(f"S{i % 3},practice,2025-01-{i + 1:02d},work\n" for i in range(9))
+        report = import_events_csv(db_session, u, io.StringIO(
+            "skill,event_type,date,type\n" + rows + "S0,bad,2025-01-01,work\nS0,bad,2025-01-01,work\n"
+        ))
+        assert report["imported"] == 9
+        assert report["skills_created"] == 3
+        assert db_session.query(Skill).count() == 3
+        assert report["failed"] == 2
+        assert len(report["errors"]) == 1
+        assert report["errors_truncated"] is True
+
+    def test_missing_columns_rejected(self, db_session):
+        u = _pro(db_session)
+        with pytest.raises(CsvImportError, match="event_type"):
+            import_events_csv(db_session, u, io.StringIO("skill,date,type\nPython,2025-01-01,reading\n"))
+
+
+class TestImportEndpoint:
+    def test_402_for_free(self, client, db_session):
+        u = _user(db_session)
+        r = client.post("/api/events/import", headers=_auth(u.email), files=_upload(CSV))
+        assert r.status_code == 402
+
+    def test_imports_and_commits(self, client, db_session):
+        u = _pro(db_session)
+        r = client.post("/api/events/import", headers=_auth(u.email), files=_upload("﻿" + CSV))
+        assert r.status_code == 200
+        assert r.json()["imported"] == 3
+        assert db_session.query(Category).count() == 1
+
+    def test_bad_header_is_400(self, client, db_session):
+        u = _pro(db_session)
+        r = client.post("/api/events/import", headers=_auth(u.email), files=_upload("a,b\n1,2\n"))
+        assert r.status_code == 400
+        assert "Missing required column" in r.json()["detail"]
+
+    def test_non_utf8_is_400_and_imports_nothing(self, client, db_session):
+        u = _pro(db_session)
+        body = CSV.encode("utf-8") + b"Caf\xe9,,learning,2025-01-01,reading,,\n"
+        r = client.post("/api/events/import", headers=_auth(u.email),
+                        files={"file": ("h.csv", body, "text/csv")})
+        assert r.status_code == 400
+        assert db_session.query(Skill).count() == 0
@@ -0,0 +1,85 @@
+"""Tests for the unified `events` table (app/models/event.py).
+
+Learning and practice events share one table; the subclasses must only ever see
+their own kind, and the single-query analytics paths must split counts by kind.
+"""
+from datetime import date
+
+from app.core.security import create_access_token, get_password_hash
+from app.models.event import Event, LearningEvent, PracticeEvent
+from app.models.skill import Skill
+from app.models.subscription import Subscription
+from app.models.user import User
+
+
+def _user(db, email="k@example.com"):
+    u = User(email=email, password_hash=get_password_hash("password123"))
+    db.add(u)
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _skill(db, user, name="Python"):
+    s = Skill(user_id=user.id, name=name)
+    db.add(s)
+    db.commit()
+    db.refresh(s)
+    return s
+
+
+class TestKinds:
+    def test_subclasses_only_see_their_kind(self, db_session):
+        u = _user(db_session)
+        s = _skill(db_session, u)
+        db_session.add_all([
+            LearningEvent(skill_id=s.id, user_id=u.id, date=date(2026, 1, 1), type="reading"),
+            LearningEvent(skill_id=s.id, user_id=u.id, date=date(2026, 1, 2), type="video"),
+            PracticeEvent(skill_id=s.id, user_id=u.id, date=date(2026, 1, 3), type="project"),
+        ])
+        db_session.commit()
+        assert sorted(kind for (kind,) in db_session.query(Event.kind)) == ["learning", "learning", "practice"]
+        assert db_session.query(LearningEvent).count() == 2
+        assert [e.type for e in db_session.query(PracticeEvent)] == ["project"]
+        db_session.expire_all()
+        assert (len(s.learning_events), len(s.practice_events)) == (2, 1)
+        assert all(isinstance(e, PracticeEvent) for e in db_session.query(Event).filter(Event.kind == "practice"))
+
+    def test_bulk_insert_writes_kind(self, client, db_session):
+        u = _user(db_session)
+        db_session.add(Subscription(user_id=u.id, plan="grandfathered", status="active", provider="manual"))
+        db_session.commit()
+        s = _skill(db_session, u)
+        events = [
+            {"skill_id": str(s.id), "event_type": "learning", "date": "2026-02-01", "type": "reading"},
+            {"skill_id": str(s.id), "event_type": "practice", "date": "2026-02-02", "type": "project"},
+        ]
+        r = client.post("/api/events/bulk", headers=_auth(u.email), json={"events": events})
+        assert r.status_code == 200, r.text
+        assert r.json()["created"] == 2
+        assert sorted(kind for (kind,) in db_session.query(Event.kind)) == ["learning", "practice"]
+
+
+class TestSingleQueryAnalytics:
+    def test_dashboard_and_calendar_split_by_kind(self, client, db_session):
+        u = _user(db_session)
+        s = _skill(db_session, u)
+        today = date.today()
+        db_session.add_all([
+            LearningEvent(skill_id=s.id, user_id=u.id, date=today, type="reading"),
+            LearningEvent(skill_id=s.id, user_id=u.id, date=today, type="video"),
+            PracticeEvent(skill_id=s.id, user_id=u.id, date=today, type="project"),
+        ])
+        db_session.commit()
+
+        dashboard = client.get("/api/analytics/dashboard", headers=_auth(u.email)).json()
+        assert (dashboard["learning_events_this_week"], dashboard["practice_events_this_week"]) == (2, 1)
+
+        calendar = client.get("/api/analytics/calendar", headers=_auth(u.email)).json()
+        day = calendar["events_by_date"][today.isoformat()]
+        assert [e["event_type"] for e in day] == ["learning", "learning", "practice"]
+        assert {e["skill_name"] for e in day} == {"Python"}
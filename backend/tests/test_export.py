@@ -0,0 +1,107 @@
+"""Tests for the streaming account export (GET /api/settings/export)."""
+import gzip
+import json
+from datetime import date
+
+from app.core.security import create_access_token, get_password_hash
+from app.models.category import Category
+from app.models.event import LearningEvent, PracticeEvent
+from app.models.skill import Skill
+from app.models.user import User
+from app.services import export as export_service
+
+
+def _user(db, email="export@example.com"):
+    u = User(email=email, password_hash=get_password_hash("password123"), settings={"theme": "dark"})
+    db.add(u)
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _seed(db, user):
+    cat = Category(user_id=user.id, name="Backend")
+    db.add(cat)
+    db.commit()
+    s1 = Skill(user_id=user.id, name="Python", category_id=cat.id)
+    s2 = Skill(user_id=user.id, name="SQL")
+    db.add_all([s1, s2])
+    db.commit()
+    db.add_all([
+        LearningEvent(skill_id=s1.id, user_id=user.id, date=date(2026, 1, 10), type="reading", duration_minutes=60),
+        PracticeEvent(skill_id=s1.id, user_id=user.id, date=date(2026, 1, 15), type="project", notes="café"),
+        LearningEvent(skill_id=s2.id, user_id=user.id, date=date(2026, 1, 20), type="video"),
+    ])
+    db.commit()
+    return s1, s2
+
+
+class TestJsonExport:
+    def test_document_shape(self, client, db_session):
+        u = _user(db_session)
+        _seed(db_session, u)
+        r = client.get("/api/settings/export", headers=_auth(u.email))
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("application/json")
+        doc = r.json()
+        assert doc["user"]["email"] == u.email
+        assert doc["user"]["settings"] == {"theme": "dark"}
+        by_name = {s["name"]: s for s in doc["skills"]}
+        assert by_name["Python"]["category"] == "Backend"
+        assert by_name["SQL"]["category"] is None
+        assert [e["type"] for e in by_name["Python"]["learning_events"]] == ["reading"]
+        assert by_name["Python"]["practice_events"][0]["notes"] == "café"
+        assert by_name["SQL"]["practice_events"] == []
+
+    def test_empty_account_is_valid_json(self, client, db_session):
+        u = _user(db_session)
+        r = client.get("/api/settings/export", headers=_auth(u.email))
+        assert r.json()["skills"] == []
+
+    def test_gzip_when_accepted(self, client, db_session):
+        u = _user(db_session)
+        _seed(db_session, u)
+        r = client.get("/api/settings/export", headers={**_auth(u.email), "Accept-Encoding": "gzip"})
+        assert r.headers["content-encoding"] == "gzip"
+        # httpx transparently decodes; the payload is still the same document.
+        assert len(r.json()["skills"]) == 2
+
+    def test_identity_when_gzip_not_accepted(self, client, db_session):
+        u = _user(db_session)
+        r = client.get("/api/settings/export", headers={**_auth(u.email), "Accept-Encoding": "identity"})
+        assert "content-encoding" not in r.headers
+
+
+class TestNdjsonExport:
+    def test_one_record_per_line(self, client, db_session):
+        u = _user(db_session)
+        s1, _ = _seed(db_session, u)
+        python_id = str(s1.id)
+        r = client.get("/api/settings/export?format=ndjson", headers=_auth(u.email))
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in r.text.splitlines()]
+        assert records[0]["record"] == "user"
+        kinds = [rec["record"] for rec in records]
+        assert kinds.count("skill") == 2
+        assert kinds.count("learning_event") == 2
+        assert kinds.count("practice_event") == 1
+        practice = next(rec for rec in records if rec["record"] == "practice_event")
+        assert practice["skill_id"] == python_id
+
+
+class TestStreaming:
+    def test_output_is_chunked(self, db_session, monkeypatch):
+        u = _user(db_session)
+        _seed(db_session, u)
+        monkeypatch.setattr(export_service, "CHUNK_SIZE", 16)
+        chunks = list(export_service.stream_export(db_session, u))
+        assert len(chunks) > 1
+        assert json.loads(b"".join(chunks))["user"]["id"] == str(u.id)
+
+    def test_gzip_chunks_round_trip(self):
+        payload = [b'{"a":', b"1}"]
+        assert gzip.decompress(b"".join(export_service.gzip_chunks(payload))) == b'{"a":1}'
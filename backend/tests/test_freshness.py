@@ -1,7 +1,11 @@
+import random
+
 import pytest
 from datetime import date, timedelta
 from app.services.freshness import (
     calculate_freshness,
+    calculate_freshness_history,
+    calculate_personal_records,
     get_freshness_indicator,
     check_practice_scarcity,
     calculate_balance_ratio,
@@ -86,3 +90,59 @@ def test_get_balance_interpretation():
     assert "Learning-focused" in get_balance_interpretation(0.3)
     assert "Balanced" in get_balance_interpretation(0.7)
     assert "Practice-dominant" in get_balance_interpretation(1.5)
+
+
+def _random_events(rng, created_at, span):
+    """Events scattered around the skill's lifetime, including before creation and same-day repeats."""
+    return [(created_at + timedelta(days=rng.randrange(-40, span + 1)), 'x') for _ in range(rng.randrange(0, 40))]
+
+
+def test_freshness_history_matches_per_day_definition():
+    """The sweep gives exactly calculate_freshness over the events up to each day."""
+    rng = random.Random(7)
+    today = date.today()
+    for _ in range(50):
+        span = rng.randrange(0, 200)
+        created_at = today - timedelta(days=span)
+        learning, practice = _random_events(rng, created_at, span), _random_events(rng, created_at, span)
+        expected = []
+        day = max(created_at, today - timedelta(days=90))
+        while day <= today:
+            expected.append((day, round(calculate_freshness(
+                created_at,
+                [e for e in learning if e[0] <= day],
+                [e for e in practice if e[0] <= day],
+                0.03,
+                today=day,
+            ), 2)))
+            day += timedelta(days=1)
+        assert calculate_freshness_history(created_at, learning, practice, 0.03, days=90) == expected
+
+
+def test_personal_records():
+    """Records on a hand-checked history."""
+    today = date(2026, 3, 31)
+    created_at = date(2026, 1, 1)
+    practice = [(date(2026, 1, 5), 'exercise'), (date(2026, 2, 20), 'project'), (date(2026, 3, 1), 'work')]
+    learning = [(date(2026, 2, 14), 'reading'), (date(2026, 2, 15), 'video'), (date(2026, 2, 15), 'video')]
+
+    records = calculate_personal_records(created_at, learning, practice, today=today)
+
+    assert records["most_active_week_start"] == "2026-02-14"
+    assert records["most_active_week_events"] == 4  # 14th, 15th twice, 20th
+    assert records["longest_gap_recovered_days"] == 46  # Jan 5 -> Feb 20
+    assert records["peak_freshness"] == 100.0
+    assert records["peak_freshness_date"] == "2026-01-01"
+    # Jan 1-22 decays below 70% 18 days after the Jan 5 practice; Feb 20-Mar 18 lasts longer
+    assert records["longest_fresh_streak_days"] == 27
+    assert records["longest_fresh_streak_start"] == "2026-02-20"
+    assert records["longest_fresh_streak_end"] == "2026-03-18"
+    assert records["total_learning_events"] == 3
+    assert records["total_practice_events"] == 3
+
+
+def test_personal_records_before_skill_exists():
+    records = calculate_personal_records(date.today() + timedelta(days=1), [], [])
+    assert records["peak_freshness"] == 0
+    assert records["peak_freshness_date"] is None
+    assert records["most_active_week_start"] is None
@@ -1,8 +1,14 @@
 """Tests for the gateway client that talks to the automakler hub."""
 import base64
 import hashlib
+import json
+import socket
+import threading
+import time
 from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
+import httpx
 import pytest
 
 from app.core import gateway
@@ -16,7 +22,6 @@ def _sign(secret: str, data: str) -> str:
 
 
 def _signed(payload: dict, secret: str):
-    import json
     data = base64.b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
     return data, _sign(secret, data)
 
@@ -43,82 +48,232 @@ class TestWebhookVerification:
         assert gateway.decode(data) == {"order_id": "skillfade_1", "status": "success"}
 
 
-class TestCreateCheckout:
-    def test_posts_to_hub_with_auth_and_returns_redirect(self, monkeypatch):
-        monkeypatch.setattr(settings, "GATEWAY_URL", "https://hub.test")
-        monkeypatch.setattr(settings, "GATEWAY_API_KEY", "key123")
-        captured = {}
-
-        class FakeResp:
-            is_error = False
+class _HubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real hub
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        hub = self.server.hub
+        hub.requests.append({
+            "method": self.command,
+            "path": self.path,
+            "headers": dict(self.headers),
+            "json": json.loads(self.rfile.read(length)) if length else None,
+            "client_port": self.client_address[1],
+        })
+        status, payload, delay, *headers = hub.replies.pop(0) if hub.replies else hub.default
+        time.sleep(delay)
+        raw = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            for name, value in (headers[0] if headers else {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(raw)))
+            self.end_headers()
+            self.wfile.write(raw)
+        except OSError:
+            pass  # the client gave up (read timeout)
+
+    do_GET = do_POST = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class MockHub:
+    """A local HTTP server standing in for the automakler hub.
+
+    `replies` is consumed one per request as (status, json or raw bytes, delay
+    seconds[, extra headers]); after that every request gets `default`.
+    """
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _HubHandler)
+        self.server.daemon_threads = True
+        self.server.hub = self
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.requests = []
+        self.replies = []
+        self.default = (200, {"order_id": "skillfade_x", "status": "success",
+                              "redirect_url": "https://epoint.az/pay/abc"}, 0)
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture()
+def hub(monkeypatch):
+    server = MockHub()
+    monkeypatch.setattr(settings, "GATEWAY_URL", server.url)
+    monkeypatch.setattr(settings, "GATEWAY_API_KEY", "key123")
+    monkeypatch.setattr(settings, "GATEWAY_READ_TIMEOUT", 0.3)
+    monkeypatch.setattr(settings, "GATEWAY_CONNECT_TIMEOUT", 0.3)
+    monkeypatch.setattr(settings, "GATEWAY_MAX_RETRIES", 1)
+    monkeypatch.setattr(gateway, "RETRY_BACKOFF", 0)
+    monkeypatch.setattr(gateway.breaker, "threshold", 3)
+    gateway.close_client()
+    gateway.breaker.reset()
+    yield server
+    gateway.close_client()
+    gateway.breaker.reset()
+    server.close()
+
+
+def _checkout():
+    return gateway.create_checkout(
+        amount=Decimal("49.00"), client_reference="user-1",
+        description="SkillFade Lifetime PRO",
+        success_url="https://skillfade.website/billing/success",
+        error_url="https://skillfade.website/billing/error",
+    )
+
+
+def _closed_port_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
 
-            def json(self):
-                return {"redirect_url": "https://epoint.az/pay/abc", "order_id": "skillfade_x"}
 
-        def fake_post(url, **kwargs):
-            captured["url"] = url
-            captured["kwargs"] = kwargs
-            return FakeResp()
-
-        monkeypatch.setattr(gateway.httpx, "post", fake_post)
+class TestCreateCheckout:
+    def test_posts_to_hub_with_auth_and_returns_redirect(self, hub):
+        hub.default = (200, {"redirect_url": "https://epoint.az/pay/abc", "order_id": "skillfade_x"}, 0)
 
-        out = gateway.create_checkout(
-            amount=Decimal("49.00"), client_reference="user-1",
-            description="SkillFade Lifetime PRO",
-            success_url="https://skillfade.website/billing/success",
-            error_url="https://skillfade.website/billing/error",
-        )
+        out = _checkout()
 
         assert out == {"redirect_url": "https://epoint.az/pay/abc", "order_id": "skillfade_x"}
-        assert captured["url"] == "https://hub.test/gateway/checkout"
-        assert captured["kwargs"]["headers"]["Authorization"] == "Bearer key123"
-        body = captured["kwargs"]["json"]
+        [req] = hub.requests
+        assert (req["method"], req["path"]) == ("POST", "/gateway/checkout")
+        assert req["headers"]["Authorization"] == "Bearer key123"
+        body = req["json"]
         assert body["amount"] == 49.0
         assert body["currency"] == "AZN"
         assert body["client_reference"] == "user-1"
         assert body["success_redirect_url"] == "https://skillfade.website/billing/success"
 
+    def test_server_error_is_not_retried(self, hub):
+        # The hub may already have created the order; a second POST could charge twice.
+        hub.replies = [(503, {"detail": "busy"}, 0)]
+        with pytest.raises(gateway.GatewayError):
+            _checkout()
+        assert len(hub.requests) == 1
+
+    def test_read_timeout_is_not_retried(self, hub):
+        hub.replies = [(200, {}, 1.0)]
+        with pytest.raises(httpx.ReadTimeout):
+            _checkout()
+        assert len(hub.requests) == 1
+
+    def test_connect_failure_is_retried(self, monkeypatch):
+        monkeypatch.setattr(settings, "GATEWAY_URL", _closed_port_url())
+        monkeypatch.setattr(settings, "GATEWAY_MAX_RETRIES", 2)
+        monkeypatch.setattr(gateway, "RETRY_BACKOFF", 0)
+        gateway.breaker.reset()
+        retries = gateway.metrics.GATEWAY_RETRIES.value(endpoint="checkout")
+        try:
+            with pytest.raises(httpx.ConnectError):
+                _checkout()
+            assert gateway.metrics.GATEWAY_RETRIES.value(endpoint="checkout") == retries + 2
+        finally:
+            gateway.breaker.reset()
 
-class TestGetStatus:
-    def test_queries_hub_status(self, monkeypatch):
-        monkeypatch.setattr(settings, "GATEWAY_URL", "https://hub.test")
-        monkeypatch.setattr(settings, "GATEWAY_API_KEY", "key123")
-        captured = {}
-
-        class FakeResp:
-            is_error = False
-
-            def json(self):
-                return {"order_id": "skillfade_x", "status": "success"}
-
-        def fake_get(url, **kwargs):
-            captured["url"] = url
-            captured["kwargs"] = kwargs
-            return FakeResp()
-
-        monkeypatch.setattr(gateway.httpx, "get", fake_get)
 
+class TestGetStatus:
+    def test_queries_hub_status(self, hub):
         out = gateway.get_status("skillfade_x")
         assert out["status"] == "success"
-        assert captured["url"] == "https://hub.test/gateway/status"
-        assert captured["kwargs"]["params"] == {"order_id": "skillfade_x"}
-        assert captured["kwargs"]["headers"]["Authorization"] == "Bearer key123"
-
-
-class TestErrorSurfacing:
-    def test_create_checkout_raises_gateway_error_with_hub_body(self, monkeypatch):
-        monkeypatch.setattr(settings, "GATEWAY_URL", "https://hub.test")
-        monkeypatch.setattr(settings, "GATEWAY_API_KEY", "key123")
+        [req] = hub.requests
+        assert req["path"] == "/gateway/status?order_id=skillfade_x"
+        assert req["headers"]["Authorization"] == "Bearer key123"
+
+    def test_reuses_pooled_connection(self, hub):
+        for _ in range(3):
+            gateway.get_status("skillfade_x")
+        assert len({req["client_port"] for req in hub.requests}) == 1
+
+    def test_retries_transient_errors(self, hub):
+        hub.replies = [(503, {"detail": "busy"}, 0)]
+        assert gateway.get_status("skillfade_x")["status"] == "success"
+        assert len(hub.requests) == 2
+
+    def test_retries_are_bounded(self, hub):
+        hub.default = (502, {"detail": "bad gateway"}, 0)
+        with pytest.raises(gateway.GatewayError) as exc:
+            gateway.get_status("skillfade_x")
+        assert "502" in str(exc.value)
+        assert len(hub.requests) == 2
+
+    def test_client_errors_are_not_retried(self, hub):
+        hub.replies = [(404, {"detail": "unknown order"}, 0)]
+        with pytest.raises(gateway.GatewayError):
+            gateway.get_status("nope")
+        assert len(hub.requests) == 1
+        assert gateway.breaker.state == "closed"
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures_and_fails_fast(self, hub):
+        hub.default = (503, {"detail": "down"}, 0)
+        for _ in range(2):  # two calls of two attempts each trip the threshold of 3
+            with pytest.raises(gateway.GatewayError):
+                gateway.get_status("skillfade_x")
+        assert gateway.breaker.state == "open"
+        sent = len(hub.requests)
+
+        with pytest.raises(gateway.GatewayUnavailable):
+            _checkout()
+        assert len(hub.requests) == sent
+
+    def test_failed_trial_without_transport_error_frees_the_slot(self, hub, monkeypatch):
+        monkeypatch.setattr(gateway.breaker, "reset_seconds", 0)
+        for _ in range(3):
+            gateway.breaker.record_failure()
+        assert gateway.breaker.state == "half_open"
+        hub.replies = [(200, b"not gzip", 0, {"Content-Encoding": "gzip"})]
 
-        class FakeResp:
-            is_error = True
-            status_code = 502
-            text = '{"detail":"Payment provider error"}'
+        with pytest.raises(gateway.GatewayError) as exc:
+            gateway.get_status("skillfade_x")
+        assert "DecodingError" in str(exc.value)
+        assert not isinstance(exc.value, gateway.GatewayUnavailable)
+
+        # The trial was recorded as a failure; the next trial goes out and closes the circuit
+        assert gateway.get_status("skillfade_x")["status"] == "success"
+        assert gateway.breaker.state == "closed"
+
+    def test_half_open_trial_closes_on_success(self):
+        now = [0.0]
+        breaker = gateway.CircuitBreaker(threshold=2, reset_seconds=30, clock=lambda: now[0])
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open" and not breaker.allow()
+
+        now[0] = 31
+        assert breaker.state == "half_open"
+        assert breaker.allow()
+        assert not breaker.allow()  # one trial at a time
+        breaker.record_success()
+        assert breaker.state == "closed" and breaker.allow()
+
+    def test_failed_trial_reopens(self):
+        now = [0.0]
+        breaker = gateway.CircuitBreaker(threshold=1, reset_seconds=30, clock=lambda: now[0])
+        breaker.record_failure()
+        now[0] = 31
+        assert breaker.allow()
+        breaker.record_failure()
+        assert breaker.state == "open"
+        now[0] = 60
+        assert not breaker.allow()
+        now[0] = 62
+        assert breaker.allow()
 
-            def json(self):
-                return {}
 
-        monkeypatch.setattr(gateway.httpx, "post", lambda url, **kw: FakeResp())
+class TestErrorSurfacing:
+    def test_create_checkout_raises_gateway_error_with_hub_body(self, hub):
+        hub.replies = [(502, {"detail": "Payment provider error"}, 0)]
 
         with pytest.raises(gateway.GatewayError) as exc:
             gateway.create_checkout(
@@ -0,0 +1,47 @@
+"""Tests for the synthetic dataset generator (benchmarks/generate_dataset.py)."""
+from sqlalchemy import func
+
+from app.models.activity_log import ActivityLog
+from app.models.event import Event, PracticeEvent
+from app.models.skill import Skill
+from app.models.user import User
+from app.services.log_dimensions import reset_caches
+from benchmarks._db import make_session
+from benchmarks.generate_dataset import ADMIN_EMAIL, generate
+from benchmarks.load_test import percentile
+
+
+def test_generates_consistent_dataset(db_session):
+    counts = generate(db_session, users=12, logs_per_user=30, batch_size=50)
+    assert counts["users"] == 13
+    assert db_session.query(User).filter(User.email == ADMIN_EMAIL, User.is_admin.is_(True)).count() == 1
+    assert counts["skills"] == db_session.query(Skill).count() >= 12
+    assert counts["events"] > counts["skills"]
+    assert db_session.query(Event.kind).distinct().count() == 2
+    assert 0 < counts["skill_month_rollups"] <= counts["events"]
+    orphans = (
+        db_session.query(func.count(Event.id))
+        .outerjoin(Skill, Skill.id == Event.skill_id)
+        .filter(Skill.id.is_(None))
+        .scalar()
+    )
+    assert orphans == 0
+    assert db_session.query(ActivityLog).filter(ActivityLog.page_id.is_(None)).count() == 0
+
+
+def test_same_seed_same_rows(db_session):
+    generate(db_session, users=5, logs_per_user=10, seed=7)
+    reset_caches()
+    other = make_session()
+    generate(other, users=5, logs_per_user=10, seed=7)
+    ids = lambda db: sorted(str(row[0]) for row in db.query(PracticeEvent.id))
+    assert ids(db_session) == ids(other)
+    other.close()
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 99) == 7.0
@@ -0,0 +1,96 @@
+"""Tests for liveness/readiness probes and load shedding (core/health.py)."""
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.core import health, metrics
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def _fresh_probe_cache():
+    health.reset_cache()
+    yield
+    health.reset_cache()
+
+
+def _stamp(db, revision):
+    db.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+    db.execute(text("DELETE FROM alembic_version"))
+    db.execute(text("INSERT INTO alembic_version (version_num) VALUES (:rev)"), {"rev": revision})
+    db.commit()
+
+
+@pytest.fixture()
+def small_pool(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=1, max_overflow=0)
+    yield engine
+    engine.dispose()
+
+
+def test_liveness(client):
+    for path in ("/health", "/health/live"):
+        r = client.get(path)
+        assert r.status_code == 200
+        assert r.json() == {"status": "healthy"}
+
+
+class TestReadiness:
+    def test_ready_at_migration_head(self, client, db_session):
+        _stamp(db_session, health.expected_head())
+        r = client.get("/health/ready")
+        assert r.status_code == 200
+        body = r.json()
+        assert body["status"] == "ready"
+        assert body["checks"]["database"]["latency_ms"] >= 0
+        assert body["checks"]["migrations"]["current"] == health.expected_head()
+
+    def test_not_ready_when_migrations_lag(self, client, db_session):
+        _stamp(db_session, "001")
+        r = client.get("/health/ready")
+        assert r.status_code == 503
+        assert r.json()["checks"]["migrations"] == {"ok": False, "current": "001", "head": health.expected_head()}
+
+    def test_probe_is_cached(self, client, db_session, monkeypatch):
+        _stamp(db_session, health.expected_head())
+        calls = []
+        real_probe = health._probe_database
+        monkeypatch.setattr(health, "_probe_database", lambda engine: calls.append(1) or real_probe(engine))
+        for _ in range(5):
+            assert client.get("/health/ready").status_code == 200
+        assert len(calls) == 1
+
+    def test_saturated_pool_is_not_ready(self, small_pool):
+        assert health.pool_status(small_pool) == {"checked_out": 0, "capacity": 1, "saturation": 0.0}
+        with small_pool.connect():
+            result = health.readiness(small_pool)
+            assert result["ready"] is False
+            assert result["checks"]["pool"]["saturation"] == 1.0
+            assert result["checks"]["database"] == {"ok": False, "error": "pool exhausted"}
+        assert health.readiness(small_pool)["checks"]["pool"]["ok"] is True
+
+
+class TestLoadShedding:
+    def test_full_pool_sheds_requests_but_not_probes(self, client, monkeypatch):
+        monkeypatch.setattr(health, "pool_status", lambda engine: {"checked_out": 15, "capacity": 15, "saturation": 1.0})
+        shed = metrics.REQUESTS_SHED.value()
+        r = client.get("/api/skills")
+        assert r.status_code == 503
+        assert r.headers["retry-after"] == "1"
+        assert metrics.REQUESTS_SHED.value() == shed + 1
+        assert client.get("/health/live").status_code == 200
+        assert client.get("/metrics").status_code == 200
+
+    def test_in_flight_limit(self, monkeypatch, small_pool):
+        monkeypatch.setattr(settings, "MAX_IN_FLIGHT_REQUESTS", 2)
+        assert health.should_shed(small_pool) is False
+        metrics.HTTP_IN_FLIGHT.inc(3)
+        try:
+            assert health.should_shed(small_pool) is True
+        finally:
+            metrics.HTTP_IN_FLIGHT.dec(3)
+
+    def test_can_be_disabled(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "LOAD_SHEDDING_ENABLED", False)
+        monkeypatch.setattr(health, "pool_status", lambda engine: {"checked_out": 15, "capacity": 15, "saturation": 1.0})
+        assert client.get("/api/skills").status_code == 403  # reached auth, not shed
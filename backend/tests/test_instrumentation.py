@@ -0,0 +1,94 @@
+"""Tests for per-request query instrumentation (core/instrumentation.py)."""
+import logging
+import re
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.instrumentation import fingerprint, install_query_hooks
+from app.core.security import create_access_token, get_password_hash
+from app.models.skill import Skill
+from app.models.user import User
+
+
+@pytest.fixture()
+def instrumented(db_session):
+    install_query_hooks(db_session.get_bind())
+    return db_session
+
+
+def _user_with_skills(db, count=3):
+    u = User(email="t@example.com", password_hash=get_password_hash("password123"))
+    db.add(u)
+    db.commit()
+    db.add_all([Skill(user_id=u.id, name=f"Skill {i}") for i in range(count)])
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': u.email})}"}
+
+
+def _timing(response):
+    header = response.headers["server-timing"]
+    queries = int(re.search(r'desc="(\d+) queries"', header).group(1))
+    db_ms = float(re.search(r"db;dur=([\d.]+)", header).group(1))
+    return queries, db_ms
+
+
+class TestServerTiming:
+    def test_counts_queries_of_sync_dependencies(self, client, instrumented):
+        headers = _user_with_skills(instrumented)
+        r = client.get("/api/skills", headers=headers)
+        assert r.status_code == 200
+        queries, db_ms = _timing(r)
+        assert queries >= 2  # user lookup + skills
+        assert db_ms >= 0
+        assert "app;dur=" in r.headers["server-timing"]
+
+    def test_requests_are_counted_separately(self, client, instrumented):
+        headers = _user_with_skills(instrumented)
+        first, _ = _timing(client.get("/api/skills", headers=headers))
+        second, _ = _timing(client.get("/api/skills", headers=headers))
+        assert first == second
+
+    def test_no_db_no_queries(self, client, instrumented):
+        assert _timing(client.get("/"))[0] == 0
+
+    def test_failed_statements_leave_nothing_on_the_connection(self, instrumented):
+        connection = instrumented.connection()
+        before = dict(connection.info)
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM no_such_table"))
+        connection.execute(text("SELECT 1"))
+        assert dict(connection.info) == before
+
+    def test_can_be_disabled(self, client, instrumented, monkeypatch):
+        monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", False)
+        assert "server-timing" not in client.get("/").headers
+
+
+class TestSlowRequestLog:
+    def test_over_threshold_logs_route_and_fingerprint(self, client, instrumented, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "SLOW_REQUEST_QUERY_THRESHOLD", 1)
+        headers = _user_with_skills(instrumented)
+        with caplog.at_level(logging.WARNING, logger="app.requests"):
+            client.get("/api/skills", headers=headers)
+        [record] = [r for r in caplog.records if r.name == "app.requests"]
+        assert record.levelno == logging.WARNING
+        assert "route=/api/skills" in record.getMessage()
+        assert "repeated_fingerprint=" in record.getMessage()
+
+    def test_under_threshold_is_quiet(self, client, instrumented, monkeypatch, caplog):
+        monkeypatch.setattr(settings, "SLOW_REQUEST_QUERY_THRESHOLD", 1000)
+        headers = _user_with_skills(instrumented)
+        with caplog.at_level(logging.WARNING, logger="app.requests"):
+            client.get("/api/skills", headers=headers)
+        assert not [r for r in caplog.records if r.name == "app.requests"]
+
+
+def test_fingerprint_ignores_literals_and_in_lists():
+    a = fingerprint("SELECT * FROM skills WHERE id IN (?, ?, ?) AND name = 'x' LIMIT 5")
+    b = fingerprint("SELECT *  FROM skills\nWHERE id IN (?) AND name = 'other' LIMIT 10")
+    assert a == b
+    assert a != fingerprint("SELECT * FROM categories WHERE id IN (?)")
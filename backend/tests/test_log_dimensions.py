@@ -0,0 +1,91 @@
+"""Tests for the activity log dimension tables and caches (services/log_dimensions.py)."""
+from app.core.security import create_access_token, get_password_hash
+from app.models.activity_log import ActivityActionType, ActivityLog, ActivityPage, ActivityUserAgent
+from app.models.user import User
+from app.services import log_dimensions
+
+
+def _admin_headers(db):
+    u = User(email="admin@example.com", password_hash=get_password_hash("p"), is_admin=True)
+    db.add(u)
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': u.email})}"}
+
+
+def _log(client, action_type, page="/"):
+    r = client.post("/api/logs", json={"session_id": "s1", "action_type": action_type, "page": page})
+    assert r.status_code == 201
+
+
+class TestActionTypes:
+    def test_ingestion_registers_each_type_once(self, client, db_session):
+        for action_type in ["page_view", "click", "page_view", "page_view"]:
+            _log(client, action_type)
+        assert sorted(n for (n,) in db_session.query(ActivityActionType.name)) == ["click", "page_view"]
+
+    def test_cached_types_skip_the_upsert(self, client, db_session, monkeypatch):
+        _log(client, "page_view")
+        calls = []
+        monkeypatch.setattr(log_dimensions, "_insert_ignore", lambda *args: calls.append(args))
+        _log(client, "page_view")
+        assert calls == []
+
+    def test_upsert_tolerates_rows_from_other_workers(self, db_session):
+        db_session.add(ActivityActionType(name="signup"))
+        db_session.commit()
+        log_dimensions.register_action_type(db_session, "signup")
+        assert db_session.query(ActivityActionType).count() == 1
+
+    def test_dropdown_endpoint(self, client, db_session):
+        headers = _admin_headers(db_session)
+        for action_type in ["signup", "click", "page_view"]:
+            _log(client, action_type)
+        r = client.get("/api/admin/logs/action-types", headers=headers)
+        assert r.json() == ["click", "page_view", "signup"]
+
+    def test_dropdown_refreshes_from_table(self, db_session, monkeypatch):
+        assert log_dimensions.list_action_types(db_session) == []
+        db_session.add(ActivityActionType(name="from_other_worker"))
+        db_session.commit()
+        assert log_dimensions.list_action_types(db_session) == []
+        monkeypatch.setattr(log_dimensions, "CACHE_TTL_SECONDS", -1)
+        assert log_dimensions.list_action_types(db_session) == ["from_other_worker"]
+
+
+class TestDictionaryEncoding:
+    def test_ingestion_stores_ids_and_returns_strings(self, client, db_session):
+        r = client.post(
+            "/api/logs",
+            json={"session_id": "s1", "action_type": "page_view", "page": "/pricing"},
+            headers={"User-Agent": "Mozilla/5.0 (X11)"},
+        )
+        assert r.json()["page"] == "/pricing"
+        assert r.json()["user_agent"] == "Mozilla/5.0 (X11)"
+        log = db_session.query(ActivityLog).one()
+        assert log.page_ref.path == "/pricing"
+        assert log.user_agent_ref.value == "Mozilla/5.0 (X11)"
+
+    def test_repeated_values_share_one_row(self, client, db_session):
+        for page in ["/", "/pricing", "/", "/"]:
+            _log(client, "page_view", page)
+        assert db_session.query(ActivityPage).count() == 2
+        assert db_session.query(ActivityUserAgent).count() == 1
+        assert db_session.query(ActivityLog.page_id).distinct().count() == 2
+
+    def test_missing_values_encode_to_null(self, db_session):
+        assert log_dimensions.encode_page(db_session, None) is None
+        assert log_dimensions.encode_user_agent(db_session, "") is None
+
+    def test_intern_cache_is_bounded(self, db_session, monkeypatch):
+        monkeypatch.setattr(log_dimensions, "INTERN_CACHE_SIZE", 3)
+        ids = [log_dimensions.encode_page(db_session, f"/p{i}") for i in range(10)]
+        assert len(set(ids)) == 10
+        assert len(log_dimensions._page_ids) <= 3
+        assert log_dimensions.encode_page(db_session, "/p0") == ids[0]
+
+    def test_admin_list_decodes(self, client, db_session):
+        headers = _admin_headers(db_session)
+        _log(client, "click", "/dashboard")
+        item = client.get("/api/admin/logs", headers=headers).json()["items"][0]
+        assert item["page"] == "/dashboard"
+        assert item["user_agent"] == "testclient"
@@ -0,0 +1,172 @@
+"""Tests for activity log partition maintenance and retention (services/log_partitions.py).
+
+TestPartitionedMaintenance needs Postgres: it migrates a scratch `log_partitions`
+schema in TEST_POSTGRES_URL (see test_query_plans.py) and is skipped otherwise.
+"""
+import os
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.models.activity_log import ActivityLog
+from app.models.user import User
+from app.services.log_partitions import (
+    DEFAULT_PARTITION,
+    add_months,
+    existing_partitions,
+    expired_partitions,
+    partition_month,
+    partition_name,
+    retention_cutoff,
+    run_maintenance,
+)
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+SCHEMA = "log_partitions"
+
+
+def _log(db, created_at, action_type="page_view"):
+    db.add(ActivityLog(session_id="s1", action_type=action_type, created_at=created_at))
+    db.commit()
+
+
+class TestCalendarMath:
+    def test_add_months_crosses_years(self):
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_partition_name_round_trip(self):
+        assert partition_name(date(2026, 3, 1)) == "activity_logs_y2026m03"
+        assert partition_month("activity_logs_y2026m03") == date(2026, 3, 1)
+        assert partition_month("activity_logs_default") is None
+
+    def test_retention_keeps_current_month_plus_window(self):
+        assert retention_cutoff(date(2026, 10, 18), 12) == date(2025, 10, 1)
+
+    def test_only_whole_months_before_cutoff_expire(self):
+        names = [
+            "activity_logs_y2025m08",
+            "activity_logs_y2025m09",
+            "activity_logs_y2025m10",
+            "activity_logs_default",
+        ]
+        assert expired_partitions(names, date(2025, 10, 1)) == [
+            "activity_logs_y2025m08",
+            "activity_logs_y2025m09",
+        ]
+
+
+class TestRowRetentionFallback:
+    def test_deletes_rows_before_cutoff(self, db_session):
+        _log(db_session, datetime(2025, 9, 30, 23, 59))
+        _log(db_session, datetime(2025, 10, 1, 0, 0))
+        _log(db_session, datetime(2026, 10, 17, 12, 0))
+        report = run_maintenance(db_session, today=date(2026, 10, 18), retention_months=12, ahead=3)
+        assert report["partitioned"] is False
+        assert report["cutoff"] == "2025-10-01"
+        assert report["deleted_rows"] == 1
+        assert db_session.query(ActivityLog).count() == 2
+
+    def test_dry_run_changes_nothing(self, db_session):
+        _log(db_session, datetime(2020, 1, 1))
+        report = run_maintenance(db_session, today=date(2026, 10, 18), retention_months=1, dry_run=True)
+        assert report["deleted_rows"] == 1
+        assert db_session.query(ActivityLog).count() == 1
+
+    def test_zero_months_keeps_everything(self, db_session):
+        _log(db_session, datetime(2000, 1, 1))
+        report = run_maintenance(db_session, today=date(2026, 10, 18), retention_months=0)
+        assert report["cutoff"] is None
+        assert db_session.query(ActivityLog).count() == 1
+
+
+def test_admin_list_accepts_aware_bounds(client, db_session):
+    admin = User(email="admin@example.com", password_hash=get_password_hash("p"), is_admin=True)
+    db_session.add(admin)
+    db_session.commit()
+    _log(db_session, datetime(2026, 10, 1, 10, 0))
+    _log(db_session, datetime(2026, 10, 1, 14, 0))
+    r = client.get(
+        "/api/admin/logs",
+        headers={"Authorization": f"Bearer {create_access_token({'sub': admin.email})}"},
+        params={"start_date": "2026-10-01T13:00:00+02:00", "end_date": "2026-10-01T20:00:00+02:00"},
+    )
+    assert r.status_code == 200
+    assert r.json()["total"] == 1
+
+
+@pytest.fixture
+def pg_db():
+    """Session on a freshly migrated `log_partitions` schema (partitioned activity_logs)."""
+    if not POSTGRES_URL:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    saved_options, saved_url = os.environ.get("PGOPTIONS"), settings.DATABASE_URL
+    os.environ["PGOPTIONS"] = f"-c search_path={SCHEMA}"
+    engine = create_engine(POSTGRES_URL)
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+        settings.DATABASE_URL = POSTGRES_URL
+        config = Config()
+        config.set_main_option("script_location", str(Path(__file__).resolve().parents[1] / "alembic"))
+        command.upgrade(config, "head")
+        db = sessionmaker(bind=engine)()
+        yield db
+        db.close()
+    finally:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        engine.dispose()
+        settings.DATABASE_URL = saved_url
+        if saved_options is None:
+            os.environ.pop("PGOPTIONS", None)
+        else:
+            os.environ["PGOPTIONS"] = saved_options
+
+
+def _raw_log(db, created_at):
+    db.execute(
+        text("INSERT INTO activity_logs (id, session_id, action_type, created_at) VALUES (:id, 's1', 'page_view', :at)"),
+        {"id": uuid.uuid4(), "at": created_at},
+    )
+    db.commit()
+
+
+def _count(db, table):
+    return db.execute(text(f"SELECT count(*) FROM {table}")).scalar()
+
+
+class TestPartitionedMaintenance:
+    def test_rows_in_default_move_into_the_new_month(self, pg_db):
+        # No partition covers 2031 yet, so these rows land in DEFAULT.
+        _raw_log(pg_db, datetime(2031, 1, 15))
+        _raw_log(pg_db, datetime(2031, 2, 3))
+        report = run_maintenance(pg_db, today=date(2031, 1, 10), retention_months=0, ahead=0)
+        assert report["created_partitions"] == ["activity_logs_y2031m01"]
+        assert _count(pg_db, "activity_logs_y2031m01") == 1
+        assert _count(pg_db, DEFAULT_PARTITION) == 1
+        assert DEFAULT_PARTITION in existing_partitions(pg_db)  # attached again
+        _raw_log(pg_db, datetime(2031, 1, 20))
+        assert _count(pg_db, "activity_logs_y2031m01") == 2
+
+    def test_expired_rows_leave_default_too(self, pg_db):
+        _raw_log(pg_db, datetime(2000, 1, 1))
+        _raw_log(pg_db, datetime(2031, 1, 15))
+        dry = run_maintenance(pg_db, today=date(2031, 1, 10), retention_months=12, ahead=0, dry_run=True)
+        assert dry["deleted_rows"] == 1
+        assert _count(pg_db, DEFAULT_PARTITION) == 2
+
+        report = run_maintenance(pg_db, today=date(2031, 1, 10), retention_months=12, ahead=0)
+        assert report["deleted_rows"] == 1
+        assert report["created_partitions"] == ["activity_logs_y2031m01"]
+        assert _count(pg_db, DEFAULT_PARTITION) == 0
+        assert _count(pg_db, "activity_logs") == 1
@@ -0,0 +1,172 @@
+"""Tests for background bulk deletion of activity logs (services/log_purge.py)."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.security import create_access_token, get_password_hash
+from app.models.activity_log import ActivityLog
+from app.models.activity_log_delete_job import ActivityLogDeleteJob
+from app.models.user import User
+from app.services import log_purge
+from app.services.log_rollups import rollup_logs
+
+
+@pytest.fixture()
+def job_session(db_session, monkeypatch):
+    """Run background jobs against the test database."""
+    monkeypatch.setattr(log_purge, "SessionLocal", lambda: db_session)
+    return db_session
+
+
+def _admin(db):
+    u = User(email="admin@example.com", password_hash=get_password_hash("p"), is_admin=True)
+    db.add(u)
+    db.commit()
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _seed(db, count=25):
+    start = datetime(2026, 9, 1)
+    db.add_all([
+        ActivityLog(session_id=f"s{i}", action_type="page_view", created_at=start + timedelta(hours=i))
+        for i in range(count)
+    ])
+    db.commit()
+
+
+class TestRunDeleteJob:
+    def test_deletes_range_in_batches(self, job_session):
+        _seed(job_session)
+        rollup_logs(job_session, now=datetime(2026, 9, 2))
+        job = log_purge.create_delete_job(job_session, datetime(2026, 9, 1, 5), datetime(2026, 9, 1, 16))
+        job_session.commit()
+        job_id = job.id
+        log_purge.run_delete_job(job_id, batch_size=5)
+        job = job_session.get(ActivityLogDeleteJob, job_id)
+        assert job.status == "completed"
+        assert job.total_estimate == 12
+        assert job.deleted_count == 12
+        assert job.finished_at is not None
+        assert job_session.query(ActivityLog).count() == 13
+
+    def test_estimate_is_unknown_before_the_first_rollup(self, job_session):
+        _seed(job_session)
+        job = log_purge.create_delete_job(job_session, datetime(2026, 9, 1, 5), None)
+        job_session.commit()
+        job_id = job.id
+        log_purge.run_delete_job(job_id)
+        job = job_session.get(ActivityLogDeleteJob, job_id)
+        assert job.total_estimate is None
+        assert job.deleted_count == 20
+
+    def test_open_ended_range(self, job_session):
+        _seed(job_session)
+        job = log_purge.create_delete_job(job_session, None, datetime(2026, 9, 1, 9, 30))
+        job_session.commit()
+        log_purge.run_delete_job(job.id, batch_size=3)
+        assert job_session.query(ActivityLog).count() == 15
+
+    def test_only_pending_jobs_run(self, job_session):
+        _seed(job_session)
+        job = log_purge.create_delete_job(job_session, datetime(2026, 9, 1), None)
+        job.status = "completed"
+        job_session.commit()
+        log_purge.run_delete_job(job.id)
+        assert job_session.query(ActivityLog).count() == 25
+
+    def test_failure_is_recorded(self, job_session, monkeypatch):
+        _seed(job_session)
+        job = log_purge.create_delete_job(job_session, datetime(2026, 9, 1), None)
+        job_session.commit()
+        job_id = job.id
+
+        def boom(*_args):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(log_purge, "_delete_batch", boom)
+        log_purge.run_delete_job(job_id)
+        job = job_session.get(ActivityLogDeleteJob, job_id)
+        assert job.status == "failed"
+        assert job.error == "disk full"
+
+
+class TestResumeStalledJobs:
+    NOW = datetime(2026, 10, 1, 12, 0)
+
+    def _job(self, db, status, created_at, heartbeat_at=None, deleted_count=0):
+        job = log_purge.create_delete_job(db, datetime(2026, 9, 1), None)
+        job.status = status
+        job.created_at = created_at
+        job.heartbeat_at = heartbeat_at
+        job.deleted_count = deleted_count
+        db.commit()
+        return job.id
+
+    def test_resumes_a_job_whose_runner_died(self, job_session):
+        _seed(job_session, count=20)  # 5 of the original 25 were deleted before the restart
+        started = self.NOW - timedelta(hours=1)
+        job_id = self._job(job_session, "running", started, heartbeat_at=started, deleted_count=5)
+        assert log_purge.resume_stalled_jobs(job_session, now=self.NOW) == 1
+        job = job_session.get(ActivityLogDeleteJob, job_id)
+        assert job.status == "completed"
+        assert job.deleted_count == 25
+        assert job_session.query(ActivityLog).count() == 0
+
+    def test_runs_a_pending_job_that_never_started(self, job_session):
+        _seed(job_session)
+        job_id = self._job(job_session, "pending", self.NOW - timedelta(hours=1))
+        assert log_purge.resume_stalled_jobs(job_session, now=self.NOW) == 1
+        assert job_session.get(ActivityLogDeleteJob, job_id).status == "completed"
+
+    def test_leaves_live_and_finished_jobs_alone(self, job_session):
+        _seed(job_session)
+        recent = self.NOW - timedelta(minutes=2)
+        live = self._job(job_session, "running", self.NOW - timedelta(hours=1), heartbeat_at=recent)
+        fresh = self._job(job_session, "pending", recent)
+        self._job(job_session, "completed", self.NOW - timedelta(days=1))
+        self._job(job_session, "failed", self.NOW - timedelta(days=1))
+        assert log_purge.resume_stalled_jobs(job_session, now=self.NOW) == 0
+        assert job_session.get(ActivityLogDeleteJob, live).status == "running"
+        assert job_session.get(ActivityLogDeleteJob, fresh).status == "pending"
+        assert job_session.query(ActivityLog).count() == 25
+
+    def test_a_job_is_claimed_once(self, job_session):
+        _seed(job_session)
+        job_id = self._job(job_session, "running", self.NOW - timedelta(hours=1))
+        cutoff = self.NOW - log_purge.STALLED_AFTER
+        assert log_purge.run_delete_job(job_id, stalled_before=cutoff) is True
+        assert log_purge.run_delete_job(job_id, stalled_before=cutoff) is False
+
+
+class TestEndpoints:
+    def test_returns_job_to_poll(self, client, job_session):
+        headers = _auth(_admin(job_session).email)
+        _seed(job_session)
+        r = client.post(
+            "/api/admin/logs/bulk-delete",
+            headers=headers,
+            json={"start_date": "2026-09-01T00:00:00", "end_date": "2026-09-01T09:00:00"},
+        )
+        assert r.status_code == 202
+        assert r.json()["status"] == "pending"
+        # The background task has run by the time TestClient returns.
+        job = client.get(f"/api/admin/logs/bulk-delete/{r.json()['id']}", headers=headers).json()
+        assert job["status"] == "completed"
+        assert job["deleted_count"] == 10
+
+    def test_requires_a_bound(self, client, job_session):
+        admin = _admin(job_session)
+        r = client.post("/api/admin/logs/bulk-delete", headers=_auth(admin.email), json={})
+        assert r.status_code == 400
+
+    def test_unknown_job_is_404(self, client, job_session):
+        admin = _admin(job_session)
+        r = client.get(
+            "/api/admin/logs/bulk-delete/00000000-0000-0000-0000-000000000000",
+            headers=_auth(admin.email),
+        )
+        assert r.status_code == 404
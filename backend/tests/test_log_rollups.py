@@ -0,0 +1,170 @@
+"""Tests for the activity log rollups behind /api/admin/logs/stats (services/log_rollups.py)."""
+import uuid
+from datetime import date, datetime, timedelta
+
+from app.core.security import create_access_token, get_password_hash
+from app.models.activity_log import ActivityLog
+from app.models.activity_log_rollup import ActivityLogDailySketch, ActivityLogRollup
+from app.models.app_setting import AppSetting
+from app.models.user import User
+from app.services.log_dimensions import encode_page
+from app.services.log_partitions import run_maintenance
+from app.services.log_rollups import HyperLogLog, compute_stats, get_watermark, rollup_logs
+
+NOW = datetime(2026, 10, 18, 12, 40)
+PAGES = ["/", "/dashboard", "/pricing", "/skills", None]
+ACTIONS = ["page_view", "click", "signup", "login"]
+
+
+def _admin(db):
+    u = User(email="admin@example.com", password_hash=get_password_hash("p"), is_admin=True)
+    db.add(u)
+    db.commit()
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _seed(db, users):
+    """~300 logs spread over the four days before NOW, including the un-rolled current hour."""
+    page_ids = [encode_page(db, page) for page in PAGES]
+    logs = []
+    for i in range(300):
+        logs.append(ActivityLog(
+            user_id=users[i % len(users)].id if i % 4 else None,
+            session_id=f"s{i % 37}",
+            action_type=ACTIONS[i % len(ACTIONS)],
+            page_id=page_ids[i % len(PAGES)],
+            created_at=NOW - timedelta(minutes=17 * i),
+        ))
+    db.add_all(logs)
+    db.commit()
+
+
+def _users(db, count=6):
+    users = [User(email=f"u{i}@example.com", password_hash="x") for i in range(count)]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def _raw_stats(db):
+    """Stats straight from activity_logs, i.e. as if nothing had been rolled up."""
+    db.query(AppSetting).delete()
+    db.flush()
+    stats = compute_stats(db, now=NOW)
+    db.rollback()
+    return stats
+
+
+class TestHyperLogLog:
+    def test_small_cardinalities_are_exact(self):
+        hll = HyperLogLog()
+        for i in range(50):
+            hll.add(f"user-{i}")
+            hll.add(f"user-{i}")
+        assert hll.estimate() == 50
+
+    def test_large_cardinality_within_error(self):
+        hll = HyperLogLog()
+        for _ in range(20_000):
+            hll.add(str(uuid.uuid4()))
+        assert abs(hll.estimate() - 20_000) < 20_000 * 0.05
+
+    def test_merge_is_union(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(30):
+            a.add(str(i))
+        for i in range(20, 60):
+            b.add(str(i))
+        a.merge(b.to_bytes())
+        assert a.estimate() == 60
+
+
+class TestRollup:
+    def test_rolled_stats_match_raw(self, db_session):
+        _seed(db_session, _users(db_session))
+        expected = _raw_stats(db_session)
+        hours = rollup_logs(db_session, now=NOW)
+        assert get_watermark(db_session) == datetime(2026, 10, 18, 12, 0)
+        assert hours > 0
+        assert db_session.query(ActivityLogRollup).count() > 0
+        assert compute_stats(db_session, now=NOW) == expected
+
+    def test_second_run_is_a_no_op(self, db_session):
+        _seed(db_session, _users(db_session))
+        rollup_logs(db_session, now=NOW)
+        rows = db_session.query(ActivityLogRollup).count()
+        assert rollup_logs(db_session, now=NOW) == 0
+        assert db_session.query(ActivityLogRollup).count() == rows
+
+    def test_new_logs_after_rollup_show_up_in_tail(self, db_session):
+        users = _users(db_session)
+        _seed(db_session, users)
+        rollup_logs(db_session, now=NOW)
+        page_id = encode_page(db_session, "/new")
+        db_session.add(ActivityLog(user_id=None, session_id="fresh", action_type="signup", page_id=page_id, created_at=NOW))
+        db_session.commit()
+        stats = compute_stats(db_session, now=NOW)
+        assert stats == _raw_stats(db_session)
+
+    def test_empty_table_sets_watermark(self, db_session):
+        assert rollup_logs(db_session, now=NOW) == 0
+        assert get_watermark(db_session) == datetime(2026, 10, 18, 12, 0)
+        assert compute_stats(db_session, now=NOW)["total_logs"] == 0
+
+
+class TestDeletesKeepRollupsInStep:
+    def test_bulk_delete(self, client, db_session, monkeypatch):
+        monkeypatch.setattr("app.services.log_purge.SessionLocal", lambda: db_session)
+        headers = _auth(_admin(db_session).email)
+        _seed(db_session, _users(db_session))
+        rollup_logs(db_session, now=NOW)
+        r = client.post(
+            "/api/admin/logs/bulk-delete",
+            headers=headers,
+            json={"start_date": "2026-10-15T09:30:00", "end_date": "2026-10-16T18:10:00"},
+        )
+        assert r.status_code == 202
+        job = client.get(f"/api/admin/logs/bulk-delete/{r.json()['id']}", headers=headers).json()
+        assert job["status"] == "completed"
+        assert job["deleted_count"] > 0
+        assert compute_stats(db_session, now=NOW) == _raw_stats(db_session)
+
+    def test_single_delete(self, client, db_session):
+        admin = _admin(db_session)
+        _seed(db_session, _users(db_session))
+        rollup_logs(db_session, now=NOW)
+        log_id = db_session.query(ActivityLog.id).filter(ActivityLog.created_at < NOW - timedelta(days=1)).first()[0]
+        before = compute_stats(db_session, now=NOW)
+        assert client.delete(f"/api/admin/logs/{log_id}", headers=_auth(admin.email)).status_code == 204
+        after = compute_stats(db_session, now=NOW)
+        raw = _raw_stats(db_session)
+        assert after["total_logs"] == before["total_logs"] - 1
+        assert after["top_pages"] == raw["top_pages"]
+        assert after["top_actions"] == raw["top_actions"]
+
+
+def test_retention_purges_rollups(db_session):
+    db_session.add_all([
+        ActivityLog(session_id="old", action_type="page_view", created_at=datetime(2024, 5, 3, 8, 0)),
+        ActivityLog(session_id="new", action_type="page_view", created_at=datetime(2026, 10, 3, 8, 0)),
+    ])
+    db_session.commit()
+    rollup_logs(db_session, now=NOW)
+    run_maintenance(db_session, today=date(2026, 10, 18), retention_months=12)
+    assert db_session.query(ActivityLogDailySketch.day).all() == [(date(2026, 10, 3),)]
+    assert compute_stats(db_session, now=NOW)["total_logs"] == 1
+
+
+def test_stats_endpoint(client, db_session):
+    admin = _admin(db_session)
+    _seed(db_session, _users(db_session))
+    rollup_logs(db_session, now=NOW)
+    body = client.get("/api/admin/logs/stats", headers=_auth(admin.email)).json()
+    assert body["total_logs"] == 300
+    assert body["unique_users"] == 6
+    assert body["unique_sessions"] == 37
+    assert len(body["top_pages"]) == 4
@@ -0,0 +1,115 @@
+"""Tests for the Prometheus registry (core/metrics.py) and GET /metrics."""
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.activity_log_delete_job import ActivityLogDeleteJob
+from app.services.alerts import process_all_alerts
+from app.services.site_settings import KEY_ALERTS_LAST_RUN, KEY_LOG_ROLLUP_WATERMARK, get_setting, set_setting
+
+
+def _sample(text, line_prefix):
+    """Value of the first exposition line starting with `line_prefix`."""
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+class TestRegistry:
+    def test_counter_and_histogram_format(self):
+        registry = metrics.Registry()
+        counter = registry.counter("jobs_total", "Jobs.", ("kind",))
+        histogram = registry.histogram("job_seconds", "Job time.", buckets=(0.1, 1.0))
+        counter.inc(kind='a"b')
+        counter.inc(2, kind='a"b')
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(3)
+        text = registry.render()
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{kind="a\\"b"} 3' in text
+        assert 'job_seconds_bucket{le="0.1"} 1' in text
+        assert 'job_seconds_bucket{le="1"} 2' in text
+        assert 'job_seconds_bucket{le="+Inf"} 3' in text
+        assert "job_seconds_sum 3.55" in text
+        assert "job_seconds_count 3" in text
+
+    def test_extra_families(self):
+        text = metrics.Registry().render([("queue_depth", "gauge", "Depth.", [("queue_depth", {}, 4)])])
+        assert text == "# HELP queue_depth Depth.\n# TYPE queue_depth gauge\nqueue_depth 4\n"
+
+
+class TestEndpoint:
+    def test_records_requests_by_route_template(self, client):
+        before = metrics.HTTP_REQUESTS.value(method="GET", route="/health", status="200")
+        client.get("/health")
+        r = client.get("/metrics")
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert _sample(r.text, 'http_requests_total{method="GET",route="/health",status="200"}') == before + 1
+        assert "http_request_duration_seconds_bucket" in r.text
+
+    def test_unmatched_paths_share_one_label(self, client):
+        client.get("/no/such/path/123")
+        assert 'route="unmatched",status="404"' in client.get("/metrics").text
+
+    def test_ingestion_and_cache_counters(self, client):
+        ingested = metrics.LOGS_INGESTED.value()
+        hits = metrics.CACHE_REQUESTS.value(cache="activity_pages", result="hit")
+        for _ in range(3):
+            client.post("/api/logs", json={"session_id": "s", "action_type": "page_view", "page": "/x"})
+        assert metrics.LOGS_INGESTED.value() == ingested + 3
+        assert metrics.CACHE_REQUESTS.value(cache="activity_pages", result="hit") == hits + 2
+
+    def test_database_state(self, client, db_session):
+        set_setting(db_session, KEY_LOG_ROLLUP_WATERMARK, (datetime.utcnow() - timedelta(hours=2)).isoformat())
+        set_setting(db_session, KEY_ALERTS_LAST_RUN, json.dumps({
+            "finished_at": "2026-10-18T09:00:05",
+            "duration_seconds": 4.2,
+            "alerts": {"decay": 3, "practice_gap": 0, "imbalance": 1},
+        }))
+        db_session.add(ActivityLogDeleteJob(status="pending"))
+        db_session.commit()
+        text = client.get("/metrics").text
+        assert _sample(text, 'activity_log_delete_jobs{status="pending"}') == 1
+        assert _sample(text, 'activity_log_delete_jobs{status="running"}') == 0
+        assert 7100 < _sample(text, "activity_log_rollup_lag_seconds") < 7300
+        assert _sample(text, "alerts_last_run_duration_seconds") == 4.2
+        assert _sample(text, 'alerts_last_run_sent{type="decay"}') == 3
+
+    def test_alert_run_time_is_utc_whatever_the_host_zone(self, client, db_session):
+        saved_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "America/New_York"
+        time.tzset()
+        try:
+            set_setting(db_session, KEY_ALERTS_LAST_RUN, json.dumps({
+                "finished_at": "2026-01-01T00:00:00",
+                "duration_seconds": 1.0,
+                "alerts": {},
+            }))
+            db_session.commit()
+            text = client.get("/metrics").text
+        finally:
+            if saved_tz is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = saved_tz
+            time.tzset()
+        assert _sample(text, "alerts_last_run_timestamp_seconds") == 1767225600
+
+    def test_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+        assert client.get("/metrics").status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.get("/metrics", headers={"Authorization": "Bearer scrape-me"}).status_code == 200
+
+
+def test_alert_run_summary_is_stored(db_session):
+    process_all_alerts(db_session)
+    run = json.loads(get_setting(db_session, KEY_ALERTS_LAST_RUN))
+    assert run["alerts"] == {"decay": 0, "practice_gap": 0, "imbalance": 0}
+    assert run["duration_seconds"] >= 0
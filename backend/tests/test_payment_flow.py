@@ -1,14 +1,19 @@
 """Tests for the checkout, webhook, and reconcile payment flow (gateway client)."""
+import asyncio
 import base64
 import hashlib
 import json
+import time
 from datetime import datetime, timezone
 
+import pytest
+
 from app.core import gateway
 from app.core.config import settings
 from app.core.security import create_access_token, get_password_hash
 from app.models.subscription import Subscription
 from app.models.user import User
+from app.routers import billing as billing_router
 from app.services.entitlements import get_user_plan
 
 WEBHOOK_SECRET = "whsec-test"
@@ -54,6 +59,8 @@ class TestCheckout:
         assert sub.user_id == user.id
         assert sub.plan == "lifetime"
         assert sub.status == "pending"
+        # First background check leaves the webhook time to arrive
+        assert sub.next_reconcile_at > datetime.utcnow()
 
     def test_already_pro_user_cannot_checkout(self, client, db_session, monkeypatch):
         user = _make_user(db_session)
@@ -148,9 +155,9 @@ class TestWebhook:
         assert sub.status == "failed"
 
 
-# ── Reconcile (status poll) ──────────────────────────────
+# ── Status poll ──────────────────────────────────────────
 
-class TestReconcile:
+class TestStatusPoll:
     def _pending(self, db, user, order_id="skillfade_rc"):
         sub = Subscription(user_id=user.id, plan="lifetime", status="pending",
                            provider="epoint", order_id=order_id, currency="AZN")
@@ -158,17 +165,69 @@ class TestReconcile:
         db.commit()
         return sub
 
-    def test_pending_reconciles_to_active_via_hub(self, client, db_session, monkeypatch):
+    def _no_hub(self, monkeypatch):
+        def hub_called(order_id):
+            raise AssertionError("status poll must not call the hub")
+        monkeypatch.setattr(gateway, "get_status", hub_called)
+
+    def test_pending_is_answered_from_the_database(self, client, db_session, monkeypatch):
+        self._no_hub(monkeypatch)
         user = _make_user(db_session)
         self._pending(db_session, user)
-        monkeypatch.setattr(gateway, "get_status",
-                            lambda order_id: {"order_id": order_id, "status": "success", "epoint_transaction": "teRC"})
         resp = client.get("/api/billing/status", params={"order_id": "skillfade_rc"}, headers=_auth(user.email))
         assert resp.status_code == 200
-        body = resp.json()
-        assert body["status"] == "active"
-        assert body["is_pro"] is True
-        assert db_session.query(Subscription).filter_by(order_id="skillfade_rc").first().status == "active"
+        assert resp.json() == {"order_id": "skillfade_rc", "status": "pending", "is_pro": False}
+
+    def test_settled_order_reports_pro(self, client, db_session, monkeypatch):
+        self._no_hub(monkeypatch)
+        user = _make_user(db_session)
+        sub = self._pending(db_session, user)
+        sub.status = "active"
+        db_session.commit()
+        resp = client.get("/api/billing/status", params={"order_id": "skillfade_rc", "wait": 5},
+                          headers=_auth(user.email))
+        assert resp.json()["status"] == "active"
+        assert resp.json()["is_pro"] is True
+
+    def test_long_poll_returns_when_status_changes(self, client, db_session, monkeypatch):
+        self._no_hub(monkeypatch)
+        monkeypatch.setattr(billing_router, "STATUS_POLL_SECONDS", 0.01)
+        user = _make_user(db_session)
+        sub = self._pending(db_session, user)
+        reads = []
+        read_status = billing_router._order_status
+
+        def webhook_lands_on_third_read(db, order_id, user_id):
+            with pytest.raises(RuntimeError):
+                asyncio.get_running_loop()  # blocking reads must not run on the event loop
+            reads.append(order_id)
+            if len(reads) == 3:
+                sub.status = "active"
+                db_session.commit()
+            return read_status(db, order_id, user_id)
+
+        monkeypatch.setattr(billing_router, "_order_status", webhook_lands_on_third_read)
+        resp = client.get("/api/billing/status", params={"order_id": "skillfade_rc", "wait": 10},
+                          headers=_auth(user.email))
+        assert resp.json()["status"] == "active"
+        assert len(reads) == 3
+
+    def test_long_poll_gives_up_after_wait(self, client, db_session, monkeypatch):
+        monkeypatch.setattr(billing_router, "STATUS_POLL_SECONDS", 0.05)
+        user = _make_user(db_session)
+        self._pending(db_session, user)
+        started = time.monotonic()
+        resp = client.get("/api/billing/status", params={"order_id": "skillfade_rc", "wait": 1},
+                          headers=_auth(user.email))
+        assert resp.json()["status"] == "pending"
+        assert 1 <= time.monotonic() - started < 5
+
+    def test_wait_is_capped(self, client, db_session):
+        user = _make_user(db_session)
+        self._pending(db_session, user)
+        resp = client.get("/api/billing/status", params={"order_id": "skillfade_rc", "wait": 600},
+                          headers=_auth(user.email))
+        assert resp.status_code == 422
 
     def test_cannot_read_another_users_order(self, client, db_session, monkeypatch):
         owner = _make_user(db_session, email="owner@example.com")
@@ -0,0 +1,207 @@
+"""Tests for the background reconciliation of pending payments (services/payment_reconcile.py)."""
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import gateway
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services import billing as billing_service
+from app.services import payment_reconcile
+
+
+@pytest.fixture()
+def user(db_session):
+    u = User(email="user@example.com", password_hash=get_password_hash("p"))
+    db_session.add(u)
+    db_session.commit()
+    return u
+
+
+def _pending(db, user, order_id, **kw):
+    sub = Subscription(user_id=user.id, plan="lifetime", status="pending", provider="epoint",
+                       order_id=order_id, currency="AZN", **kw)
+    db.add(sub)
+    db.commit()
+    return sub
+
+
+def _hub(monkeypatch, statuses):
+    """Patch the hub: `statuses` maps order_id -> status, or an exception to raise."""
+    calls = []
+
+    def get_status(order_id):
+        calls.append(order_id)
+        result = statuses[order_id]
+        if isinstance(result, Exception):
+            raise result
+        return {"order_id": order_id, "status": result, "epoint_transaction": f"te-{order_id}"}
+
+    monkeypatch.setattr(gateway, "get_status", get_status)
+    return calls
+
+
+def _status(db, order_id):
+    db.expire_all()
+    return db.query(Subscription).filter_by(order_id=order_id).one()
+
+
+class TestReconcilePending:
+    def test_applies_hub_results(self, db_session, user, monkeypatch):
+        for order_id in ("paid", "declined", "open"):
+            _pending(db_session, user, order_id)
+        _hub(monkeypatch, {"paid": "success", "declined": "failed", "open": "pending"})
+
+        counts = payment_reconcile.reconcile_pending(db_session)
+
+        assert counts == {"checked": 3, "activated": 1, "failed": 1, "expired": 0, "unreachable": 0}
+        paid = _status(db_session, "paid")
+        assert (paid.status, paid.epoint_transaction) == ("active", "te-paid")
+        assert _status(db_session, "declined").status == "failed"
+        assert _status(db_session, "open").status == "pending"
+
+    def test_backs_off_between_checks(self, db_session, user, monkeypatch):
+        _pending(db_session, user, "open")
+        calls = _hub(monkeypatch, {"open": "pending"})
+        now = datetime(2026, 10, 19, 12, 0)
+
+        payment_reconcile.reconcile_pending(db_session, now=now)
+        payment_reconcile.reconcile_pending(db_session, now=now + timedelta(seconds=10))  # not due yet
+        assert calls == ["open"]
+        sub = _status(db_session, "open")
+        assert (sub.reconcile_attempts, sub.next_reconcile_at) == (1, now + timedelta(seconds=15))
+
+        payment_reconcile.reconcile_pending(db_session, now=now + timedelta(seconds=15))
+        sub = _status(db_session, "open")
+        assert calls == ["open", "open"]
+        assert sub.next_reconcile_at == now + timedelta(seconds=15 + 30)
+
+    def test_backoff_is_capped(self):
+        now = datetime(2026, 10, 19)
+        assert payment_reconcile.next_check_at(0, now) == now + timedelta(seconds=15)
+        assert payment_reconcile.next_check_at(3, now) == now + timedelta(seconds=120)
+        assert payment_reconcile.next_check_at(50, now) == now + timedelta(hours=1)
+
+    def test_unreachable_hub_is_retried_later(self, db_session, user, monkeypatch):
+        _pending(db_session, user, "a")
+        _pending(db_session, user, "b")
+        _hub(monkeypatch, {"a": gateway.GatewayUnavailable("circuit open"), "b": RuntimeError("boom")})
+
+        counts = payment_reconcile.reconcile_pending(db_session)
+
+        assert counts["unreachable"] == 2
+        sub = _status(db_session, "a")
+        assert (sub.status, sub.reconcile_attempts) == ("pending", 1)
+        assert sub.next_reconcile_at > datetime.utcnow()
+
+    def test_only_due_pending_orders_are_checked(self, db_session, user, monkeypatch):
+        _pending(db_session, user, "due", next_reconcile_at=datetime.utcnow() - timedelta(seconds=1))
+        _pending(db_session, user, "later", next_reconcile_at=datetime.utcnow() + timedelta(minutes=5))
+        done = _pending(db_session, user, "done")
+        done.status = "active"
+        db_session.commit()
+        calls = _hub(monkeypatch, {"due": "pending"})
+
+        payment_reconcile.reconcile_pending(db_session)
+        assert calls == ["due"]
+
+    def test_batches(self, db_session, user, monkeypatch):
+        for i in range(5):
+            _pending(db_session, user, f"o{i}")
+        calls = _hub(monkeypatch, {f"o{i}": "pending" for i in range(5)})
+
+        assert payment_reconcile.reconcile_pending(db_session, batch_size=3)["checked"] == 3
+        assert payment_reconcile.reconcile_pending(db_session, batch_size=3)["checked"] == 2
+        assert sorted(calls) == [f"o{i}" for i in range(5)]
+
+    def test_hub_calls_are_bounded(self, db_session, user, monkeypatch):
+        for i in range(6):
+            _pending(db_session, user, f"o{i}")
+        monkeypatch.setattr(settings, "PAYMENT_RECONCILE_CONCURRENCY", 2)
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, peak
+
+        def slow_status(order_id):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return {"order_id": order_id, "status": "pending"}
+
+        monkeypatch.setattr(gateway, "get_status", slow_status)
+        assert payment_reconcile.reconcile_pending(db_session)["checked"] == 6
+        assert in_flight[1] == 2
+
+    def test_abandoned_checkouts_expire(self, db_session, user, monkeypatch):
+        old = datetime.utcnow() - timedelta(hours=49)
+        _pending(db_session, user, "abandoned", created_at=old)
+        _pending(db_session, user, "hub_down", created_at=old)
+        _pending(db_session, user, "paid_late", created_at=old)
+        _pending(db_session, user, "recent", created_at=datetime.utcnow() - timedelta(hours=47))
+        _hub(monkeypatch, {"abandoned": "pending", "hub_down": gateway.GatewayUnavailable("circuit open"),
+                           "paid_late": "success", "recent": "pending"})
+
+        counts = payment_reconcile.reconcile_pending(db_session)
+
+        assert (counts["expired"], counts["activated"]) == (2, 1)
+        assert _status(db_session, "abandoned").status == "expired"
+        assert _status(db_session, "hub_down").status == "expired"
+        assert _status(db_session, "paid_late").status == "active"
+        assert _status(db_session, "recent").status == "pending"
+        # Expired orders leave the pending set for good
+        later = datetime.utcnow() + timedelta(days=30)
+        assert payment_reconcile.reconcile_pending(db_session, now=later)["checked"] == 1
+
+    def test_late_webhook_still_activates_an_expired_order(self, db_session, user):
+        sub = _pending(db_session, user, "late")
+        billing_service.expire_subscription(sub)
+        billing_service.activate_subscription(sub, {"order_id": "late", "status": "success"})
+        assert sub.status == "active"
+
+    def test_webhook_result_is_not_overwritten(self, db_session, user, monkeypatch):
+        sub = _pending(db_session, user, "raced")
+
+        def webhook_lands_first(order_id):
+            sub.status = "active"
+            db_session.commit()
+            return {"order_id": order_id, "status": "failed"}
+
+        monkeypatch.setattr(gateway, "get_status", webhook_lands_first)
+        counts = payment_reconcile.reconcile_pending(db_session)
+        assert counts["failed"] == 0
+        assert _status(db_session, "raced").status == "active"
+
+
+class TestReconcilerLoop:
+    def test_runs_on_interval_until_stopped(self, monkeypatch):
+        ran = threading.Event()
+        monkeypatch.setattr(settings, "PAYMENT_RECONCILE_INTERVAL_SECONDS", 0.01)
+        monkeypatch.setattr(payment_reconcile, "SessionLocal", lambda: _FakeSession())
+        monkeypatch.setattr(payment_reconcile, "reconcile_pending", lambda db: ran.set())
+
+        payment_reconcile.start_reconciler()
+        try:
+            assert ran.wait(2)
+        finally:
+            payment_reconcile.stop_reconciler()
+        assert not payment_reconcile._thread.is_alive()
+
+    def test_disabled_with_zero_interval(self, monkeypatch):
+        monkeypatch.setattr(settings, "PAYMENT_RECONCILE_INTERVAL_SECONDS", 0)
+        monkeypatch.setattr(payment_reconcile, "_thread", None)
+        payment_reconcile.start_reconciler()
+        assert payment_reconcile._thread is None
+
+
+class _FakeSession:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
@@ -0,0 +1,69 @@
+"""Tests for memoized personal records (services/personal_records.py)."""
+from datetime import date, datetime, timedelta
+
+from app.core import metrics
+from app.core.security import create_access_token, get_password_hash
+from app.models.event import LearningEvent, PracticeEvent
+from app.models.skill import Skill
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.personal_records import get_personal_records
+
+
+def _pro_skill(db):
+    u = User(email="pro@example.com", password_hash=get_password_hash("password123"))
+    db.add(u)
+    db.commit()
+    db.add(Subscription(user_id=u.id, plan="grandfathered", status="active", provider="manual"))
+    skill = Skill(user_id=u.id, name="Piano", created_at=datetime.utcnow() - timedelta(days=60))
+    db.add(skill)
+    db.commit()
+    db.add_all([
+        PracticeEvent(skill_id=skill.id, user_id=u.id, date=date.today() - timedelta(days=d), type="exercise")
+        for d in (40, 20, 3)
+    ])
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': u.email})}"}, skill
+
+
+def _misses():
+    return metrics.CACHE_REQUESTS.value(cache="personal_records", result="miss")
+
+
+def test_endpoint_memoizes_until_events_change(client, db_session):
+    headers, skill = _pro_skill(db_session)
+    url = f"/api/analytics/skills/{skill.id}/personal-records"
+    misses = _misses()
+
+    first = client.get(url, headers=headers).json()
+    assert client.get(url, headers=headers).json() == first
+    assert _misses() == misses + 1
+    assert first["longest_gap_recovered_days"] == 20
+
+    r = client.post(f"/api/skills/{skill.id}/practice-events", headers=headers,
+                    json={"date": (date.today() - timedelta(days=59)).isoformat(), "type": "work"})
+    assert r.status_code == 201
+    updated = client.get(url, headers=headers).json()
+    assert _misses() == misses + 2
+    assert updated["total_practice_events"] == 4
+    assert updated["longest_gap_recovered_days"] == 20
+
+
+def test_edits_and_new_days_invalidate(db_session):
+    _, skill = _pro_skill(db_session)
+    get_personal_records(db_session, skill)
+    misses = _misses()
+
+    event = db_session.query(PracticeEvent).filter(PracticeEvent.skill_id == skill.id).first()
+    event.date = date.today() - timedelta(days=55)
+    db_session.commit()
+    get_personal_records(db_session, skill)
+    assert _misses() == misses + 1
+
+    get_personal_records(db_session, skill, today=date.today() + timedelta(days=1))
+    assert _misses() == misses + 2
+
+    db_session.add(LearningEvent(skill_id=skill.id, user_id=skill.user_id, date=date.today(), type="reading"))
+    db_session.commit()
+    assert get_personal_records(db_session, skill)["total_learning_events"] == 1
+    assert _misses() == misses + 3
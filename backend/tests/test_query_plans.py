@@ -0,0 +1,135 @@
+"""Index-usage regression suite for the hot analytics queries (Postgres only).
+
+Migrates a scratch schema to head, fills it with the generate_dataset data set,
+runs ANALYZE, then calls each hot endpoint / job with a real session and EXPLAINs
+every SELECT it issued. A sequential scan over the events or skills tables fails
+the test: those queries are meant to use the per-user and per-skill indexes
+(migrations 019 and 020).
+
+Skipped unless TEST_POSTGRES_URL points at a Postgres database, e.g.
+    TEST_POSTGRES_URL=postgresql://postgres@localhost:5432/skillfade_test pytest tests/test_query_plans.py
+The suite works in its own `query_plans` schema and drops it afterwards, so the
+database's other tables are left alone.
+"""
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.models.event import Event
+from app.models.skill import Skill
+from app.models.user import User
+from app.routers.analytics import get_balance_data, get_calendar_data, get_dashboard_data, get_period_comparison
+from app.routers.events import get_skill_events, get_skill_timeline
+from app.routers.skills import list_skills
+from app.services.alerts import check_imbalance_alerts
+from benchmarks.generate_dataset import generate
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+SCHEMA = "query_plans"
+HOT_TABLES = {"events", "skills"}
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+HOT_QUERIES = {
+    "dashboard": lambda db, user: get_dashboard_data(current_user=user, db=db),
+    "balance": lambda db, user: get_balance_data(period="quarter", current_user=user, db=db),
+    "calendar": lambda db, user: get_calendar_data(month=None, year=None, current_user=user, db=db),
+    "period_comparison": lambda db, user: get_period_comparison(current_user=user, db=db, _pro=user),
+    "skill_list": lambda db, user: list_skills(include_archived=False, current_user=user, db=db),
+    "skill_events": lambda db, user: get_skill_events(skill_id=_first_skill(db, user), current_user=user, db=db),
+    "timeline": lambda db, user: get_skill_timeline(
+        skill_id=_first_skill(db, user), limit=50, cursor=None, start=None, end=None, event_type=None, type=None,
+        current_user=user, db=db,
+    ),
+    "imbalance_alerts": lambda db, user: check_imbalance_alerts(db),
+}
+
+
+def _first_skill(db, user):
+    return db.query(Skill.id).filter(Skill.user_id == user.id).order_by(Skill.id).limit(1).scalar()
+
+
+@pytest.fixture(scope="module")
+def pg_engine():
+    """Engine on a freshly migrated, seeded and analyzed `query_plans` schema."""
+    saved_options, saved_url = os.environ.get("PGOPTIONS"), settings.DATABASE_URL
+    os.environ["PGOPTIONS"] = f"-c search_path={SCHEMA}"  # every libpq connection, alembic's included
+    engine = create_engine(POSTGRES_URL)
+    try:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+            conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+
+        settings.DATABASE_URL = POSTGRES_URL
+        config = Config()
+        config.set_main_option("script_location", str(Path(__file__).resolve().parents[1] / "alembic"))
+        command.upgrade(config, "head")
+
+        db = sessionmaker(bind=engine)()
+        generate(db, users=300, logs_per_user=5, seed=7)
+        db.close()
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql("VACUUM ANALYZE")
+        yield engine
+    finally:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        engine.dispose()
+        settings.DATABASE_URL = saved_url
+        if saved_options is None:
+            os.environ.pop("PGOPTIONS", None)
+        else:
+            os.environ["PGOPTIONS"] = saved_options
+
+
+@contextmanager
+def _captured_selects(engine):
+    """Collect the distinct SELECT statements (with their first parameters) run on `engine`."""
+    statements = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.setdefault(statement, parameters)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _seq_scans(plan: dict) -> list:
+    found = [plan["Relation Name"]] if plan["Node Type"] == "Seq Scan" and plan["Relation Name"] in HOT_TABLES else []
+    for child in plan.get("Plans", []):
+        found += _seq_scans(child)
+    return found
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_indexes(pg_engine, name):
+    db = sessionmaker(bind=pg_engine)()
+    try:
+        # The busiest account: the most rows per user, so the likeliest to tip the planner to a seq scan.
+        user_id = (
+            db.query(Event.user_id).group_by(Event.user_id)
+            .order_by(func.count().desc()).limit(1).scalar()
+        )
+        user = db.get(User, user_id)
+        with _captured_selects(pg_engine) as statements:
+            HOT_QUERIES[name](db, user)
+    finally:
+        db.close()
+
+    assert statements, f"{name} issued no SELECTs"
+    with pg_engine.connect() as conn:
+        for statement, parameters in statements.items():
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            scanned = _seq_scans(plan[0]["Plan"])
+            assert not scanned, f"{name}: sequential scan on {', '.join(scanned)} in\n{statement}"
@@ -0,0 +1,132 @@
+"""Tests for the upsert-based skill / category writes (app/services/skill_writes.py).
+
+Duplicate names are caught by the unique constraints rather than a prior SELECT,
+and creating a skill takes a fixed, small number of statements.
+"""
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app.core.instrumentation import install_query_hooks
+from app.core.security import create_access_token, get_password_hash
+from app.models.category import Category
+from app.models.skill import Skill
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.skill_writes import DuplicateNameError, ensure_category, insert_skill
+
+
+@pytest.fixture()
+def pro(db_session):
+    u = User(email="w@example.com", password_hash=get_password_hash("password123"))
+    db_session.add(u)
+    db_session.commit()
+    db_session.add(Subscription(user_id=u.id, plan="grandfathered", status="active", provider="manual"))
+    db_session.commit()
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _queries(response):
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+class TestService:
+    def test_ensure_category_returns_existing_row(self, db_session, pro):
+        first = ensure_category(db_session, pro.id, "Languages")
+        again = ensure_category(db_session, pro.id, "Languages")
+        db_session.commit()
+        assert again.id == first.id
+        assert db_session.query(Category).count() == 1
+
+    def test_ensure_category_does_not_rewrite_an_existing_row(self, db_session, pro):
+        user_id = pro.id
+        ensure_category(db_session, user_id, "Languages")
+        db_session.commit()
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split(None, 1)[0].upper())
+
+        event.listen(db_session.get_bind(), "before_cursor_execute", record)
+        try:
+            ensure_category(db_session, user_id, "Languages")
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", record)
+        assert statements == ["INSERT", "SELECT"]
+
+    def test_insert_skill_duplicate_raises(self, db_session, pro):
+        insert_skill(db_session, {"user_id": pro.id, "name": "Go"})
+        with pytest.raises(DuplicateNameError):
+            insert_skill(db_session, {"user_id": pro.id, "name": "Go"})
+        db_session.commit()
+        assert db_session.query(Skill).count() == 1
+
+
+class TestSkillRoutes:
+    def test_create_reuses_category_by_name(self, client, db_session, pro):
+        headers = _auth(pro.email)
+        a = client.post("/api/skills", headers=headers, json={"name": "a", "category_name": "Web"}).json()
+        b = client.post("/api/skills", headers=headers, json={"name": "b", "category_name": "Web"}).json()
+        assert a["category"] == b["category"] and a["category"]["name"] == "Web"
+        assert (a["practice_count"], a["dependencies"], a["dependents"]) == (0, [], [])
+        assert db_session.query(Category).count() == 1
+
+    def test_create_duplicate_name_400(self, client, pro):
+        headers = _auth(pro.email)
+        assert client.post("/api/skills", headers=headers, json={"name": "Rust"}).status_code == 201
+        r = client.post("/api/skills", headers=headers, json={"name": "Rust"})
+        assert r.status_code == 400
+        assert r.json()["detail"] == "Skill with this name already exists"
+
+    def test_create_is_a_few_statements(self, client, db_session, pro):
+        install_query_hooks(db_session.get_bind())
+        r = client.post("/api/skills", headers=_auth(pro.email), json={"name": "SQL", "category_name": "Data"})
+        assert r.status_code == 201
+        assert _queries(r) == 4  # user, plan, category upsert, skill insert
+
+    def test_rename_to_taken_name_400_and_unchanged(self, client, db_session, pro):
+        headers = _auth(pro.email)
+        first = client.post("/api/skills", headers=headers, json={"name": "one"}).json()
+        client.post("/api/skills", headers=headers, json={"name": "two"})
+        r = client.patch(f"/api/skills/{first['id']}", headers=headers, json={"name": "two"})
+        assert r.status_code == 400
+        db_session.expire_all()
+        assert sorted(name for (name,) in db_session.query(Skill.name)) == ["one", "two"]
+
+    def test_update_keeps_own_name_and_404s_for_others(self, client, pro):
+        headers = _auth(pro.email)
+        skill = client.post("/api/skills", headers=headers, json={"name": "one"}).json()
+        r = client.patch(f"/api/skills/{skill['id']}", headers=headers, json={"name": "one", "category_name": "New"})
+        assert r.status_code == 200
+        assert r.json()["category"]["name"] == "New"
+        missing = "00000000-0000-0000-0000-000000000000"
+        assert client.patch(f"/api/skills/{missing}", headers=headers, json={"name": "x"}).status_code == 404
+
+    def test_missing_skill_is_404_before_plan_check_and_category_upsert(self, client, db_session):
+        free = User(email="free@example.com", password_hash=get_password_hash("password123"))
+        db_session.add(free)
+        db_session.commit()
+        headers = _auth(free.email)
+        missing = "/api/skills/00000000-0000-0000-0000-000000000000"
+        assert client.patch(missing, headers=headers, json={"target_freshness": 80}).status_code == 404
+        assert client.patch(missing, headers=headers, json={"category_name": "Orphan"}).status_code == 404
+        assert db_session.query(Category).count() == 0
+        own = client.post("/api/skills", headers=headers, json={"name": "mine"}).json()
+        assert client.patch(f"/api/skills/{own['id']}", headers=headers, json={"target_freshness": 80}).status_code == 402
+
+
+class TestCategoryRoutes:
+    def test_create_and_rename_duplicates_400(self, client, pro):
+        headers = _auth(pro.email)
+        created = client.post("/api/categories", headers=headers, json={"name": "A"})
+        assert created.status_code == 201 and created.json()["skill_count"] == 0
+        other = client.post("/api/categories", headers=headers, json={"name": "B"}).json()
+        assert client.post("/api/categories", headers=headers, json={"name": "A"}).status_code == 400
+        assert client.patch(f"/api/categories/{other['id']}", headers=headers, json={"name": "A"}).status_code == 400
+        renamed = client.patch(f"/api/categories/{other['id']}", headers=headers, json={"name": "C"})
+        assert renamed.status_code == 200 and renamed.json()["name"] == "C"
@@ -0,0 +1,160 @@
+"""Tests for the per-skill monthly time rollup (app/services/time_rollups.py).
+
+The rollup must follow every event write path (create, edit, delete, bulk) and
+agree with a rebuild from the raw events.
+"""
+from datetime import date
+
+from app.core.security import create_access_token, get_password_hash
+from app.models.event import LearningEvent, PracticeEvent
+from app.models.skill import Skill
+from app.models.skill_month_rollup import SkillMonthRollup
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.time_rollups import month_cells, rebuild, rollup_drift, session_counts
+
+
+def _pro(db, email="pro@example.com"):
+    u = User(email=email, password_hash=get_password_hash("password123"))
+    db.add(u)
+    db.commit()
+    db.add(Subscription(user_id=u.id, plan="grandfathered", status="active", provider="manual"))
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _skill(db, user, name="Python"):
+    s = Skill(user_id=user.id, name=name)
+    db.add(s)
+    db.commit()
+    db.refresh(s)
+    return s
+
+
+def _rows(db, skill):
+    rows = db.query(SkillMonthRollup).filter(SkillMonthRollup.skill_id == skill.id).order_by(SkillMonthRollup.month)
+    return {row.month: row for row in rows}
+
+
+def _log(client, user, skill, kind, day, minutes=None):
+    body = {"date": day, "type": "reading" if kind == "learning" else "project"}
+    if minutes is not None:
+        body["duration_minutes"] = minutes
+    r = client.post(f"/api/skills/{skill.id}/{kind}-events", headers=_auth(user.email), json=body)
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+class TestMaintenance:
+    def test_create_counts_minutes_and_sessions(self, client, db_session):
+        u = _pro(db_session)
+        s = _skill(db_session, u)
+        _log(client, u, s, "learning", "2026-03-10", 30)
+        _log(client, u, s, "learning", "2026-03-02")
+        _log(client, u, s, "practice", "2026-03-20", 45)
+        row = _rows(db_session, s)[date(2026, 3, 1)]
+        assert (row.learning_minutes, row.learning_timed, row.learning_untimed) == (30, 1, 1)
+        assert (row.practice_minutes, row.practice_timed, row.practice_untimed) == (45, 1, 0)
+        assert (row.first_day, row.last_day) == (date(2026, 3, 2), date(2026, 3, 20))
+        assert row.user_id == u.id
+
+    def test_edit_moves_minutes_between_months(self, client, db_session):
+        u = _pro(db_session)
+        s = _skill(db_session, u)
+        _log(client, u, s, "practice", "2026-03-05", 60)
+        moved = _log(client, u, s, "practice", "2026-03-25", 30)
+        r = client.patch(f"/api/practice-events/{moved}", headers=_auth(u.email),
+                         json={"date": "2026-04-02", "duration_minutes": 50})
+        assert r.status_code == 200, r.text
+        rows = _rows(db_session, s)
+        assert (rows[date(2026, 3, 1)].practice_minutes, rows[date(2026, 3, 1)].last_day) == (60, date(2026, 3, 5))
+        assert (rows[date(2026, 4, 1)].practice_minutes, rows[date(2026, 4, 1)].practice_timed) == (50, 1)
+        assert not rollup_drift(db_session, u.id)
+
+    def test_delete_drops_empty_month(self, client, db_session):
+        u = _pro(db_session)
+        s = _skill(db_session, u)
+        keep = _log(client, u, s, "learning", "2026-03-05", 20)
+        gone = _log(client, u, s, "learning", "2026-05-05", 20)
+        assert client.delete(f"/api/learning-events/{gone}", headers=_auth(u.email)).status_code == 204
+        assert list(_rows(db_session, s)) == [date(2026, 3, 1)]
+        assert client.delete(f"/api/learning-events/{keep}", headers=_auth(u.email)).status_code == 204
+        assert _rows(db_session, s) == {}
+
+    def test_bulk_insert_is_counted(self, client, db_session):
+        u = _pro(db_session)
+        s = _skill(db_session, u)
+        events = [
+            {"skill_id": str(s.id), "event_type": "learning", "date": f"2026-01-{d:02d}", "type": "reading",
+             "duration_minutes": 10}
+            for d in range(1, 21)
+        ]
+        assert client.post("/api/events/bulk", headers=_auth(u.email), json={"events": events}).status_code == 200
+        row = _rows(db_session, s)[date(2026, 1, 1)]
+        assert (row.learning_minutes, row.learning_timed) == (200, 20)
+        assert not rollup_drift(db_session, u.id)
+
+
+class TestRebuild:
+    def test_rebuild_repairs_drift(self, db_session):
+        u = _pro(db_session)
+        s = _skill(db_session, u)
+        db_session.add_all([  # written behind the rollup's back
+            LearningEvent(skill_id=s.id, user_id=u.id, date=date(2026, 2, 3), type="reading", duration_minutes=25),
+            PracticeEvent(skill_id=s.id, user_id=u.id, date=date(2026, 2, 9), type="project"),
+        ])
+        db_session.commit()
+        assert rollup_drift(db_session, u.id)
+        assert rebuild(db_session, u.id) == 1
+        db_session.commit()
+        assert not rollup_drift(db_session, u.id)
+        row = _rows(db_session, s)[date(2026, 2, 1)]
+        assert (row.learning_minutes, row.practice_untimed) == (25, 1)
+
+    def test_full_rebuild_covers_every_user(self, db_session):
+        owners = [_pro(db_session, "a@example.com"), _pro(db_session, "b@example.com")]
+        skills = [_skill(db_session, u) for u in owners]
+        for u, s in zip(owners, skills):
+            db_session.add_all([
+                LearningEvent(skill_id=s.id, user_id=u.id, date=date(2026, 2, 3), type="reading"),
+                PracticeEvent(skill_id=s.id, user_id=u.id, date=date(2026, 3, 9), type="project", duration_minutes=40),
+            ])
+        db_session.commit()
+        assert rebuild(db_session) == 4
+        db_session.commit()
+        for u, s in zip(owners, skills):
+            assert not rollup_drift(db_session, u.id)
+            assert _rows(db_session, s)[date(2026, 3, 1)].practice_minutes == 40
+
+
+class TestReaders:
+    def test_month_cells_clip_partial_months_to_the_range(self, client, db_session):
+        u = _pro(db_session)
+        s = _skill(db_session, u)
+        for day in ("2026-01-05", "2026-01-25", "2026-02-14", "2026-03-03", "2026-03-28"):
+            _log(client, u, s, "learning", day, 10)
+        cells = {c["month"]: c for c in month_cells(db_session, [s.id], date(2026, 1, 20), date(2026, 3, 10))}
+        assert {m: c["learning_timed"] for m, c in cells.items()} == {
+            date(2026, 1, 1): 1, date(2026, 2, 1): 1, date(2026, 3, 1): 1,
+        }
+        assert cells[date(2026, 1, 1)]["first_day"] == date(2026, 1, 25)
+        assert cells[date(2026, 3, 1)]["last_day"] == date(2026, 3, 3)
+
+    def test_session_counts_and_period_comparison(self, client, db_session):
+        u = _pro(db_session)
+        s = _skill(db_session, u)
+        today = date.today()
+        this_month = today.replace(day=1)
+        _log(client, u, s, "learning", this_month.isoformat())
+        _log(client, u, s, "practice", this_month.isoformat(), 15)
+        assert session_counts(db_session, u.id, this_month) == (1, 1)
+        r = client.get("/api/analytics/period-comparison", headers=_auth(u.email))
+        assert r.status_code == 200
+        assert r.json()["current_month"]["learning"] == 1
+        assert r.json()["current_month"]["practice"] == 1
+        assert r.json()["last_month"]["total"] == 0
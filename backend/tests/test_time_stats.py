@@ -3,7 +3,7 @@
 Covers app/services/time_stats.py (pure aggregation of duration_minutes) and the
 two analytics endpoints it backs: free `time-summary` and PRO `time-report`.
 """
-from datetime import date
+from datetime import date, datetime, timedelta
 
 from app.core.security import create_access_token, get_password_hash
 from app.models.category import Category
@@ -11,6 +11,8 @@ from app.models.event import LearningEvent, PracticeEvent
 from app.models.skill import Skill
 from app.models.subscription import Subscription
 from app.models.user import User
+from app.services.freshness import calculate_freshness
+from app.services.time_rollups import add_events
 from app.services.time_stats import time_report, time_summary
 
 
@@ -35,6 +37,14 @@ def _auth(email):
     return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
 
 
+def _add(db, events):
+    """Insert events the way the write paths do, keeping the monthly rollup in step."""
+    db.add_all(events)
+    for event in events:
+        add_events(db, [event])
+    db.commit()
+
+
 def _seed(db, user):
     """Two skills, one category, four events (one untimed)."""
     cat = Category(user_id=user.id, name="Backend")
@@ -49,13 +59,12 @@ def _seed(db, user):
     db.refresh(s1)
     db.refresh(s2)
 
-    db.add_all([
+    _add(db, [
         LearningEvent(skill_id=s1.id, user_id=user.id, date=date(2026, 1, 10), type="reading", duration_minutes=60),
         PracticeEvent(skill_id=s1.id, user_id=user.id, date=date(2026, 1, 15), type="project", duration_minutes=90),
         PracticeEvent(skill_id=s1.id, user_id=user.id, date=date(2026, 2, 1), type="work", duration_minutes=None),
         LearningEvent(skill_id=s2.id, user_id=user.id, date=date(2026, 1, 20), type="video", duration_minutes=30),
     ])
-    db.commit()
     return s1, s2
 
 
@@ -178,6 +187,44 @@ class TestTimeReport:
         assert last["avg_freshness"] is not None
         assert 0.0 <= last["avg_freshness"] <= 100.0
 
+    def test_overlay_matches_freshness_engine(self, db_session):
+        u = _user(db_session)
+        s1, s2 = _seed(db_session, u)
+        for skill in (s1, s2):
+            skill.created_at = datetime(2025, 12, 1)
+        s2.decay_rate = 0.05
+        _add(db_session, [LearningEvent(skill_id=s2.id, user_id=u.id, date=date(2026, 3, 5), type="video")])
+        r = time_report(db_session, u, date(2026, 1, 1), date(2026, 2, 28))
+        feb_end = date(2026, 2, 28)
+
+        def expected(skill):
+            learning = [(e.date, e.type) for e in skill.learning_events if e.date <= feb_end]
+            practice = [(e.date, e.type) for e in skill.practice_events if e.date <= feb_end]
+            return calculate_freshness(skill.created_at.date(), learning, practice, skill.decay_rate, feb_end)
+
+        assert r["hours_vs_freshness"][-1]["avg_freshness"] == round((expected(s1) + expected(s2)) / 2, 1)
+
+    def test_summary_keeps_archived_skills_with_history(self, db_session):
+        u = _user(db_session)
+        _s1, s2 = _seed(db_session, u)
+        empty = Skill(user_id=u.id, name="Go", archived_at=datetime.utcnow())
+        s2.archived_at = datetime.utcnow()
+        db_session.add(empty)
+        db_session.commit()
+        per = {p["skill_name"]: p for p in time_summary(db_session, u)["per_skill"]}
+        assert per["SQL"]["archived"] is True
+        assert "Go" not in per  # archived without any events
+
+    def test_range_bounds_are_inclusive(self, db_session):
+        u = _user(db_session)
+        s1, _s2 = _seed(db_session, u)
+        day = date(2026, 1, 15)
+        r = time_report(db_session, u, day, day)
+        assert r["totals"]["sessions"] == 1
+        assert r["totals"]["first_activity"] == r["totals"]["last_activity"] == "2026-01-15"
+        r = time_report(db_session, u, day + timedelta(days=1), date(2026, 1, 31))
+        assert [p["skill_name"] for p in r["per_skill"]] == ["SQL"]
+
 
 # --- endpoints ----------------------------------------------------------------
 
@@ -0,0 +1,146 @@
+"""Tests for the keyset-paginated skill timeline (GET /api/skills/{id}/timeline)."""
+from datetime import date, timedelta
+
+from app.core.security import create_access_token, get_password_hash
+from app.models.event import LearningEvent, PracticeEvent
+from app.models.skill import Skill
+from app.models.user import User
+from app.services.time_rollups import rebuild
+
+
+def _user(db, email="t@example.com"):
+    u = User(email=email, password_hash=get_password_hash("password123"))
+    db.add(u)
+    db.commit()
+    db.refresh(u)
+    return u
+
+
+def _auth(email):
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+def _seed(db, user, days=30):
+    """One learning event every day and one practice event every third day, with
+    a few same-day duplicates so the id tiebreaker matters."""
+    s = Skill(user_id=user.id, name="Python")
+    db.add(s)
+    db.commit()
+    db.refresh(s)
+    start = date(2026, 1, 1)
+    events = []
+    for i in range(days):
+        d = start + timedelta(days=i)
+        events.append(LearningEvent(skill_id=s.id, user_id=user.id, date=d, type="reading", duration_minutes=30))
+        if i % 3 == 0:
+            events.append(PracticeEvent(skill_id=s.id, user_id=user.id, date=d, type="project"))
+    events.append(LearningEvent(skill_id=s.id, user_id=user.id, date=start + timedelta(days=5), type="video"))
+    db.add_all(events)
+    db.commit()
+    rebuild(db, user.id)
+    db.commit()
+    return s
+
+
+def _walk(client, url, headers, **params):
+    """Follow next_cursor until exhausted; return (events, pages)."""
+    events, pages, cursor = [], 0, None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        body = client.get(url, headers=headers, params=query).json()
+        events.extend(body["events"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return events, pages
+
+
+class TestTimeline:
+    def test_first_page_and_totals(self, client, db_session):
+        u = _user(db_session)
+        s = _seed(db_session, u)
+        body = client.get(f"/api/skills/{s.id}/timeline", headers=_auth(u.email), params={"limit": 5}).json()
+        assert len(body["events"]) == 5
+        assert body["events"][0]["date"] == "2026-01-30"
+        assert body["next_cursor"] is not None
+        assert body["totals"] == {"sessions": 41, "timed_sessions": 30, "minutes": 900}
+
+    def test_pages_cover_everything_once_in_order(self, client, db_session):
+        u = _user(db_session)
+        s = _seed(db_session, u)
+        events, pages = _walk(client, f"/api/skills/{s.id}/timeline", _auth(u.email), limit=4)
+        assert len(events) == 41
+        assert len({e["id"] for e in events}) == 41
+        assert pages == 11
+        keys = [(e["date"], e["id"]) for e in events]
+        assert keys == sorted(keys, key=lambda k: (-date.fromisoformat(k[0]).toordinal(), k[1]))
+        # Same shape as the legacy /events payload.
+        assert set(events[0]) == {
+            "id", "skill_id", "user_id", "date", "type", "notes",
+            "duration_minutes", "created_at", "event_type",
+        }
+
+    def test_matches_legacy_events_endpoint(self, client, db_session):
+        u = _user(db_session)
+        s = _seed(db_session, u)
+        legacy = client.get(f"/api/skills/{s.id}/events", headers=_auth(u.email)).json()["events"]
+        events, _ = _walk(client, f"/api/skills/{s.id}/timeline", _auth(u.email), limit=7)
+        assert sorted(e["id"] for e in events) == sorted(e["id"] for e in legacy)
+
+    def test_filters(self, client, db_session):
+        u = _user(db_session)
+        s = _seed(db_session, u)
+        url, headers = f"/api/skills/{s.id}/timeline", _auth(u.email)
+        practice, _ = _walk(client, url, headers, event_type="practice", limit=3)
+        assert len(practice) == 10
+        assert all(e["event_type"] == "practice" for e in practice)
+        window = client.get(url, headers=headers, params={"start": "2026-01-05", "end": "2026-01-07"}).json()
+        assert {e["date"] for e in window["events"]} == {"2026-01-05", "2026-01-06", "2026-01-07"}
+        assert window["totals"]["sessions"] == 5
+        videos = client.get(url, headers=headers, params={"type": "video"}).json()
+        assert [e["type"] for e in videos["events"]] == ["video"]
+        assert videos["totals"] is None  # the rollup has no sub-type dimension
+
+    def test_totals_follow_the_filters(self, client, db_session):
+        u = _user(db_session)
+        s = _seed(db_session, u)
+        url, headers = f"/api/skills/{s.id}/timeline", _auth(u.email)
+        practice = client.get(url, headers=headers, params={"event_type": "practice"}).json()
+        assert practice["totals"] == {"sessions": 10, "timed_sessions": 0, "minutes": 0}
+        # Open end: days 20..30 hold 11 learning and 3 practice events.
+        tail = client.get(url, headers=headers, params={"start": "2026-01-20"}).json()
+        assert tail["totals"] == {"sessions": 14, "timed_sessions": 11, "minutes": 330}
+        empty = client.get(url, headers=headers, params={"start": "2026-03-01"}).json()
+        assert empty["totals"] == {"sessions": 0, "timed_sessions": 0, "minutes": 0}
+
+    def test_totals_read_whole_months_from_the_rollup(self, client, db_session):
+        u = _user(db_session)
+        s = _seed(db_session, u)
+        # A row only the event scan would see: whole months must not re-count events.
+        db_session.add(LearningEvent(skill_id=s.id, user_id=u.id, date=date(2026, 1, 15),
+                                      type="reading", duration_minutes=10))
+        db_session.commit()
+        body = client.get(f"/api/skills/{s.id}/timeline", headers=_auth(u.email),
+                          params={"start": "2026-01-01", "end": "2026-01-31"}).json()
+        assert len(body["events"]) == 42
+        assert body["totals"] == {"sessions": 41, "timed_sessions": 30, "minutes": 900}
+
+    def test_later_pages_skip_totals(self, client, db_session):
+        u = _user(db_session)
+        s = _seed(db_session, u)
+        first = client.get(f"/api/skills/{s.id}/timeline", headers=_auth(u.email), params={"limit": 2}).json()
+        second = client.get(f"/api/skills/{s.id}/timeline", headers=_auth(u.email),
+                            params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        assert second["totals"] is None
+
+    def test_bad_cursor_is_400(self, client, db_session):
+        u = _user(db_session)
+        s = _seed(db_session, u, days=1)
+        r = client.get(f"/api/skills/{s.id}/timeline", headers=_auth(u.email), params={"cursor": "garbage!"})
+        assert r.status_code == 400
+
+    def test_other_users_skill_is_404(self, client, db_session):
+        owner = _user(db_session, "owner@example.com")
+        s = _seed(db_session, owner, days=1)
+        intruder = _user(db_session, "intruder@example.com")
+        assert client.get(f"/api/skills/{s.id}/timeline", headers=_auth(intruder.email)).status_code == 404
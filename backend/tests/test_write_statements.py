@@ -0,0 +1,93 @@
+"""Statement budgets for the write endpoints.
+
+Sessions don't expire on commit and updates are UPDATE ... RETURNING
+(app/core/writes.py), so a write costs its auth lookup, whatever it must check,
+and the write itself, with no reload afterwards. The counts come from the
+Server-Timing header; a change that adds a round trip to one of these should
+update the budget deliberately.
+"""
+import re
+from datetime import date
+
+import pytest
+
+from app.core.instrumentation import install_query_hooks
+from app.core.security import create_access_token, get_password_hash
+from app.models.category import Category
+from app.models.event import LearningEvent
+from app.models.event_template import EventTemplate
+from app.models.skill import Skill
+from app.models.subscription import Subscription
+from app.models.ticket import Ticket
+from app.models.user import User
+
+# (method, path, json body, statements). The auth lookup is always one of them.
+WRITES = [
+    ("post", "/api/skills", {"name": "New", "category_name": "Cat"}, 5),  # + plan, category insert + read-back, insert
+    ("patch", "/api/skills/{skill}", {"decay_rate": 0.03}, 6),  # + update, events and dependencies for the metrics
+    ("post", "/api/categories", {"name": "Other"}, 3),  # + plan, insert
+    ("patch", "/api/categories/{category}", {"name": "Renamed"}, 3),  # + update, skill count
+    ("post", "/api/templates", {"name": "T2", "event_type": "learning", "type": "reading"}, 3),
+    ("patch", "/api/templates/{template}", {"name": "T3"}, 2),
+    ("post", "/api/tickets", {"subject": "s", "message": "m"}, 2),
+    ("post", "/api/tickets/{ticket}/replies", {"message": "m"}, 3),
+    ("post", "/api/skills/{skill}/learning-events", {"date": "2026-01-02", "type": "reading"}, 4),  # + rollup upsert
+    ("patch", "/api/learning-events/{event}", {"notes": "n"}, 3),  # read kept: the rollups need the old row
+    ("patch", "/api/settings", {"settings": {"theme": "dark"}}, 2),
+    ("patch", "/api/admin/users/{user}", {"is_admin": True}, 5),  # + update, three counts
+    ("patch", "/api/admin/templates/{template}", {"name": "T4"}, 3),
+    ("patch", "/api/admin/tickets/{ticket}", {"status": "resolved"}, 4),
+    ("patch", "/api/admin/categories/{category}", {"name": "C5"}, 4),
+    ("patch", "/api/admin/skills/{skill}", {"notes": "z"}, 5),
+    ("post", "/api/admin/tickets/{ticket}/replies", {"message": "m"}, 4),  # + ticket, reply insert, open -> in_progress
+]
+
+
+@pytest.fixture()
+def seeded(db_session):
+    install_query_hooks(db_session.get_bind())
+    u = User(email="admin@example.com", password_hash=get_password_hash("password123"), is_admin=True)
+    db_session.add(u)
+    db_session.commit()
+    skill = Skill(user_id=u.id, name="Python")
+    db_session.add_all([skill, Subscription(user_id=u.id, plan="grandfathered", status="active", provider="manual")])
+    db_session.commit()
+    rows = {
+        "event": LearningEvent(skill_id=skill.id, user_id=u.id, date=date(2026, 1, 1), type="reading"),
+        "template": EventTemplate(user_id=u.id, name="T", event_type="learning", type="reading"),
+        "ticket": Ticket(user_id=u.id, subject="x", message="y", status="open"),
+        "category": Category(user_id=u.id, name="Cat"),
+    }
+    db_session.add_all(rows.values())
+    db_session.commit()
+    ids = {name: row.id for name, row in rows.items()}
+    return {"Authorization": f"Bearer {create_access_token({'sub': u.email})}"}, {**ids, "skill": skill.id, "user": u.id}
+
+
+def _statements(response):
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+@pytest.mark.parametrize("method, path, body, budget", WRITES, ids=[f"{m} {p}" for m, p, _, _ in WRITES])
+def test_write_statement_budget(client, seeded, method, path, body, budget):
+    headers, ids = seeded
+    r = getattr(client, method)(path.format(**ids), headers=headers, json=body)
+    assert r.status_code < 300, r.text
+    assert _statements(r) == budget
+
+
+def test_written_values_are_returned_without_reload(client, seeded):
+    headers, ids = seeded
+    r = client.patch(f"/api/templates/{ids['template']}", headers=headers, json={"default_duration_minutes": 25})
+    assert (r.json()["name"], r.json()["default_duration_minutes"]) == ("T", 25)
+    ticket = client.post("/api/tickets", headers=headers, json={"subject": "s", "message": "m"}).json()
+    assert ticket["replies"] == [] and ticket["status"] == "open"
+
+
+def test_admin_user_email_clash_400(client, seeded, db_session):
+    headers, ids = seeded
+    db_session.add(User(email="taken@example.com", password_hash="x"))
+    db_session.commit()
+    r = client.patch(f"/api/admin/users/{ids['user']}", headers=headers, json={"email": "taken@example.com"})
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Email already registered"
@@ -9,7 +9,9 @@ import { billing, PENDING_ORDER_KEY } from '../services/api';
 
 type State = 'checking' | 'active' | 'pending';
 
-const MAX_ATTEMPTS = 5;
+// Each status call long-polls for up to STATUS_WAIT_SECONDS.
+const MAX_ATTEMPTS = 3;
+const STATUS_WAIT_SECONDS = 10;
 
 const BillingSuccess: React.FC = () => {
   const { refresh } = usePlan();
@@ -24,7 +26,7 @@ const BillingSuccess: React.FC = () => {
       attempts.current += 1;
       try {
         if (orderId) {
-          const { data } = await billing.status(orderId);
+          const { data } = await billing.status(orderId, STATUS_WAIT_SECONDS);
           if (!cancelled && data.is_pro) {
             sessionStorage.removeItem(PENDING_ORDER_KEY);
             await refresh();
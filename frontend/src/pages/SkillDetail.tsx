@@ -1,7 +1,7 @@
 import React, { useEffect, useState } from 'react';
 import { useParams, useNavigate, Link } from 'react-router-dom';
 import { skills as skillsApi, events as eventsApi, analytics, templates as templatesApi } from '../services/api';
-import type { Skill, Event, FreshnessHistoryPoint, EventTemplate, PersonalRecords, SkillDependencyInfo, LearningEventType, PracticeEventType } from '../types';
+import type { Skill, Event, TimelineTotals, FreshnessHistoryPoint, EventTemplate, PersonalRecords, SkillDependencyInfo, LearningEventType, PracticeEventType } from '../types';
 import { format } from 'date-fns';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, ReferenceLine } from 'recharts';
 import {
@@ -35,12 +35,18 @@ const StatusDot: React.FC<{ freshness?: number; size?: 'sm' | 'md' | 'lg' }> = (
   return <div className={`${sizeClass} rounded-full ${getStatusClass()}`} />;
 };
 
+// Events fetched per timeline page; older history loads on demand.
+const TIMELINE_PAGE_SIZE = 50;
+
 const SkillDetail: React.FC = () => {
   const { id } = useParams<{ id: string }>();
   const navigate = useNavigate();
   const [skill, setSkill] = useState<Skill | null>(null);
   const [allSkills, setAllSkills] = useState<Skill[]>([]);
   const [events, setEvents] = useState<Event[]>([]);
+  const [eventTotals, setEventTotals] = useState<TimelineTotals | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [freshnessHistory, setFreshnessHistory] = useState<FreshnessHistoryPoint[]>([]);
   const [templates, setTemplates] = useState<EventTemplate[]>([]);
   const [personalRecords, setPersonalRecords] = useState<PersonalRecords | null>(null);
@@ -59,7 +65,7 @@ const SkillDetail: React.FC = () => {
     try {
       const [skillRes, eventsRes, historyRes, templatesRes, recordsRes, allSkillsRes] = await Promise.all([
         skillsApi.get(id!),
-        eventsApi.list(id!),
+        eventsApi.timeline(id!, { limit: TIMELINE_PAGE_SIZE }),
         analytics.freshnessHistory(id!, 90),
         templatesApi.list(),
         analytics.personalRecords(id!),
@@ -67,6 +73,8 @@ const SkillDetail: React.FC = () => {
       ]);
       setSkill(skillRes.data);
       setEvents(eventsRes.data.events);
+      setEventTotals(eventsRes.data.totals);
+      setNextCursor(eventsRes.data.next_cursor);
       setFreshnessHistory(historyRes.data.history);
       setTemplates(templatesRes.data);
       setPersonalRecords(recordsRes.data);
@@ -78,6 +86,20 @@ const SkillDetail: React.FC = () => {
     }
   };
 
+  const loadMoreEvents = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const res = await eventsApi.timeline(id!, { limit: TIMELINE_PAGE_SIZE, cursor: nextCursor });
+      setEvents((prev) => [...prev, ...res.data.events]);
+      setNextCursor(res.data.next_cursor);
+    } catch (error) {
+      console.error('Failed to load more events:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleArchive = async () => {
     if (confirm('Are you sure you want to archive this skill?')) {
       try {
@@ -350,13 +372,12 @@ const SkillDetail: React.FC = () => {
             <Calendar className="w-5 h-5 text-txt-muted mt-0.5" />
             <div>
               <h2 className="text-lg font-semibold text-txt-primary">Timeline</h2>
-              {(() => {
-                const mins = events.reduce((s, e) => s + (e.duration_minutes || 0), 0);
-                const hrs = Math.round(mins / 6) / 10;
-                const timed = events.filter((e) => e.duration_minutes != null).length;
+              {eventTotals && (() => {
+                const hrs = Math.round(eventTotals.minutes / 6) / 10;
+                const { timed_sessions: timed, sessions } = eventTotals;
                 return (
                   <p className="text-xs text-txt-muted font-mono tabular-nums mt-0.5">
-                    {hrs}h logged · {timed} of {events.length} session{events.length !== 1 ? 's' : ''} timed
+                    {hrs}h logged · {timed} of {sessions} session{sessions !== 1 ? 's' : ''} timed
                   </p>
                 );
               })()}
@@ -389,6 +410,11 @@ const SkillDetail: React.FC = () => {
                 </div>
               </div>
             ))}
+            {nextCursor && (
+              <button onClick={loadMoreEvents} disabled={loadingMore} className="btn-secondary flex items-center gap-2 mx-auto">
+                {loadingMore && <Loader2 className="w-4 h-4 animate-spin" />} Load older events
+              </button>
+            )}
           </div>
         )}
       </div>
@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { adminLogs } from '../../services/api';
-import type { AdminActivityLog, ActivityLogStats } from '../../types';
+import type { AdminActivityLog, ActivityLogStats, BulkDeleteJob } from '../../types';
 import Pagination from '../../components/admin/Pagination';
 import {
   Activity,
@@ -41,6 +41,7 @@ const AdminActivityLogs: React.FC = () => {
   const [bulkStartDate, setBulkStartDate] = useState<string>('');
   const [bulkEndDate, setBulkEndDate] = useState<string>('');
   const [bulkDeleting, setBulkDeleting] = useState(false);
+  const [bulkProgress, setBulkProgress] = useState<BulkDeleteJob | null>(null);
 
   // Fetch logs
   const fetchLogs = useCallback(async () => {
@@ -122,7 +123,7 @@ const AdminActivityLogs: React.FC = () => {
     }
   };
 
-  // Handle bulk delete
+  // Handle bulk delete. The server deletes in the background; poll the job until it finishes.
   const handleBulkDelete = async () => {
     if (!bulkStartDate && !bulkEndDate) {
       return;
@@ -134,16 +135,27 @@ const AdminActivityLogs: React.FC = () => {
         start_date: bulkStartDate || undefined,
         end_date: bulkEndDate || undefined,
       });
+      let job = response.data;
+      setBulkProgress(job);
+      while (job.status === 'pending' || job.status === 'running') {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        job = (await adminLogs.getDeleteJob(job.id)).data;
+        setBulkProgress(job);
+      }
+      if (job.status === 'failed') {
+        throw new Error(job.error || 'Bulk delete failed');
+      }
       setShowBulkDeleteModal(false);
       setBulkStartDate('');
       setBulkEndDate('');
       fetchLogs();
       fetchStats();
-      alert(`Deleted ${response.data.deleted_count} logs`);
+      alert(`Deleted ${job.deleted_count} logs`);
     } catch (err: any) {
-      setError(err.response?.data?.detail || 'Failed to bulk delete logs');
+      setError(err.response?.data?.detail || err.message || 'Failed to bulk delete logs');
     } finally {
       setBulkDeleting(false);
+      setBulkProgress(null);
     }
   };
 
@@ -472,7 +484,11 @@ const AdminActivityLogs: React.FC = () => {
                 disabled={bulkDeleting || (!bulkStartDate && !bulkEndDate)}
                 className="btn-primary bg-decayed-base hover:bg-decayed-hover disabled:opacity-50"
               >
-                {bulkDeleting ? 'Deleting...' : 'Delete Logs'}
+                {bulkDeleting
+                  ? bulkProgress?.total_estimate
+                    ? `Deleting... ${bulkProgress.deleted_count.toLocaleString()} / ${bulkProgress.total_estimate.toLocaleString()}`
+                    : 'Deleting...'
+                  : 'Delete Logs'}
               </button>
             </div>
           </div>
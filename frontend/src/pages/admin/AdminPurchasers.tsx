@@ -4,7 +4,7 @@ import { admin } from '../../services/api';
 import Pagination from '../../components/admin/Pagination';
 import type { AdminSubscription } from '../../types';
 
-type StatusFilter = '' | 'active' | 'pending' | 'refunded' | 'failed' | 'revoked';
+type StatusFilter = '' | 'active' | 'pending' | 'refunded' | 'failed' | 'expired' | 'revoked';
 
 const STATUS_OPTIONS: { value: StatusFilter; label: string }[] = [
   { value: '', label: 'All' },
@@ -12,6 +12,7 @@ const STATUS_OPTIONS: { value: StatusFilter; label: string }[] = [
   { value: 'pending', label: 'Pending' },
   { value: 'refunded', label: 'Refunded' },
   { value: 'failed', label: 'Failed' },
+  { value: 'expired', label: 'Expired' },
   { value: 'revoked', label: 'Revoked' },
 ];
 
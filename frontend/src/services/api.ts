@@ -6,6 +6,7 @@ import type {
   LearningEvent,
   PracticeEvent,
   Event,
+  TimelinePage,
   DashboardData,
   BalanceData,
   FreshnessData,
@@ -35,6 +36,7 @@ import type {
   ActivityLogCreate,
   AdminActivityLog,
   ActivityLogStats,
+  BulkDeleteJob,
   PlanResponse,
   AdminPricing,
   AdminSubscription,
@@ -151,6 +153,9 @@ export const events = {
   list: (skillId: string) =>
     api.get<{ events: Event[] }>(`/skills/${skillId}/events`),
 
+  timeline: (skillId: string, params?: { limit?: number; cursor?: string }) =>
+    api.get<TimelinePage>(`/skills/${skillId}/timeline`, { params }),
+
   createLearning: (skillId: string, data: Partial<LearningEvent>) =>
     api.post<LearningEvent>(`/skills/${skillId}/learning-events`, data),
 
@@ -403,9 +408,10 @@ export const billing = {
     api.get<{ lifetime_price_azn: string; currency: string }>('/billing/pricing'),
   checkout: () =>
     api.post<{ redirect_url: string; order_id: string }>('/billing/checkout'),
-  status: (orderId: string) =>
+  // `wait` long-polls a pending order: the server answers as soon as it settles, or after `wait` seconds.
+  status: (orderId: string, wait = 0) =>
     api.get<{ order_id: string; status: string; is_pro: boolean }>('/billing/status', {
-      params: { order_id: orderId },
+      params: { order_id: orderId, wait },
     }),
 };
 
@@ -440,8 +446,12 @@ export const adminLogs = {
   delete: (id: string) =>
     api.delete(`/admin/logs/${id}`),
 
+  // Starts a background job; poll getDeleteJob for progress.
   bulkDelete: (data: { start_date?: string; end_date?: string }) =>
-    api.post<{ deleted_count: number }>('/admin/logs/bulk-delete', data),
+    api.post<BulkDeleteJob>('/admin/logs/bulk-delete', data),
+
+  getDeleteJob: (jobId: string) =>
+    api.get<BulkDeleteJob>(`/admin/logs/bulk-delete/${jobId}`),
 };
 
 export default api;
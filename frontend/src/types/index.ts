@@ -244,6 +244,18 @@ export interface Event {
   event_type: 'learning' | 'practice';
 }
 
+export interface TimelineTotals {
+  sessions: number;
+  timed_sessions: number;
+  minutes: number;
+}
+
+export interface TimelinePage {
+  events: Event[];
+  next_cursor: string | null;
+  totals: TimelineTotals | null;
+}
+
 export interface DashboardData {
   total_skills: number;
   learning_events_this_week: number;
@@ -534,6 +546,19 @@ export interface BulkDeleteRequest {
   end_date?: string;
 }
 
+export interface BulkDeleteJob {
+  id: string;
+  status: 'pending' | 'running' | 'completed' | 'failed';
+  start_date: string | null;
+  end_date: string | null;
+  total_estimate: number | null;
+  deleted_count: number;
+  error: string | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 // --- Time-Invested suite ---
 
 export interface TimeSummarySkill {